@@ -0,0 +1,35 @@
+"""
+静态归档站点模块
+从每天保存的运行数据增量构建归档站点，并预先构建客户端搜索索引；
+模板或报告配置变化后按输入哈希增量重新渲染历史报告；历史数据的全文搜索
+
+导出的名称按需导入（PEP 562）：首次访问时才加载对应的子模块，
+只写入全文索引的日报生成不会因此加载站点构建所需的 jinja2
+"""
+
+import importlib
+
+# 子模块 -> 导出的名称
+_SUBMODULE_EXPORTS = {
+    'search_index': ['SearchIndexBuilder', 'query_clauses', 'tokenize'],
+    'site': ['SiteBuilder', 'SiteBuildResult', 'build_site'],
+    'rebuild': ['ReportRebuilder', 'RebuildResult', 'rebuild_reports'],
+    'fulltext': ['SearchDatabase', 'SearchHit', 'index_run', 'search_history'],
+}
+
+_EXPORTS = {name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value  # 缓存，之后的访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
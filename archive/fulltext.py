@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+历史全文搜索
+把每天的运行数据写入本地 SQLite FTS5 索引，按关键词查询历史上榜项目（项目名、简介、翻译后的亮点、标签），
+可按数据源、日期范围和语言过滤：
+
+    uv run python trending_daily.py --search "agent OR RAG" --days 90 --language Python
+
+- 每次生成报告后只写入当天的数据；查询前按运行数据文件的修改时间和大小同步新增或变化的日期，
+  索引文件丢失（如 CI 中的 .cache）时从 reports/data 自动重建
+- 中文没有空格分隔，FTS5 的 unicode61 分词会把整段中文当作一个词；写入和查询前都先按
+  archive/search_index.py 的规则切分（中文相邻两字），查询时按 query_clauses() 的条件匹配，
+  "智能体框架"可匹配"智能体开发框架"
+- 结果按仓库规范键（pipeline/identity.py）合并，身份索引新记录的改名在同步时增量更新到已有记录
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from pipeline.history import RunStore, open_run_store
+from pipeline.identity import configure_identity_index, get_identity_index, repo_key
+from .search_index import query_clauses, tokenize
+
+# 全文索引的列（与写入顺序一致）
+FTS_COLUMNS = ('repo', 'description', 'intro', 'highlights', 'tags')
+
+# 表结构版本（不一致时删除旧表，查询前从运行数据重建）
+SCHEMA_VERSION = 2
+
+
+@dataclass
+class SearchHit:
+    """一个匹配的项目（同一项目多次上榜时合并）"""
+    repo: str
+    url: str = ''
+    language: str = ''
+    description: str = ''
+    appearances: List[tuple] = field(default_factory=list)  # [(数据源, 日期, 排名)]，日期倒序
+    score: float = 0.0  # bm25 分数（越小越相关）
+    fork_of: str = ''  # fork 的上游仓库（身份索引中有记录时）
+    network: str = ''  # 所属 fork 网络的根仓库（与其他结果同属一个网络时；自身即为根仓库时同样填写）
+
+
+def _fts_text(value) -> str:
+    if isinstance(value, list):
+        value = ' '.join(str(item) for item in value)
+    return ' '.join(tokenize(value or ''))
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    把用户输入转换为 FTS5 查询
+
+    - 空格分隔的多个词取交集，大写 OR 分隔的多组取并集
+    - 每个词按 query_clauses() 切分为条件后取交集（中文词不要求所有两字切分都出现）
+    - 词尾加 * 时最后一个条件按前缀匹配（agent* 匹配 agents、agentic）；单个汉字自动按前缀匹配
+
+    Returns:
+        Optional[str]: FTS5 MATCH 表达式（没有可检索的词时返回 None）
+    """
+    groups = []
+    for group in query.split(' OR '):
+        conditions = []
+        for term in group.split():
+            clauses = query_clauses(term.rstrip('*'))
+            if not clauses:
+                continue
+            last = clauses[-1][0]
+            prefix = term.endswith('*') or (len(clauses) == 1 and len(last) == 1 and not last.isascii())
+            for i, clause in enumerate(clauses):
+                star = '*' if prefix and i == len(clauses) - 1 else ''
+                options = [f'"{token}"{star}' for token in clause]
+                conditions.append(options[0] if len(options) == 1 else '(' + ' OR '.join(options) + ')')
+        if conditions:
+            groups.append('(' + ' AND '.join(conditions) + ')')
+    return ' OR '.join(groups) if groups else None
+
+
+def parse_date(value: str) -> str:
+    """把 YYYY-MM-DD / YYYYMMDD 规范化为 YYYYMMDD"""
+    digits = value.replace('-', '').strip()
+    datetime.strptime(digits, '%Y%m%d')
+    return digits
+
+
+class SearchDatabase:
+    """历史全文索引（SQLite FTS5）"""
+
+    def __init__(self, path: str = '.cache/search.db'):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            self._conn.executescript("""
+                DROP TABLE IF EXISTS runs;
+                DROP TABLE IF EXISTS entries;
+                DROP TABLE IF EXISTS entries_fts;
+                DROP TABLE IF EXISTS meta;
+            """)
+            self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS runs (
+                source TEXT NOT NULL,
+                date TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (source, date)
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                date TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                repo TEXT NOT NULL,
+                repo_key TEXT NOT NULL,
+                url TEXT,
+                language TEXT,
+                description TEXT
+            );
+            CREATE INDEX IF NOT EXISTS entries_run ON entries (source, date);
+            CREATE INDEX IF NOT EXISTS entries_date ON entries (date);
+            CREATE INDEX IF NOT EXISTS entries_repo ON entries (repo_key);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                {', '.join(FTS_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2'
+            );
+        """)
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def index_run(self, source: str, date: str, projects: List[Dict[str, Any]],
+                  mtime: float = 0.0, size: int = 0) -> None:
+        """写入（或替换）一个数据源某一天的数据"""
+        with self._lock, self._conn:
+            ids = [row[0] for row in self._conn.execute(
+                'SELECT id FROM entries WHERE source = ? AND date = ?', (source, date))]
+            if ids:
+                self._conn.executemany('DELETE FROM entries_fts WHERE rowid = ?', [(i,) for i in ids])
+                self._conn.execute('DELETE FROM entries WHERE source = ? AND date = ?', (source, date))
+            for rank, project in enumerate(projects, 1):
+                if not project.get('repo'):
+                    continue
+                description = project.get('intro') or project.get('description') or ''
+                cursor = self._conn.execute(
+                    'INSERT INTO entries (source, date, rank, repo, repo_key, url, language, description) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (source, date, rank, project['repo'], repo_key(project['repo']), project.get('url', ''),
+                     project.get('language') or '', description)
+                )
+                self._conn.execute(
+                    f"INSERT INTO entries_fts (rowid, {', '.join(FTS_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                    (cursor.lastrowid, *(_fts_text(project.get(column)) for column in FTS_COLUMNS))
+                )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO runs (source, date, mtime, size) VALUES (?, ?, ?, ?)',
+                (source, date, mtime, size)
+            )
+
+    def apply_aliases(self) -> int:
+        """
+        把身份索引中新记录的别名应用到已有记录（改名前的记录合并到当前名称下）
+
+        Returns:
+            int: 应用的别名数
+        """
+        identity = get_identity_index()
+        if identity is None:
+            return 0
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'identity_seq'").fetchone()
+            applied = int(row[0]) if row else 0
+            if applied == identity.seq:
+                return 0
+            changes = identity.changes_since(applied)
+            self._conn.executemany('UPDATE entries SET repo_key = ? WHERE repo_key = ?',
+                                   [(canonical, alias) for alias, canonical in changes])
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('identity_seq', ?)",
+                               (str(identity.seq),))
+        return len(changes)
+
+    def sync(self, store: RunStore) -> int:
+        """
+        同步运行数据中新增或变化的日期（按文件修改时间和大小判断），并应用新记录的仓库别名
+
+        Returns:
+            int: 重新写入的天数
+        """
+        self.apply_aliases()
+        with self._lock:
+            indexed = {(s, d): (m, z) for s, d, m, z in self._conn.execute('SELECT * FROM runs')}
+        count = 0
+        for source, date, path in store.runs():
+            stat = path.stat()
+            if indexed.get((source, date)) == (stat.st_mtime, stat.st_size):
+                continue
+            record = store.load(source, date)
+            if record is not None:
+                self.index_run(source, date, record.projects, stat.st_mtime, stat.st_size)
+                count += 1
+        return count
+
+    def search(self, query: str, source: Optional[str] = None, since: Optional[str] = None,
+               until: Optional[str] = None, language: Optional[str] = None,
+               limit: int = 20) -> List[SearchHit]:
+        """
+        查询历史上榜项目
+
+        Args:
+            query: 关键词（见 build_match_query）
+            source: 只查询某个数据源
+            since: 起始日期（YYYYMMDD，含）
+            until: 结束日期（YYYYMMDD，含）
+            language: 主要语言（不区分大小写）
+            limit: 最多返回的项目数
+
+        Returns:
+            List[SearchHit]: 按相关度、最近上榜日期排序；上榜记录为过滤条件范围内该项目的全部记录
+        """
+        match = build_match_query(query)
+        if match is None:
+            return []
+        conditions, params = ['entries_fts MATCH ?'], [match]
+        if source:
+            conditions.append('e.source = ? COLLATE NOCASE')
+            params.append(source)
+        if since:
+            conditions.append('e.date >= ?')
+            params.append(since)
+        if until:
+            conditions.append('e.date <= ?')
+            params.append(until)
+        if language:
+            conditions.append('e.language = ? COLLATE NOCASE')
+            params.append(language)
+
+        # 先在 SQLite 中按项目聚合并取前 limit 个，只为这些项目读取上榜记录
+        filters = ''.join(f" AND {condition}" for condition in conditions[1:])
+        # bm25() 不能直接用在聚合查询中，先在物化的 CTE 中算出分数
+        top_sql = (
+            'WITH matched AS MATERIALIZED ('
+            'SELECT rowid AS id, bm25(entries_fts) AS score FROM entries_fts WHERE entries_fts MATCH ?) '
+            'SELECT e.repo_key AS key, min(m.score) AS best, max(e.date) AS latest '
+            f"FROM matched m JOIN entries e ON e.id = m.id WHERE 1{filters} "
+            'GROUP BY key ORDER BY best, latest DESC LIMIT ?'
+        )
+        with self._lock:
+            top = self._conn.execute(top_sql, params + [limit]).fetchall()
+            if not top:
+                return []
+            placeholders = ', '.join('?' for _ in top)
+            rows = self._conn.execute(
+                'SELECT e.repo_key, e.repo, e.url, e.language, e.description, e.source, e.date, e.rank '
+                f"FROM entries e WHERE e.repo_key IN ({placeholders}){filters} ORDER BY e.date DESC, e.source",
+                [key for key, _, _ in top] + params[1:]
+            ).fetchall()
+
+        hits = {key: None for key, _, _ in top}
+        scores = {key: best for key, best, _ in top}
+        identity = get_identity_index()
+        for key, repo, url, lang, description, src, date, rank in rows:
+            if hits[key] is None:
+                # 按日期倒序遍历，第一次出现时的字段为最近一次的值
+                fork_of = (identity.parent(key) if identity else None) or ''
+                hits[key] = SearchHit(repo, url, lang, description, score=scores[key], fork_of=fork_of)
+            hits[key].appearances.append((src, date, rank))
+        return group_by_network([hit for hit in hits.values() if hit is not None], identity)
+
+
+def group_by_network(hits: List[SearchHit], identity) -> List[SearchHit]:
+    """
+    同一 fork 网络的结果排在一起（位于网络中最相关的结果的位置），并记录网络的根仓库
+
+    网络只有一个结果时不做标注；身份索引中没有 fork 记录的仓库各自为一组
+    """
+    if identity is None:
+        return hits
+    groups: Dict[str, List[SearchHit]] = {}
+    for hit in hits:
+        groups.setdefault(identity.group(hit.repo), []).append(hit)
+    grouped = []
+    for network, members in groups.items():
+        if len(members) > 1:
+            for hit in members:
+                hit.network = identity.name(network)
+        grouped.extend(members)
+    return grouped
+
+
+def open_search_database(config=None) -> Optional[SearchDatabase]:
+    """打开全文索引（未启用运行数据时返回 None）"""
+    if config is None or not config.history.enabled:
+        return None
+    configure_identity_index(config.enrich)
+    return SearchDatabase(config.history.search_db)
+
+
+def index_run(config, source: str, date: str, projects: List[Dict[str, Any]]) -> None:
+    """生成报告后把当天的数据写入全文索引（索引失败不影响报告生成）"""
+    try:
+        database = open_search_database(config)
+        if database is None:
+            return
+        path = open_run_store(config).path(source, date)
+        stat = path.stat() if path.exists() else None
+        database.index_run(source, date, projects,
+                           stat.st_mtime if stat else 0.0, stat.st_size if stat else 0)
+        database.close()
+    except sqlite3.Error as e:
+        print(f"  ⚠ 写入全文索引失败: {e}")
+
+
+def search_history(config, query: str, source: Optional[str] = None, since: Optional[str] = None,
+                   until: Optional[str] = None, days: Optional[int] = None,
+                   language: Optional[str] = None, limit: int = 20) -> List[SearchHit]:
+    """
+    同步索引后查询并打印结果
+
+    Args:
+        days: 只查询最近多少天（与 since 同时指定时取较晚的日期）
+    """
+    database = open_search_database(config)
+    if database is None:
+        print("  ⚠ 未启用运行数据（history.enabled），无法搜索历史")
+        return []
+    store = open_run_store(config)
+    synced = database.sync(store)
+    if synced:
+        print(f"  ↻ 全文索引已同步 {synced} 天的运行数据")
+
+    if days:
+        recent = (datetime.now() - timedelta(days=days)).strftime('%Y%m%d')
+        since = max(since, recent) if since else recent
+    started = time.perf_counter()
+    hits = database.search(query, source=source, since=since, until=until, language=language, limit=limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    database.close()
+
+    print(f"\n搜索 \"{query}\"：{len(hits)} 个项目（{elapsed:.1f} ms）\n")
+    previous_network = ''
+    for i, hit in enumerate(hits, 1):
+        latest_source, latest_date, latest_rank = hit.appearances[0]
+        if hit.network and hit.network != previous_network:
+            print(f"[fork 网络 {hit.network}]")
+        previous_network = hit.network
+        language_text = f" · {hit.language}" if hit.language else ''
+        fork_text = f"（fork 自 {hit.fork_of}）" if hit.fork_of else ''
+        print(f"{i}. {hit.repo}{language_text}{fork_text}")
+        if hit.description:
+            print(f"   {hit.description[:120]}")
+        print(f"   上榜 {len(hit.appearances)} 次，最近 {latest_date[:4]}-{latest_date[4:6]}-{latest_date[6:]}"
+              f"（{latest_source} 第 {latest_rank} 名） {hit.url}")
+    return hits
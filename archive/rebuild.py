@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+历史报告重新渲染
+修改模板（report.md.j2、report.html.j2、report.css）或报告配置后，从保存的运行数据重新生成历史报告：
+- 每个输出文件记录输入哈希（当天数据 + 用到的模板 + 影响输出的配置），
+  保存在报告目录下的 .render-manifest.json 中，输入未变化且文件存在时跳过
+- 需要渲染的日期分发到进程池并行处理（数量很少时直接在当前进程渲染）
+
+报告使用运行数据中保存的生成时间渲染，同样的输入总是得到同样的输出
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pipeline.history import RunStore, open_run_store
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+MANIFEST_FILE = '.render-manifest.json'
+
+# 报告格式 -> (模板, 文件扩展名, 输出依赖的模板文件)
+FORMATS = {
+    'markdown': ('report.md.j2', '.md', ('report.md.j2',)),
+    'html': ('report.html.j2', '.html', ('report.html.j2', 'report.css')),
+}
+
+# 少于这个数量的日期直接在当前进程渲染，避免启动进程池的开销
+MIN_PARALLEL_JOBS = 8
+
+
+@dataclass
+class RebuildResult:
+    """一次重新渲染的统计"""
+    outputs: int = 0  # 输出文件总数
+    rendered: int = 0  # 本次重新渲染的文件数
+    skipped: int = 0  # 输入未变化而跳过的文件数
+    workers: int = 1  # 使用的进程数
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def format_settings(fmt: str, report_config) -> Dict:
+    """影响某种格式输出内容的配置（计入输入哈希）"""
+    if fmt == 'html':
+        return {'html_mode': report_config.html_mode, 'precompress': sorted(report_config.precompress)}
+    return {}
+
+
+def input_hash(data: bytes, template_hashes: Dict[str, str], fmt: str, settings: Dict) -> str:
+    """一个输出文件的输入哈希：当天数据 + 用到的模板 + 影响输出的配置"""
+    parts = [_sha256(data), fmt, json.dumps(settings, sort_keys=True)]
+    parts.extend(template_hashes[name] for name in FORMATS[fmt][2])
+    return _sha256('\n'.join(parts).encode('utf-8'))
+
+
+_env = None
+
+
+def _render_day(job: Tuple[str, str, str, List[str], Dict]) -> List[Tuple[str, int]]:
+    """
+    渲染一天的报告（在进程池中执行，参数和返回值只使用可序列化的基本类型）
+
+    Args:
+        job: (数据文件路径, 报告目录, 模板目录, 要渲染的格式, 报告配置字典)
+
+    Returns:
+        List[Tuple[str, int]]: (输出文件路径, 字节数)
+    """
+    global _env
+    from jinja2 import Environment, FileSystemLoader
+    from config.config import ReportConfig
+    from pipeline.html_output import write_html_report
+
+    data_path, reports_dir, templates_dir, formats, report_dict = job
+    if _env is None or _env.loader.searchpath != [templates_dir]:
+        _env = Environment(loader=FileSystemLoader(templates_dir), trim_blocks=True, lstrip_blocks=True)
+    record = json.loads(Path(data_path).read_text(encoding='utf-8'))
+    report_config = ReportConfig(**report_dict)
+    template_data = {
+        'source': record['source'],
+        'generate_time': record.get('generate_time', ''),
+        'total_projects': len(record.get('projects', [])),
+        'projects': record.get('projects', []),
+    }
+
+    written = []
+    for fmt in formats:
+        path = Path(reports_dir) / f"{record['source'].lower()}_trending_report_{record['date']}{FORMATS[fmt][1]}"
+        if fmt == 'html':
+            written.append((str(path), write_html_report(_env, template_data, path, report_config).size))
+        else:
+            content = _env.get_template(FORMATS[fmt][0]).render(**template_data).encode('utf-8')
+            path.write_bytes(content)
+            written.append((str(path), len(content)))
+    return written
+
+
+class ReportRebuilder:
+    """按输入哈希增量重新渲染历史报告"""
+
+    def __init__(self, store: RunStore, reports_dir: Path, report_config,
+                 templates_dir: Path = TEMPLATES_DIR, workers: int = 0):
+        self.store = store
+        self.reports_dir = Path(reports_dir)
+        self.report_config = report_config
+        self.templates_dir = Path(templates_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest_path = self.reports_dir / MANIFEST_FILE
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            return json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, str]) -> None:
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding='utf-8')
+        tmp_path.replace(self.manifest_path)
+
+    def plan(self, force: bool = False) -> Tuple[List[Tuple], Dict[str, str], int]:
+        """
+        计算需要重新渲染的输出
+
+        Returns:
+            tuple: (渲染任务列表, 全部输出的新输入哈希, 跳过的输出数)
+        """
+        formats = [fmt for fmt in self.report_config.formats if fmt in FORMATS]
+        template_hashes = {
+            name: _sha256((self.templates_dir / name).read_bytes())
+            for fmt in formats for name in FORMATS[fmt][2]
+        }
+        settings = {fmt: format_settings(fmt, self.report_config) for fmt in formats}
+        report_dict = {
+            'formats': formats,
+            'output_dir': str(self.reports_dir),
+            'html_mode': self.report_config.html_mode,
+            'precompress': list(self.report_config.precompress),
+        }
+
+        manifest = {} if force else self._load_manifest()
+        hashes: Dict[str, str] = {}
+        jobs = []
+        skipped = 0
+        for source, date, data_path in self.store.runs():
+            data = data_path.read_bytes()
+            stale = []
+            for fmt in formats:
+                path = str(self.reports_dir / f"{source.lower()}_trending_report_{date}{FORMATS[fmt][1]}")
+                digest = input_hash(data, template_hashes, fmt, settings[fmt])
+                hashes[path] = digest
+                if manifest.get(path) == digest and Path(path).exists():
+                    skipped += 1
+                else:
+                    stale.append(fmt)
+            if stale:
+                jobs.append((str(data_path), str(self.reports_dir), str(self.templates_dir), stale, report_dict))
+        return jobs, hashes, skipped
+
+    def rebuild(self, force: bool = False) -> RebuildResult:
+        """
+        重新渲染输入有变化的历史报告
+
+        Args:
+            force: 忽略输入哈希，重新渲染全部报告
+        """
+        jobs, hashes, skipped = self.plan(force)
+        manifest = self._load_manifest()
+        result = RebuildResult(outputs=len(hashes), skipped=skipped)
+
+        if len(jobs) < MIN_PARALLEL_JOBS or self.workers <= 1:
+            results = map(_render_day, jobs)
+        else:
+            result.workers = min(self.workers, len(jobs))
+            executor = ProcessPoolExecutor(max_workers=result.workers)
+            results = executor.map(_render_day, jobs, chunksize=max(1, len(jobs) // (result.workers * 4)))
+
+        try:
+            for written in results:
+                for path, _ in written:
+                    manifest[path] = hashes[path]
+                    result.rendered += 1
+        finally:
+            if result.workers > 1:
+                executor.shutdown()
+            # 中途失败时也保存已完成的部分，下次只重跑剩余的日期
+            self._save_manifest(manifest)
+        return result
+
+
+def rebuild_reports(config, force: bool = False) -> Optional[RebuildResult]:
+    """
+    按配置重新渲染历史报告
+
+    Args:
+        config: 配置对象
+        force: 忽略输入哈希，重新渲染全部报告
+
+    Returns:
+        Optional[RebuildResult]: 统计（未启用运行数据时返回 None）
+    """
+    store = open_run_store(config)
+    if store is None:
+        print("  ⚠ 未启用运行数据（history.enabled），无法重新渲染历史报告")
+        return None
+    reports_dir = Path(config.report.output_dir)
+    backfilled = store.backfill_from_reports(reports_dir)
+    if backfilled:
+        print(f"  ↻ 从 Markdown 报告补录了 {backfilled} 天的运行数据")
+
+    rebuilder = ReportRebuilder(store, reports_dir, config.report, workers=config.report.rebuild_workers)
+    result = rebuilder.rebuild(force=force)
+    print(f"  ✓ 历史报告已重新渲染: {result.rendered} 个文件（跳过 {result.skipped} 个未变化的文件，"
+          f"共 {result.outputs} 个，{result.workers} 个进程）")
+    return result
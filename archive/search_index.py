@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+归档站点的搜索索引
+把全部历史运行数据按项目合并，预先构建倒排索引，浏览器加载后直接查询，无需服务端
+
+分词规则与 templates/archive_search.js 保持一致：
+- 英文、数字按非字母数字字符切分并转为小写（owner/repo 拆为 owner、repo）
+- 连续的中文按相邻两字切分（单字时保留单字）
+- 查询时中文不要求全部两字切分都出现（见 query_clauses），查询"智能体框架"可匹配"智能体开发框架"
+
+索引格式（JSON，按内容哈希命名，可长期缓存）：
+    {
+      "v": 1,
+      "sources": ["GitHub", "Zread"],
+      "docs": [[repo, url, language, description, tags, [[source 序号, 日期, 排名], ...]], ...],
+      "terms": ["agent", "llm", ...],          # 升序，前端二分查找做前缀匹配
+      "postings": [[3, 1, 4], ...]             # 与 terms 一一对应，文档序号差分编码
+    }
+"""
+
+import re
+from typing import Dict, Iterable, List, Any
+
+from pipeline.identity import repo_key
+
+INDEX_VERSION = 1
+MAX_TAGS = 10
+
+_WORD = re.compile('[0-9a-z]+|[\u4e00-\u9fff]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """把文本切分为索引词（英文小写单词 + 中文两字切分）"""
+    tokens = []
+    for match in _WORD.finditer((text or '').lower()):
+        word = match.group()
+        if '\u4e00' <= word[0] <= '\u9fff':
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def query_clauses(text: str) -> List[List[str]]:
+    """
+    把查询词切分为检索条件：各条件取交集，条件内的索引词取并集
+
+    连续三字以上的中文不要求每个两字切分都出现（跨越原文词间隔的切分如"体框"在"智能体开发框架"中不存在）：
+    首尾两个切分必须出现，中间的每个字只要求包含它的两个切分之一，
+    "智能体框架"转换为 智能 AND (能体 OR 体框) AND 框架
+    """
+    clauses = []
+    for match in _WORD.finditer((text or '').lower()):
+        word = match.group()
+        if '\u4e00' <= word[0] <= '\u9fff' and len(word) > 2:
+            pairs = [word[i:i + 2] for i in range(len(word) - 1)]
+            clauses.append([pairs[0]])
+            clauses.extend([pairs[i - 1], pairs[i]] for i in range(2, len(word) - 2))
+            clauses.append([pairs[-1]])
+        else:
+            clauses.extend([token] for token in tokenize(word))
+    return clauses
+
+
+class SearchIndexBuilder:
+    """按项目合并历史运行数据并构建倒排索引"""
+
+    def __init__(self):
+        self.sources: List[str] = []
+        self._docs: Dict[str, Dict[str, Any]] = {}  # 仓库规范键 -> 文档
+
+    def add_run(self, source: str, date: str, projects: Iterable[Dict[str, Any]]) -> None:
+        """加入一个数据源某一天的项目列表（按日期顺序加入时，描述等字段取最近一次的值）"""
+        if source not in self.sources:
+            self.sources.append(source)
+        source_id = self.sources.index(source)
+        for rank, project in enumerate(projects, 1):
+            repo = project.get('repo')
+            if not repo:
+                continue
+            # 按仓库规范键合并：大小写不同或改名前后的名称归为同一个项目，显示最近一次的名称
+            doc = self._docs.setdefault(repo_key(repo), {
+                'repo': repo, 'url': '', 'language': '', 'description': '', 'tags': [], 'seen': []
+            })
+            doc['repo'] = repo
+            doc['url'] = project.get('url') or doc['url']
+            doc['language'] = project.get('language') or doc['language']
+            doc['description'] = project.get('intro') or project.get('description') or doc['description']
+            for tag in project.get('tags') or []:
+                if tag not in doc['tags'] and len(doc['tags']) < MAX_TAGS:
+                    doc['tags'].append(tag)
+            doc['seen'].append([source_id, date, rank])
+
+    def build(self) -> Dict[str, Any]:
+        """生成索引（文档按最近上榜日期倒序，前端按文档序号即可得到"最近优先"的结果）"""
+        docs = sorted(self._docs.values(), key=lambda d: (max(s[1] for s in d['seen']), len(d['seen'])),
+                      reverse=True)
+        postings: Dict[str, List[int]] = {}
+        for doc_id, doc in enumerate(docs):
+            text = ' '.join([doc['repo'], doc['language'], doc['description'], ' '.join(doc['tags'])])
+            for token in set(tokenize(text)):
+                postings.setdefault(token, []).append(doc_id)
+
+        terms = sorted(postings)
+        encoded = []
+        for term in terms:
+            ids, previous, deltas = postings[term], 0, []
+            for doc_id in ids:
+                deltas.append(doc_id - previous)
+                previous = doc_id
+            encoded.append(deltas)
+
+        return {
+            'v': INDEX_VERSION,
+            'sources': self.sources,
+            'docs': [[d['repo'], d['url'], d['language'], d['description'], d['tags'], d['seen']]
+                     for d in docs],
+            'terms': terms,
+            'postings': encoded,
+        }
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+静态归档站点生成
+从运行数据（reports/data，见 pipeline/history.py）构建可直接静态托管的归档站点：
+
+    site/
+        index.html                          按月份列出每天的报告，带搜索框
+        days/github-20261019.html           每天的报告页（report.html.j2，compact 输出）
+        assets/report.<hash>.css            共享样式表
+        assets/search.<hash>.js             客户端搜索脚本
+        assets/search-index.<hash>.json     预先构建的倒排索引
+        .manifest.json                      每个报告页的输入哈希
+
+增量构建：报告页的输入哈希（当天数据 + 模板 + 样式表）未变化且文件存在时跳过，
+通常每天只渲染新增的一两页；首页和搜索索引由全部数据重新生成（只处理内存中的数据，不渲染报告页）
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from jinja2 import Environment, FileSystemLoader
+
+from pipeline.history import RunStore, open_run_store
+from pipeline.html_output import minify_html, precompress, publish_stylesheet, ASSETS_DIR
+from pipeline.identity import configure_identity_index
+from .search_index import SearchIndexBuilder
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+MANIFEST_FILE = '.manifest.json'
+DAYS_DIR = 'days'
+
+
+@dataclass
+class SiteBuildResult:
+    """一次站点构建的统计"""
+    output_dir: Path
+    pages: int = 0  # 报告页总数
+    rendered: int = 0  # 本次渲染的报告页数
+    removed: int = 0  # 删除的过期报告页数
+    backfilled: int = 0  # 从 Markdown 报告补录的天数
+    repos: int = 0  # 索引中的项目数
+    index_size: int = 0  # 搜索索引字节数
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _publish_asset(output_dir: Path, name: str, suffix: str, data: bytes) -> Path:
+    """按内容哈希命名写入静态资源（内容不变时不重复写入）"""
+    path = output_dir / ASSETS_DIR / f"{name}.{_sha256(data)[:10]}{suffix}"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return path
+
+
+def _remove_stale(directory: Path, pattern: str, keep: Path) -> None:
+    """删除同名前缀的旧版本资源（及其预压缩文件）"""
+    for path in directory.glob(pattern):
+        if path != keep and not str(path).startswith(f"{keep}."):
+            path.unlink()
+
+
+class SiteBuilder:
+    """增量构建静态归档站点"""
+
+    def __init__(self, store: RunStore, output_dir: Path, title: str = 'Trending 日报归档',
+                 precompress_formats: Optional[List[str]] = None):
+        self.store = store
+        self.output_dir = Path(output_dir)
+        self.title = title
+        self.precompress_formats = precompress_formats or []
+        self.env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), trim_blocks=True, lstrip_blocks=True)
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            return json.loads((self.output_dir / MANIFEST_FILE).read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        precompress(path, data, self.precompress_formats)
+
+    def build(self, force: bool = False, backfill_dir: Optional[Path] = None) -> SiteBuildResult:
+        """
+        构建站点
+
+        Args:
+            force: 忽略输入哈希，重新渲染全部报告页
+            backfill_dir: 报告目录（先从其中的 Markdown 报告补录缺失的运行数据）
+        """
+        result = SiteBuildResult(output_dir=self.output_dir)
+        if backfill_dir is not None:
+            result.backfilled = self.store.backfill_from_reports(backfill_dir)
+
+        stylesheet = publish_stylesheet(self.env, self.output_dir)
+        precompress(stylesheet, stylesheet.read_bytes(), self.precompress_formats, overwrite=False)
+        _remove_stale(stylesheet.parent, 'report.*.css*', stylesheet)
+        template = self.env.get_template('report.html.j2')
+        template_hash = _sha256(self.env.loader.get_source(self.env, 'report.html.j2')[0].encode('utf-8'))
+
+        manifest = {} if force else self._load_manifest()
+        new_manifest: Dict[str, str] = {}
+        records = []
+        months: 'OrderedDict[str, OrderedDict[str, dict]]' = OrderedDict()
+
+        for source, date, data_path in reversed(self.store.runs()):
+            raw = data_path.read_bytes()
+            try:
+                record = json.loads(raw)
+            except json.JSONDecodeError:
+                print(f"  ⚠ 跳过损坏的运行数据: {data_path}")
+                continue
+            page = f"{DAYS_DIR}/{source.lower()}-{date}.html"
+            projects = record.get('projects', [])
+            records.append((source, date, projects))
+
+            input_hash = _sha256(raw + template_hash.encode() + stylesheet.name.encode())
+            new_manifest[page] = input_hash
+            page_path = self.output_dir / page
+            if manifest.get(page) != input_hash or not page_path.exists():
+                html = template.render(
+                    source=source,
+                    generate_time=record.get('generate_time', ''),
+                    total_projects=len(projects),
+                    projects=projects,
+                    stylesheet=f"../{ASSETS_DIR}/{stylesheet.name}",
+                    home_url='../index.html'
+                )
+                self._write(page_path, minify_html(html).encode('utf-8'))
+                result.rendered += 1
+
+            label = f"{date[:4]}-{date[4:6]}-{date[6:]}"
+            day = months.setdefault(label[:7], OrderedDict()).setdefault(label, {'label': label, 'pages': []})
+            day['pages'].append({'source': source, 'href': page, 'total': len(projects)})
+
+        # 搜索索引按日期顺序加入（项目描述取最近一次的值）
+        index = SearchIndexBuilder()
+        for source, date, projects in reversed(records):
+            index.add_run(source, date, projects)
+
+        # 删除数据已不存在的报告页
+        for page in set(manifest) - set(new_manifest):
+            for path in (self.output_dir / DAYS_DIR).glob(f"{Path(page).name}*"):
+                path.unlink()
+            result.removed += 1
+
+        search_index = index.build()
+        index_data = json.dumps(search_index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        index_path = _publish_asset(self.output_dir, 'search-index', '.json', index_data)
+        precompress(index_path, index_data, self.precompress_formats, overwrite=False)
+        _remove_stale(index_path.parent, 'search-index.*.json*', index_path)
+        script_data = self.env.loader.get_source(self.env, 'archive_search.js')[0].encode('utf-8')
+        script_path = _publish_asset(self.output_dir, 'search', '.js', script_data)
+        precompress(script_path, script_data, self.precompress_formats, overwrite=False)
+        _remove_stale(script_path.parent, 'search.*.js*', script_path)
+
+        home = self.env.get_template('archive_index.html.j2').render(
+            title=self.title,
+            generate_time=datetime.now().strftime('%Y年%m月%d日 %H:%M:%S'),
+            total_days=sum(len(days) for days in months.values()),
+            total_repos=len(search_index['docs']),
+            sources=search_index['sources'],
+            months=[(month, list(days.values())) for month, days in months.items()],
+            stylesheet=f"{ASSETS_DIR}/{stylesheet.name}",
+            script=f"{ASSETS_DIR}/{script_path.name}",
+            search_index=f"{ASSETS_DIR}/{index_path.name}"
+        )
+        self._write(self.output_dir / 'index.html', minify_html(home).encode('utf-8'))
+
+        manifest_path = self.output_dir / MANIFEST_FILE
+        tmp_path = manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(new_manifest, indent=1, sort_keys=True), encoding='utf-8')
+        tmp_path.replace(manifest_path)
+
+        result.pages = len(new_manifest)
+        result.repos = len(search_index['docs'])
+        result.index_size = len(index_data)
+        return result
+
+
+def build_site(config, force: bool = False) -> Optional[SiteBuildResult]:
+    """
+    按配置增量构建归档站点
+
+    Args:
+        config: 配置对象
+        force: 重新渲染全部报告页
+
+    Returns:
+        Optional[SiteBuildResult]: 构建统计（未启用运行数据时返回 None）
+    """
+    store = open_run_store(config)
+    if store is None:
+        print("  ⚠ 未启用运行数据（history.enabled），无法构建归档站点")
+        return None
+    # 搜索索引按仓库规范键合并同一仓库的不同名称
+    configure_identity_index(config.enrich)
+    builder = SiteBuilder(store, Path(config.archive.output_dir), config.archive.title,
+                          config.archive.precompress)
+    result = builder.build(force=force, backfill_dir=Path(config.report.output_dir))
+    if result.backfilled:
+        print(f"  ↻ 从 Markdown 报告补录了 {result.backfilled} 天的运行数据")
+    print(f"  ✓ 归档站点已更新: {result.output_dir}（{result.pages} 个报告页，本次渲染 {result.rendered} 个，"
+          f"索引 {result.repos} 个项目 / {result.index_size / 1024:.1f} KB）")
+    return result
@@ -3,8 +3,7 @@
 """
 
 from .config import Config, load_config, get_default_config
+from .validation import ConfigError, validate_config
+from .reload import ConfigWatcher
 
-__all__ = ['Config', 'load_config', 'get_default_config']
-
-
-
+__all__ = ['Config', 'load_config', 'get_default_config', 'ConfigError', 'validate_config', 'ConfigWatcher']
@@ -5,18 +5,46 @@
 """
 
 import os
+import copy
 import json
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, field, asdict
 
 
+@dataclass
+class Subscriber:
+    """日报汇总邮件订阅者及其偏好"""
+    email: str  # 邮箱地址
+    sources: Optional[List[str]] = None  # 订阅的数据源（如 ["Zread"]），None 表示全部
+    max_projects: int = 10  # 每个数据源列出的项目数
+    format: str = 'html'  # 邮件格式：html / text
+    attach_reports: bool = False  # 是否附带完整的 Markdown 报告
+
+
 @dataclass
 class NotificationConfig:
     """通知配置"""
     enabled: bool = False  # 是否启用通知
     wechat_webhook_url: Optional[str] = None  # 企业微信 Webhook URL
-    email_recipient: Optional[str] = None  # 邮件收件人地址
+    email_recipient: Optional[str] = None  # 邮件收件人地址（多个地址用逗号分隔）
+    max_attempts: int = 3  # 单条通知最大发送次数（含首次）
+    retry_base_delay: float = 2.0  # 重试的基准等待时间（秒）
+    digest: bool = False  # 汇总模式：所有数据源生成完成后发送一封汇总邮件，而不是每个数据源各发一封
+    subscribers: List[Subscriber] = field(default_factory=list)  # 汇总邮件订阅者（email_recipient 中的地址使用默认偏好）
+    smtp_connections: int = 1  # 发送汇总邮件的 SMTP 连接数
+    max_recipients_per_message: int = 50  # 单封邮件的收件人上限（超过时拆分为多封）
+    wechat_full_report: bool = True  # 企业微信是否推送完整报告（按消息长度上限拆分）；否则只推送摘要
+    wechat_rate_limit: int = 20  # 企业微信机器人每分钟最多发送的消息数（0 表示不限流）
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NotificationConfig':
+        """从字典创建通知配置"""
+        data = dict(data)
+        subscribers = data.pop('subscribers', [])
+        notification = cls(**data)
+        notification.subscribers = [Subscriber(**item) for item in subscribers]
+        return notification
 
 
 @dataclass
@@ -24,6 +52,32 @@ class ReportConfig:
     """报告配置"""
     formats: List[str] = field(default_factory=lambda: ['markdown', 'html'])  # 报告格式
     output_dir: str = 'reports'  # 输出目录
+    skip_unchanged: bool = True  # 数据与上次生成时相同时跳过渲染、写文件和通知
+    html_mode: str = 'standalone'  # HTML 输出方式：standalone（样式内联）/ compact（共享样式表 + 压缩标记）
+    precompress: List[str] = field(default_factory=list)  # 预压缩 HTML 报告：gzip / br（需安装 brotli）
+    rebuild_workers: int = 0  # 重新渲染历史报告（--rebuild）的进程数（0 表示 CPU 核数）
+
+
+@dataclass
+class BrowserConfig:
+    """Playwright 页面加载配置（拦截不需要的资源，减少导航时间和流量）"""
+    block_resources: bool = True  # 是否启用请求拦截
+    blocked_resource_types: List[str] = field(
+        default_factory=lambda: ['image', 'font', 'media', 'stylesheet']
+    )  # 拦截的资源类型
+    block_trackers: bool = True  # 拦截常见统计/追踪脚本
+    block_third_party: bool = False  # 拦截所有第三方域名的请求
+    javascript_enabled: bool = True  # 是否执行页面 JavaScript（静态渲染的页面可关闭）
+    extraction: str = 'dom'  # 提取方式：dom（页面内提取结构化记录）/ html（序列化整页 HTML 后解析）
+
+
+@dataclass
+class DeadlineConfig:
+    """数据源的时间和请求预算（超出后停止发起新的工作，用已完成的部分生成报告并发送通知）"""
+    total: float = 1200.0  # 整个数据源（抓取列表 + 获取详情）的时间预算（秒，0 表示不限制），需留出渲染和通知的时间
+    fetch: float = 180.0  # 抓取趋势列表的时间预算（秒，0 表示只受总预算限制）；超时跳过该数据源
+    enrich: float = 300.0  # 获取项目详情的时间预算（秒，0 表示只受总预算限制）；超时未完成的项目标记为未获取详情
+    max_requests: int = 0  # 该数据源的出站请求上限（0 表示只受 resilience.request_budget 限制）
 
 
 @dataclass
@@ -31,6 +85,132 @@ class TaskConfig:
     """任务配置"""
     enabled: bool = True  # 是否启用
     time: str = '09:00'  # 执行时间（定时任务）
+    browser: BrowserConfig = field(default_factory=BrowserConfig)  # 页面加载配置
+    deadlines: DeadlineConfig = field(default_factory=DeadlineConfig)  # 时间和请求预算
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], default: 'TaskConfig') -> 'TaskConfig':
+        """从字典创建任务配置，未提供的页面加载配置和预算沿用该数据源的默认值"""
+        data = dict(data)
+        browser = data.pop('browser', None)
+        deadlines = data.pop('deadlines', None)
+        task = cls(**data)
+        task.browser = BrowserConfig(**browser) if browser is not None else default.browser
+        task.deadlines = DeadlineConfig(**deadlines) if deadlines is not None else default.deadlines
+        return task
+
+
+def _github_task_config() -> TaskConfig:
+    """GitHub Trending 默认任务配置：页面为服务端渲染，无需执行 JavaScript"""
+    return TaskConfig(
+        time='09:30',
+        browser=BrowserConfig(javascript_enabled=False, block_third_party=True)
+    )
+
+
+@dataclass
+class CrawlConfig:
+    """Zread Trending 滚动加载配置（首屏之后的项目通过滚动或“加载更多”懒加载）"""
+    enabled: bool = True  # 是否滚动加载更多项目
+    max_items: int = 60  # 收集到多少个项目后停止
+    time_budget: float = 30.0  # 滚动加载的总时间预算（秒）
+    max_steps: int = 15  # 最多滚动次数
+    step_timeout: float = 3.0  # 每次滚动后等待新内容出现的时间（秒）
+    idle_steps: int = 2  # 连续多少次滚动没有新项目时认为已到底
+
+
+@dataclass
+class EnrichConfig:
+    """项目详情获取配置"""
+    project_limit: int = 20  # 获取详情的项目数（每个数据源取前 N 个）
+    concurrency: int = 3  # 同时获取详情的项目数
+    parse_workers: int = 2  # 解析页面的进程池大小（0 表示在线程中解析）
+    highlight_cache: bool = True  # 是否按 README 内容哈希缓存已翻译的亮点
+    highlight_cache_path: str = '.cache/highlights.db'  # 亮点缓存文件路径
+    identity_index: bool = True  # 是否记录仓库改名、转移和 fork 关系（统一不同名称的同一仓库）
+    identity_index_path: str = '.cache/identity.db'  # 仓库身份索引文件路径
+    reuse_details_for: float = 0.0  # 最近多少秒内保存的详情直接沿用（列表信息未变化的仓库不再获取；0 表示不沿用）
+    stale_details_for: float = 172800.0  # 获取失败或超出预算的项目改用多少秒内保存的详情（0 表示不改用）
+
+
+@dataclass
+class CheckpointConfig:
+    """运行检查点配置"""
+    enabled: bool = True  # 是否记录检查点
+    journal_dir: str = '.cache/journal'  # 检查点日志目录
+    resume: bool = False  # 是否从上次运行的检查点继续（通常由 --resume 参数开启）
+    resume_within: float = 0.0  # 可恢复的检查点最多开始于多少秒以前（0 表示只恢复当天开始的运行；已完成的运行不会恢复）
+
+
+@dataclass
+class ResilienceConfig:
+    """出站请求弹性配置（重试、熔断、请求预算）"""
+    max_attempts: int = 3  # 单个请求最大尝试次数（含首次）
+    base_delay: float = 1.0  # 指数退避的基准等待时间（秒）
+    max_delay: float = 30.0  # 单次退避等待上限（秒）
+    max_retry_after: float = 60.0  # 愿意等待的 Retry-After 上限（秒），超过则对该主机熔断
+    failure_threshold: int = 5  # 连续失败多少次后熔断该主机
+    reset_timeout: float = 60.0  # 熔断后的冷却时间（秒）
+    request_budget: int = 500  # 单次运行的请求总预算（0 表示不限制）
+
+
+@dataclass
+class DistributedConfig:
+    """分布式任务队列配置"""
+    enabled: bool = False  # 是否启用协调者/工作者模式
+    backend: str = 'sqlite'  # 队列后端：sqlite / memory / redis
+    queue_path: str = '.cache/work_queue.db'  # SQLite 队列文件路径
+    redis_url: Optional[str] = None  # Redis 连接地址（backend 为 redis 时使用）
+    lease_timeout: int = 120  # 任务租约超时（秒），超时后任务可被其他 worker 重新领取
+    max_attempts: int = 3  # 单个任务最大尝试次数
+    local_workers: int = 2  # 协调者自动启动的本地 worker 进程数（0 表示只依赖外部 worker）
+    worker_concurrency: int = 3  # 每个 worker 的并发数
+    result_timeout: int = 900  # 协调者等待全部结果的最长时间（秒）
+    retention_days: int = 7  # 已完成和失败的任务保留天数，之后从队列中清除（0 表示不清除）
+
+
+@dataclass
+class HistoryConfig:
+    """运行数据配置（每天获取详情后的结构化数据，供归档站点、重新渲染和历史搜索使用）"""
+    enabled: bool = True  # 生成报告后保存结构化数据
+    data_dir: str = 'reports/data'  # 数据目录（按数据源分子目录，每天一个 JSON 文件）
+    search_db: str = '.cache/search.db'  # 历史全文索引（--search；丢失时从数据目录重建）
+
+
+@dataclass
+class ArchiveConfig:
+    """静态归档站点配置"""
+    enabled: bool = False  # 每次生成日报后增量更新归档站点（也可通过 --build-site 手动构建）
+    output_dir: str = 'site'  # 站点输出目录
+    title: str = 'Trending 日报归档'  # 站点标题
+    precompress: List[str] = field(default_factory=list)  # 预压缩站点文件：gzip / br
+
+
+@dataclass
+class ScheduleConfig:
+    """定时任务配置"""
+    reload: bool = True  # 定时任务运行期间配置文件变化时自动校验并重新加载（无需重启）
+    reload_interval: float = 5.0  # 检查配置文件变化的间隔（秒）
+
+
+@dataclass
+class ServiceConfig:
+    """服务模式配置（--serve：常驻进程，通过本地 HTTP API 按需生成和查询日报）"""
+    host: str = '127.0.0.1'  # 监听地址（默认只允许本机访问）
+    port: int = 8765  # 监听端口
+    fresh_for: float = 21600.0  # 最新报告在多少秒内视为新鲜，更旧时请求报告会触发一次运行（0 表示只通过 API 手动触发）
+    max_stale: float = 172800.0  # 超过 fresh_for 但在这个秒数以内的报告立即返回并在后台刷新；更旧时等待运行完成
+    wait_timeout: float = 900.0  # 请求等待运行完成的最长时间（秒），超时后返回 202，运行继续进行
+    warm_browser: bool = True  # 常驻一个浏览器进程，每次抓取只新建上下文（设置了 memory.max_rss_mb 时不常驻）
+    notify: bool = False  # 通过 API 触发的运行是否发送通知
+
+
+@dataclass
+class MemoryConfig:
+    """内存限制配置（抓取大量项目时限制进程内存）"""
+    max_rss_mb: int = 0  # 常驻内存上限（MB），超过时暂停发起新的详情获取直到内存回落；服务模式下同时不再常驻浏览器（0 表示不限制）
+    max_page_bytes: int = 5242880  # 单个项目页面最多下载的字节数，流式读取，超出部分丢弃（0 表示不限制）
+    sample_interval: float = 0.5  # 采样常驻内存的间隔（秒）
 
 
 @dataclass
@@ -38,7 +218,7 @@ class Config:
     """主配置类"""
     # 数据源配置
     zread: TaskConfig = field(default_factory=TaskConfig)
-    github: TaskConfig = field(default_factory=TaskConfig)
+    github: TaskConfig = field(default_factory=_github_task_config)
     
     # 报告配置
     report: ReportConfig = field(default_factory=ReportConfig)
@@ -46,13 +226,53 @@ class Config:
     # 通知配置
     notification: NotificationConfig = field(default_factory=NotificationConfig)
     
+    # Zread 滚动加载配置
+    crawl: CrawlConfig = field(default_factory=CrawlConfig)
+    
+    # 项目详情获取配置
+    enrich: EnrichConfig = field(default_factory=EnrichConfig)
+    
+    # 运行检查点配置
+    checkpoint: CheckpointConfig = field(default_factory=CheckpointConfig)
+    
+    # 出站请求弹性配置
+    resilience: ResilienceConfig = field(default_factory=ResilienceConfig)
+    
+    # 分布式任务队列配置
+    distributed: DistributedConfig = field(default_factory=DistributedConfig)
+    
+    # 运行数据配置
+    history: HistoryConfig = field(default_factory=HistoryConfig)
+    
+    # 静态归档站点配置
+    archive: ArchiveConfig = field(default_factory=ArchiveConfig)
+    
+    # 定时任务配置
+    schedule: ScheduleConfig = field(default_factory=ScheduleConfig)
+    
+    # 服务模式配置
+    service: ServiceConfig = field(default_factory=ServiceConfig)
+    
+    # 内存限制配置
+    memory: MemoryConfig = field(default_factory=MemoryConfig)
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
             'zread': asdict(self.zread),
             'github': asdict(self.github),
             'report': asdict(self.report),
-            'notification': asdict(self.notification)
+            'notification': asdict(self.notification),
+            'crawl': asdict(self.crawl),
+            'enrich': asdict(self.enrich),
+            'checkpoint': asdict(self.checkpoint),
+            'resilience': asdict(self.resilience),
+            'distributed': asdict(self.distributed),
+            'history': asdict(self.history),
+            'archive': asdict(self.archive),
+            'schedule': asdict(self.schedule),
+            'service': asdict(self.service),
+            'memory': asdict(self.memory)
         }
     
     @classmethod
@@ -61,13 +281,33 @@ class Config:
         config = cls()
         
         if 'zread' in data:
-            config.zread = TaskConfig(**data['zread'])
+            config.zread = TaskConfig.from_dict(data['zread'], config.zread)
         if 'github' in data:
-            config.github = TaskConfig(**data['github'])
+            config.github = TaskConfig.from_dict(data['github'], config.github)
         if 'report' in data:
             config.report = ReportConfig(**data['report'])
         if 'notification' in data:
-            config.notification = NotificationConfig(**data['notification'])
+            config.notification = NotificationConfig.from_dict(data['notification'])
+        if 'crawl' in data:
+            config.crawl = CrawlConfig(**data['crawl'])
+        if 'enrich' in data:
+            config.enrich = EnrichConfig(**data['enrich'])
+        if 'checkpoint' in data:
+            config.checkpoint = CheckpointConfig(**data['checkpoint'])
+        if 'resilience' in data:
+            config.resilience = ResilienceConfig(**data['resilience'])
+        if 'distributed' in data:
+            config.distributed = DistributedConfig(**data['distributed'])
+        if 'history' in data:
+            config.history = HistoryConfig(**data['history'])
+        if 'archive' in data:
+            config.archive = ArchiveConfig(**data['archive'])
+        if 'schedule' in data:
+            config.schedule = ScheduleConfig(**data['schedule'])
+        if 'service' in data:
+            config.service = ServiceConfig(**data['service'])
+        if 'memory' in data:
+            config.memory = MemoryConfig(**data['memory'])
         
         return config
 
@@ -79,7 +319,7 @@ def get_default_config() -> Config:
     """
     return Config(
         zread=TaskConfig(enabled=True, time='09:00'),
-        github=TaskConfig(enabled=True, time='09:30'),
+        github=_github_task_config(),
         report=ReportConfig(
             formats=['markdown', 'html'],
             output_dir='reports'
@@ -92,38 +332,107 @@ def get_default_config() -> Config:
     )
 
 
-def load_config(config_path: Optional[str] = None) -> Config:
+def _read_config_file(path: Path) -> Config:
+    """读取并解析配置文件（结构有误时抛出 ConfigError）"""
+    from .validation import ConfigError, check_config_dict
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            file_config = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ConfigError([f"{path}: JSON 格式错误（第 {e.lineno} 行第 {e.colno} 列）: {e.msg}"])
+    errors = check_config_dict(file_config)
+    if errors:
+        raise ConfigError(errors)
+    try:
+        return Config.from_dict(file_config)
+    except TypeError as e:
+        # 如订阅者缺少必填的 email
+        raise ConfigError([f"{path}: {e}"])
+
+
+# 数值型环境变量覆盖：(环境变量, 配置节, 字段, 类型)
+NUMERIC_ENV_OVERRIDES = (
+    ('ZREAD_MAX_ITEMS', 'crawl', 'max_items', int),  # Zread 滚动加载
+    ('PARSE_WORKERS', 'enrich', 'parse_workers', int),  # 项目详情获取
+    ('REUSE_DETAILS_FOR', 'enrich', 'reuse_details_for', float),
+    ('REQUEST_BUDGET', 'resilience', 'request_budget', int),  # 请求预算
+    ('SERVICE_PORT', 'service', 'port', int),  # 服务模式
+    ('MAX_RSS_MB', 'memory', 'max_rss_mb', int),  # 内存上限
+)
+
+_TYPE_NAMES = {int: '整数', float: '数字'}
+
+
+def _reset_invalid_fields(config: Config) -> Config:
+    """
+    打印校验问题并把对应字段恢复为默认值（非严格加载时使用），逐项恢复后仍有问题时使用默认配置
+
+    列表元素的问题（如某个订阅者的邮箱无效）恢复整个列表
+    """
+    from .validation import validate_config
+
+    default = get_default_config()
+    # 恢复一个字段后可能暴露之前被类型错误掩盖的取值问题，最多重复几轮
+    for _ in range(3):
+        errors = validate_config(config)
+        if not errors:
+            return config
+        for problem in errors:
+            print(f"  ⚠ {problem}")
+        paths = dict.fromkeys(problem.split(': ', 1)[0].split('[', 1)[0] for problem in errors)
+        for path in paths:
+            *parents, name = path.split('.')
+            target, source = config, default
+            try:
+                for parent in parents:
+                    target, source = getattr(target, parent), getattr(source, parent)
+                value = copy.deepcopy(getattr(source, name))
+            except AttributeError:
+                continue
+            setattr(target, name, value)
+            print(f"  ↻ {path} 已恢复为默认值 {value!r}")
+    print("  ⚠ 无效字段无法逐项恢复，使用默认配置")
+    return default
+
+
+def load_config(config_path: Optional[str] = None, strict: bool = False) -> Config:
     """
     加载配置
     优先级：命令行参数 > 环境变量 > 配置文件 > 默认配置
     
     Args:
         config_path: 配置文件路径（可选）
+        strict: 配置有误时抛出 ConfigError（列出全部问题，包括无法解析的数值型环境变量）；
+                否则打印警告，配置文件无法解析时使用默认配置，无效的环境变量不生效，
+                其余无效字段恢复为默认值
     
     Returns:
         Config: 配置对象
     """
+    from .validation import ConfigError, validate_config
+    
     # 从默认配置开始
     config = get_default_config()
     
     # 尝试从配置文件加载
     if config_path and Path(config_path).exists():
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                file_config = json.load(f)
-                config = Config.from_dict(file_config)
-        except Exception as e:
-            print(f"警告: 加载配置文件失败: {e}，使用默认配置")
+        path = Path(config_path)
     else:
+        if config_path and strict:
+            raise ConfigError([f"{config_path}: 配置文件不存在"])
         # 尝试加载默认配置文件
-        default_config_path = Path('config.json')
-        if default_config_path.exists():
-            try:
-                with open(default_config_path, 'r', encoding='utf-8') as f:
-                    file_config = json.load(f)
-                    config = Config.from_dict(file_config)
-            except Exception as e:
-                print(f"警告: 加载默认配置文件失败: {e}，使用默认配置")
+        path = Path('config.json')
+    if path.exists():
+        try:
+            config = _read_config_file(path)
+        except (ConfigError, OSError) as e:
+            if strict:
+                raise
+            problems = e.errors if isinstance(e, ConfigError) else [str(e)]
+            print(f"警告: 加载配置文件 {path} 失败，使用默认配置:")
+            for problem in problems:
+                print(f"  ⚠ {problem}")
     
     # 从环境变量覆盖配置
     # 数据源开关
@@ -140,16 +449,55 @@ def load_config(config_path: Optional[str] = None) -> Config:
         # 如果提供了 Webhook URL，默认启用通知（除非明确禁用）
         if config.notification.wechat_webhook_url and os.getenv('NOTIFICATION_ENABLED') is None:
             config.notification.enabled = True
+    if os.getenv('NOTIFICATION_DIGEST'):
+        config.notification.digest = os.getenv('NOTIFICATION_DIGEST').lower() in ('true', '1', 'yes')
     if os.getenv('EMAIL_RECIPIENT'):
         config.notification.email_recipient = os.getenv('EMAIL_RECIPIENT')
         # 如果提供了邮件收件人，默认启用通知（除非明确禁用）
         if config.notification.email_recipient and os.getenv('NOTIFICATION_ENABLED') is None:
             config.notification.enabled = True
     
+    # 数值型覆盖：无法解析的值与其他配置问题一起报告
+    env_errors = []
+    for name, section, key, convert in NUMERIC_ENV_OVERRIDES:
+        raw = os.getenv(name)
+        if not raw:
+            continue
+        try:
+            setattr(getattr(config, section), key, convert(raw))
+        except ValueError:
+            env_errors.append(f"环境变量 {name}: 应为{_TYPE_NAMES[convert]}，实际为 {raw!r}")
+    
+    # 分布式任务队列
+    if os.getenv('DISTRIBUTED_ENABLED'):
+        config.distributed.enabled = os.getenv('DISTRIBUTED_ENABLED').lower() in ('true', '1', 'yes')
+    if os.getenv('WORK_QUEUE_BACKEND'):
+        config.distributed.backend = os.getenv('WORK_QUEUE_BACKEND')
+    if os.getenv('REDIS_URL'):
+        config.distributed.redis_url = os.getenv('REDIS_URL')
+    
+    # 服务模式
+    if os.getenv('SERVICE_HOST'):
+        config.service.host = os.getenv('SERVICE_HOST')
+    
     # 报告格式
     if os.getenv('REPORT_FORMATS'):
         formats = [f.strip() for f in os.getenv('REPORT_FORMATS').split(',')]
         config.report.formats = formats
+    if os.getenv('REPORT_HTML_MODE'):
+        config.report.html_mode = os.getenv('REPORT_HTML_MODE')
+    if os.getenv('REPORT_PRECOMPRESS'):
+        config.report.precompress = [e.strip() for e in os.getenv('REPORT_PRECOMPRESS').split(',') if e.strip()]
+    
+    # 校验类型和取值（包括环境变量覆盖后的值）
+    errors = env_errors + validate_config(config)
+    if errors:
+        if strict:
+            raise ConfigError(errors)
+        print("警告: 配置有误（无效的环境变量不生效，无效的字段恢复为默认值）:")
+        for problem in env_errors:
+            print(f"  ⚠ {problem}")
+        config = _reset_invalid_fields(config)
     
     return config
 
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+配置热加载模块
+定时任务长期运行时轮询配置文件，内容变化后重新加载并校验：
+- 校验通过时把新配置交给回调（由调度器在两次任务之间原子替换，正在执行的任务继续使用旧配置）
+- 校验失败时打印全部问题并保留当前配置，同样内容的错误只报告一次
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from .validation import ConfigError
+
+
+class ConfigWatcher:
+    """轮询配置文件变化（按修改时间和大小判断，再比较内容哈希，避免只更新时间戳时重复加载）"""
+
+    def __init__(self, path: str, loader: Callable[[], object], on_reload: Callable[[object], None],
+                 interval: float = 5.0):
+        """
+        Args:
+            path: 配置文件路径
+            loader: 加载并校验配置的函数（配置有误时抛出 ConfigError）
+            on_reload: 新配置校验通过后的回调
+            interval: 检查间隔（秒）
+        """
+        self.path = Path(path)
+        self.loader = loader
+        self.on_reload = on_reload
+        self.interval = interval
+        self._stat = self._read_stat()
+        self._digest = self._read_digest()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _read_stat(self):
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_digest(self) -> Optional[str]:
+        try:
+            return hashlib.sha256(self.path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+
+    def check(self) -> bool:
+        """
+        检查一次配置文件
+
+        Returns:
+            bool: 是否加载了新配置
+        """
+        stat = self._read_stat()
+        if stat == self._stat:
+            return False
+        self._stat = stat
+        digest = self._read_digest()
+        if digest == self._digest:
+            return False
+        self._digest = digest
+        if digest is None:
+            print(f"  ⚠ 配置文件 {self.path} 已删除，继续使用当前配置")
+            return False
+
+        try:
+            config = self.loader()
+        except ConfigError as e:
+            print(f"  ⚠ 配置文件 {self.path} 有误，继续使用当前配置:")
+            for problem in e.errors:
+                print(f"    - {problem}")
+            return False
+        print(f"  ↻ 配置文件 {self.path} 已变化，校验通过")
+        self.on_reload(config)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                # 监视线程不能因为意外错误退出
+                print(f"  ⚠ 检查配置文件失败: {e}")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='config-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
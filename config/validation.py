@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+配置校验模块
+配置文件中的未知字段、类型错误和取值错误在加载时一次性报告，
+而不是等到定时任务触发（如无效的执行时间）或运行到某个阶段时才失败
+"""
+
+import re
+import typing
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, List
+
+# 定时任务时间：HH:MM 或 HH:MM:SS（schedule 库的每日任务格式）
+_TIME = re.compile(r'^([01]\d|2[0-3]):[0-5]\d(:[0-5]\d)?$')
+
+REPORT_FORMATS = ('markdown', 'html')
+HTML_MODES = ('standalone', 'compact')
+PRECOMPRESS_ENCODINGS = ('gzip', 'br')
+EXTRACTION_MODES = ('dom', 'html')
+EMAIL_FORMATS = ('html', 'text')
+QUEUE_BACKENDS = ('sqlite', 'memory', 'redis')
+# Playwright 的资源类型
+RESOURCE_TYPES = (
+    'document', 'stylesheet', 'image', 'media', 'font', 'script', 'texttrack', 'xhr',
+    'fetch', 'eventsource', 'websocket', 'manifest', 'other',
+)
+
+
+class ConfigError(ValueError):
+    """配置无效（errors 为全部问题，每条带字段路径）"""
+
+    def __init__(self, errors: List[str]):
+        self.errors = list(errors)
+        super().__init__('；'.join(self.errors))
+
+
+def _matches(value: Any, hint: Any) -> bool:
+    """值是否符合类型注解（int 可用于 float，bool 不算 int）"""
+    origin = typing.get_origin(hint)
+    if origin is typing.Union:
+        return any(_matches(value, arg) for arg in typing.get_args(hint))
+    if origin in (list, List):
+        (item_hint,) = typing.get_args(hint) or (Any,)
+        return isinstance(value, list) and all(_matches(item, item_hint) for item in value)
+    if hint is Any:
+        return True
+    if hint is type(None):
+        return value is None
+    if hint is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if hint is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    if is_dataclass(hint):
+        return isinstance(value, hint)
+    return isinstance(value, hint)
+
+
+def _type_name(hint: Any) -> str:
+    origin = typing.get_origin(hint)
+    if origin is typing.Union:
+        return ' | '.join(_type_name(arg) for arg in typing.get_args(hint))
+    if origin in (list, List):
+        return f"list[{_type_name(typing.get_args(hint)[0])}]"
+    return getattr(hint, '__name__', str(hint))
+
+
+def _check_unknown(cls, data: Any, path: str, errors: List[str]) -> None:
+    """检查配置文件中某一节的未知字段（递归检查嵌套的配置类）"""
+    if not isinstance(data, dict):
+        errors.append(f"{path}: 应为对象")
+        return
+    hints = typing.get_type_hints(cls)
+    names = {f.name for f in fields(cls)}
+    for key, value in data.items():
+        if key not in names:
+            errors.append(f"{path}.{key}: 未知字段")
+            continue
+        hint = hints[key]
+        item_hint = (typing.get_args(hint) or (None,))[0] if typing.get_origin(hint) in (list, List) else None
+        if is_dataclass(hint):
+            _check_unknown(hint, value, f"{path}.{key}", errors)
+        elif item_hint is not None and is_dataclass(item_hint):
+            if not isinstance(value, list):
+                errors.append(f"{path}.{key}: 应为列表")
+                continue
+            for i, item in enumerate(value):
+                _check_unknown(item_hint, item, f"{path}.{key}[{i}]", errors)
+
+
+def check_config_dict(data: Any) -> List[str]:
+    """
+    检查配置文件内容的结构（未知的配置节和字段）
+
+    Args:
+        data: 配置文件解析后的字典
+
+    Returns:
+        List[str]: 问题列表（为空表示没有问题）
+    """
+    from .config import Config
+
+    errors: List[str] = []
+    if not isinstance(data, dict):
+        return ['配置文件应为 JSON 对象']
+    hints = typing.get_type_hints(Config)
+    for section, value in data.items():
+        if section not in hints:
+            errors.append(f"{section}: 未知的配置节")
+        else:
+            _check_unknown(hints[section], value, section, errors)
+    return errors
+
+
+def _check_types(obj: Any, path: str, errors: List[str]) -> None:
+    """按字段类型注解检查配置对象（递归检查嵌套的配置类）"""
+    hints = typing.get_type_hints(type(obj))
+    for f in fields(obj):
+        value = getattr(obj, f.name)
+        field_path = f"{path}.{f.name}" if path else f.name
+        if not _matches(value, hints[f.name]):
+            errors.append(f"{field_path}: 应为 {_type_name(hints[f.name])}，实际为 {value!r}")
+        elif is_dataclass(value):
+            _check_types(value, field_path, errors)
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                if is_dataclass(item):
+                    _check_types(item, f"{field_path}[{i}]", errors)
+
+
+def validate_config(config) -> List[str]:
+    """
+    校验配置对象的类型和取值
+
+    Args:
+        config: Config 配置对象
+
+    Returns:
+        List[str]: 问题列表（为空表示配置有效）
+    """
+    errors: List[str] = []
+    _check_types(config, '', errors)
+    if errors:
+        # 类型不对时后续的取值检查没有意义
+        return errors
+
+    def require(condition: bool, message: str) -> None:
+        if not condition:
+            errors.append(message)
+
+    def one_of(path: str, value: Any, choices) -> None:
+        require(value in choices, f"{path}: 无效的取值 {value!r}（可选: {', '.join(choices)}）")
+
+    def at_least(path: str, value: float, minimum: float) -> None:
+        require(value >= minimum, f"{path}: 应不小于 {minimum}，实际为 {value}")
+
+    for name in ('zread', 'github'):
+        task = getattr(config, name)
+        require(bool(_TIME.match(task.time)), f"{name}.time: 无效的时间 {task.time!r}（格式: HH:MM）")
+        for resource_type in task.browser.blocked_resource_types:
+            one_of(f"{name}.browser.blocked_resource_types", resource_type, RESOURCE_TYPES)
+        one_of(f"{name}.browser.extraction", task.browser.extraction, EXTRACTION_MODES)
+        for stage in ('total', 'fetch', 'enrich', 'max_requests'):
+            at_least(f"{name}.deadlines.{stage}", getattr(task.deadlines, stage), 0)
+
+    report = config.report
+    require(bool(report.formats), "report.formats: 至少需要一种报告格式")
+    for fmt in report.formats:
+        one_of('report.formats', fmt, REPORT_FORMATS)
+    one_of('report.html_mode', report.html_mode, HTML_MODES)
+    for encoding in report.precompress:
+        one_of('report.precompress', encoding, PRECOMPRESS_ENCODINGS)
+    at_least('report.rebuild_workers', report.rebuild_workers, 0)
+
+    notification = config.notification
+    at_least('notification.max_attempts', notification.max_attempts, 1)
+    at_least('notification.retry_base_delay', notification.retry_base_delay, 0)
+    at_least('notification.smtp_connections', notification.smtp_connections, 1)
+    at_least('notification.max_recipients_per_message', notification.max_recipients_per_message, 1)
+    at_least('notification.wechat_rate_limit', notification.wechat_rate_limit, 0)
+    for i, subscriber in enumerate(notification.subscribers):
+        require('@' in subscriber.email, f"notification.subscribers[{i}].email: 无效的邮箱地址 {subscriber.email!r}")
+        one_of(f"notification.subscribers[{i}].format", subscriber.format, EMAIL_FORMATS)
+        at_least(f"notification.subscribers[{i}].max_projects", subscriber.max_projects, 1)
+
+    crawl = config.crawl
+    at_least('crawl.max_items', crawl.max_items, 1)
+    at_least('crawl.time_budget', crawl.time_budget, 0)
+    at_least('crawl.max_steps', crawl.max_steps, 0)
+    at_least('crawl.step_timeout', crawl.step_timeout, 0)
+    at_least('crawl.idle_steps', crawl.idle_steps, 1)
+
+    enrich = config.enrich
+    at_least('enrich.project_limit', enrich.project_limit, 0)
+    at_least('enrich.concurrency', enrich.concurrency, 1)
+    at_least('enrich.parse_workers', enrich.parse_workers, 0)
+    at_least('enrich.reuse_details_for', enrich.reuse_details_for, 0)
+    at_least('enrich.stale_details_for', enrich.stale_details_for, 0)
+
+    at_least('checkpoint.resume_within', config.checkpoint.resume_within, 0)
+
+    resilience = config.resilience
+    at_least('resilience.max_attempts', resilience.max_attempts, 1)
+    at_least('resilience.base_delay', resilience.base_delay, 0)
+    at_least('resilience.max_delay', resilience.max_delay, resilience.base_delay)
+    at_least('resilience.max_retry_after', resilience.max_retry_after, 0)
+    at_least('resilience.failure_threshold', resilience.failure_threshold, 1)
+    at_least('resilience.reset_timeout', resilience.reset_timeout, 0)
+    at_least('resilience.request_budget', resilience.request_budget, 0)
+
+    distributed = config.distributed
+    one_of('distributed.backend', distributed.backend, QUEUE_BACKENDS)
+    if distributed.enabled and distributed.backend == 'redis':
+        require(bool(distributed.redis_url), "distributed.redis_url: 使用 redis 队列时必须设置")
+    at_least('distributed.lease_timeout', distributed.lease_timeout, 1)
+    at_least('distributed.max_attempts', distributed.max_attempts, 1)
+    at_least('distributed.local_workers', distributed.local_workers, 0)
+    at_least('distributed.worker_concurrency', distributed.worker_concurrency, 1)
+    at_least('distributed.result_timeout', distributed.result_timeout, 1)
+    at_least('distributed.retention_days', distributed.retention_days, 0)
+
+    for encoding in config.archive.precompress:
+        one_of('archive.precompress', encoding, PRECOMPRESS_ENCODINGS)
+
+    at_least('schedule.reload_interval', config.schedule.reload_interval, 0.5)
+
+    service = config.service
+    require(0 < service.port < 65536, f"service.port: 无效的端口 {service.port}")
+    at_least('service.fresh_for', service.fresh_for, 0)
+    at_least('service.max_stale', service.max_stale, 0)
+    at_least('service.wait_timeout', service.wait_timeout, 0)
+
+    memory = config.memory
+    at_least('memory.max_rss_mb', memory.max_rss_mb, 0)
+    at_least('memory.max_page_bytes', memory.max_page_bytes, 0)
+    at_least('memory.sample_interval', memory.sample_interval, 0.05)
+    return errors
+
+
+def config_changes(old, new) -> Dict[str, tuple]:
+    """
+    两份配置之间有变化的配置节
+
+    Returns:
+        Dict[str, tuple]: 配置节 -> (旧值, 新值)（字典形式）
+    """
+    old_dict, new_dict = old.to_dict(), new.to_dict()
+    return {
+        section: (old_dict.get(section), value)
+        for section, value in new_dict.items() if old_dict.get(section) != value
+    }
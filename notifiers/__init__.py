@@ -1,15 +1,42 @@
 """
 通知模块
-支持多种通知方式
+支持多种通知方式，并可通过分发器同时发送到多个渠道
+
+导出的名称按需导入（PEP 562）：首次访问时才加载对应的子模块（及 requests、jinja2 等依赖）
 """
 
-from .wechat import WeChatNotifier, send_notification as send_wechat_notification
-from .email import EmailNotifier, send_notification as send_email_notification
+import importlib
+
+# 导出名称 -> (子模块, 子模块中的名称)
+_EXPORTS = {
+    'WeChatNotifier': ('wechat', 'WeChatNotifier'),
+    'send_wechat_notification': ('wechat', 'send_notification'),
+    'EmailNotifier': ('email', 'EmailNotifier'),
+    'send_email_notification': ('email', 'send_notification'),
+    'Notification': ('dispatcher', 'Notification'),
+    'NotificationDispatcher': ('dispatcher', 'NotificationDispatcher'),
+    'create_dispatcher': ('dispatcher', 'create_dispatcher'),
+    'get_dispatcher': ('dispatcher', 'get_dispatcher'),
+    'close_dispatcher': ('dispatcher', 'close_dispatcher'),
+    'notify_report': ('dispatcher', 'notify_report'),
+    'batch_notifications': ('dispatcher', 'batch_notifications'),
+    'DigestSection': ('digest', 'DigestSection'),
+    'add_digest_section': ('digest', 'add_digest_section'),
+    'send_digest': ('digest', 'send_digest'),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    target = _EXPORTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attr = target
+    value = getattr(importlib.import_module(f'.{module}', __name__), attr)
+    globals()[name] = value  # 缓存，之后的访问不再经过 __getattr__
+    return value
 
-__all__ = [
-    'WeChatNotifier',
-    'EmailNotifier',
-    'send_wechat_notification',
-    'send_email_notification'
-]
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+日报汇总邮件模块
+汇总模式下各数据源生成报告后只登记内存中的数据（项目列表和已渲染的 Markdown），
+全部数据源完成后按订阅者偏好生成汇总邮件，通过 SMTP 连接池一次性发送：
+- 偏好相同的订阅者共用同一封邮件（收件人放在信封中，不会互相看到）
+- 收件人超过 max_recipients_per_message 时拆分为多封
+- 多封邮件在 smtp_connections 个持久连接上并发发送
+"""
+
+import asyncio
+import copy
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader
+
+from config.config import Subscriber
+from pipeline.resilience import RetryPolicy
+from .dispatcher import is_retryable
+from .email import EmailNotifier
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+
+
+@dataclass
+class DigestSection:
+    """汇总邮件中的一个数据源"""
+    source: str  # 数据源名称
+    generate_time: str  # 生成时间
+    projects: List[dict]  # 项目列表（获取详情后）
+    markdown: Optional[str] = None  # 已渲染的 Markdown 报告（作为附件）
+    total_projects: int = 0  # 项目总数
+    on_delivered: Optional[Callable[[], None]] = None  # 汇总邮件全部发送成功（或无需发送）后调用
+
+    def __post_init__(self):
+        if not self.total_projects:
+            self.total_projects = len(self.projects)
+
+
+@dataclass
+class _Delivery:
+    """一封待发送的汇总邮件（每封独立的消息对象，可在不同线程中同时序列化）"""
+    message: MIMEMultipart
+    recipients: List[str] = field(default_factory=list)
+
+
+class DigestCollector:
+    """收集本次运行各数据源的汇总内容"""
+
+    def __init__(self):
+        self._sections: Dict[str, DigestSection] = {}
+        self._lock = threading.Lock()
+
+    def add(self, section: DigestSection) -> None:
+        with self._lock:
+            self._sections[section.source] = section
+
+    def drain(self) -> List[DigestSection]:
+        """取出已收集的内容并清空"""
+        with self._lock:
+            sections, self._sections = list(self._sections.values()), {}
+        return sections
+
+
+_collector = DigestCollector()
+
+
+def add_digest_section(section: DigestSection) -> None:
+    """登记一个数据源的汇总内容"""
+    _collector.add(section)
+    print(f"  ℹ {section.source} 日报已加入汇总邮件，待全部数据源完成后发送")
+
+
+def collect_subscribers(notification_config) -> List[Subscriber]:
+    """汇总订阅者：subscribers 配置加上 email_recipient 中的地址（使用默认偏好），按地址去重"""
+    subscribers = {}
+    for subscriber in notification_config.subscribers:
+        subscribers.setdefault(subscriber.email.strip().lower(), subscriber)
+    for address in (notification_config.email_recipient or '').split(','):
+        address = address.strip()
+        if address:
+            subscribers.setdefault(address.lower(), Subscriber(email=address))
+    return list(subscribers.values())
+
+
+def _preference_key(subscriber: Subscriber, sources: List[str]) -> Tuple:
+    selected = tuple(s for s in sources if subscriber.sources is None or s in subscriber.sources)
+    return selected, subscriber.max_projects, subscriber.format, subscriber.attach_reports
+
+
+def build_digest_message(notifier: EmailNotifier, sections: List[DigestSection],
+                         max_projects: int, body_format: str, attach_reports: bool,
+                         env: Environment) -> MIMEMultipart:
+    """
+    按偏好构建一封汇总邮件（纯文本 + 可选 HTML，均由内存中的数据渲染）
+
+    Args:
+        notifier: 邮件通知器（提供发件人）
+        sections: 订阅的数据源内容
+        max_projects: 每个数据源列出的项目数
+        body_format: html / text
+        attach_reports: 是否附带完整的 Markdown 报告
+        env: Jinja2 环境
+    """
+    view = [
+        {
+            'source': section.source,
+            'generate_time': section.generate_time,
+            'total_projects': section.total_projects,
+            'projects': section.projects[:max_projects],
+        }
+        for section in sections
+    ]
+
+    body = MIMEMultipart('alternative')
+    body.attach(MIMEText(env.get_template('digest.md.j2').render(sections=view), 'plain', 'utf-8'))
+    if body_format == 'html':
+        body.attach(MIMEText(env.get_template('digest.html.j2').render(sections=view), 'html', 'utf-8'))
+
+    msg = MIMEMultipart('mixed')
+    msg['From'] = notifier.smtp_user or 'noreply@github.com'
+    msg['To'] = 'undisclosed-recipients:;'  # 实际收件人只放在信封中
+    msg['Subject'] = (f"📊 Trending 日报汇总（{' / '.join(s.source for s in sections)}）"
+                      f" - {datetime.now().strftime('%Y-%m-%d')}")
+    msg.attach(body)
+
+    if attach_reports:
+        for section in sections:
+            if section.markdown:
+                part = MIMEText(section.markdown, 'markdown', 'utf-8')
+                part.add_header('Content-Disposition', 'attachment',
+                                filename=f"{section.source.lower()}_trending_report.md")
+                msg.attach(part)
+    return msg
+
+
+def plan_digest(notification_config, sections: List[DigestSection], subscribers: List[Subscriber],
+                notifier: EmailNotifier) -> List[_Delivery]:
+    """按订阅者偏好分组，每组构建一封邮件，收件人过多时拆分"""
+    env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), trim_blocks=True, lstrip_blocks=True)
+    by_source = {section.source: section for section in sections}
+    groups: Dict[Tuple, List[str]] = {}
+    for subscriber in subscribers:
+        key = _preference_key(subscriber, list(by_source))
+        if key[0]:
+            groups.setdefault(key, []).append(subscriber.email)
+
+    chunk = max(1, notification_config.max_recipients_per_message)
+    deliveries = []
+    for (selected, max_projects, body_format, attach_reports), recipients in groups.items():
+        message = build_digest_message(notifier, [by_source[s] for s in selected],
+                                       max_projects, body_format, attach_reports, env)
+        for start in range(0, len(recipients), chunk):
+            # 发送时序列化会给 multipart 设置分隔符，拆分的各封邮件不能共用同一个消息对象
+            deliveries.append(_Delivery(copy.deepcopy(message), recipients[start:start + chunk]))
+    return deliveries
+
+
+class SMTPPool:
+    """固定数量的持久 SMTP 会话，每个会话同一时间只发送一封邮件"""
+
+    def __init__(self, size: int, recipient: str):
+        self.size = max(1, size)
+        self.recipient = recipient
+        self._idle: 'asyncio.Queue[EmailNotifier]' = asyncio.Queue()
+        self._all: List[EmailNotifier] = []
+
+    async def __aenter__(self) -> 'SMTPPool':
+        for _ in range(self.size):
+            notifier = EmailNotifier(recipient=self.recipient)
+            self._all.append(notifier)
+            self._idle.put_nowait(notifier)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await asyncio.gather(*(asyncio.to_thread(n.close) for n in self._all))
+
+    async def send(self, message: MIMEMultipart, recipients: List[str]) -> None:
+        notifier = await self._idle.get()
+        try:
+            # 会话在首次使用时打开
+            await asyncio.to_thread(notifier.open_session)
+            await asyncio.to_thread(notifier.deliver, message, recipients)
+        finally:
+            self._idle.put_nowait(notifier)
+
+
+def _acknowledge(sections: List[DigestSection]) -> None:
+    """汇总邮件已送达（或无需发送）：通知各数据源"""
+    for section in sections:
+        if section.on_delivered is not None:
+            section.on_delivered()
+
+
+async def send_digest(notification_config, sections: Optional[List[DigestSection]] = None,
+                      retry_policy: Optional[RetryPolicy] = None) -> Dict[str, bool]:
+    """
+    发送汇总邮件
+
+    Args:
+        notification_config: NotificationConfig 配置对象
+        sections: 汇总内容（默认取出本次运行已登记的内容）
+        retry_policy: 重试策略（可选）
+
+    Returns:
+        Dict[str, bool]: 各收件人是否发送成功
+    """
+    sections = sections if sections is not None else _collector.drain()
+    if not sections:
+        return {}
+
+    subscribers = collect_subscribers(notification_config)
+    if not subscribers:
+        print("  ℹ 没有订阅者，跳过汇总邮件")
+        _acknowledge(sections)
+        return {}
+    notifier = EmailNotifier(recipient=subscribers[0].email)
+    if not notifier.smtp_server:
+        _acknowledge(sections)
+        return {}
+    deliveries = plan_digest(notification_config, sections, subscribers, notifier)
+    if not deliveries:
+        print("  ℹ 没有订阅者订阅本次生成的数据源，跳过汇总邮件")
+        _acknowledge(sections)
+        return {}
+
+    policy = retry_policy or RetryPolicy(
+        max_attempts=notification_config.max_attempts,
+        base_delay=notification_config.retry_base_delay
+    )
+
+    async def deliver(pool: SMTPPool, delivery: _Delivery) -> bool:
+        for attempt in range(1, policy.max_attempts + 1):
+            try:
+                await pool.send(delivery.message, delivery.recipients)
+                return True
+            except Exception as e:
+                if not is_retryable(e) or attempt >= policy.max_attempts:
+                    print(f"  ⚠ 汇总邮件发送失败（{len(delivery.recipients)} 个收件人）: {e}")
+                    return False
+                await asyncio.sleep(policy.backoff(attempt))
+        return False
+
+    async with SMTPPool(notification_config.smtp_connections, notifier.recipient) as pool:
+        results = await asyncio.gather(*(deliver(pool, d) for d in deliveries))
+
+    status = {}
+    for delivery, success in zip(deliveries, results):
+        for recipient in delivery.recipients:
+            status[recipient] = success
+    sent = sum(1 for success in status.values() if success)
+    if all(results):
+        _acknowledge(sections)
+    print(f"  ✓ 汇总邮件已发送: {sent}/{len(status)} 个收件人，{len(deliveries)} 封邮件"
+          f"（{' / '.join(s.source for s in sections)}）")
+    return status
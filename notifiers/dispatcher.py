@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+通知分发模块
+把一条日报通知同时分发到邮件、企业微信等多个渠道：
+- 各渠道在线程中并发发送，不阻塞事件循环
+- 邮件复用同一个 SMTP 会话，企业微信复用同一个 HTTP 会话
+- 可重试的失败（网络错误、4xx SMTP 响应、429/5xx、频率超限）按指数退避重试
+
+渠道只需实现 name、send(notification)（失败时抛出异常）和 close()，新增渠道通过 add_channel() 注册；
+支持合并发送的渠道另外实现 queue(notification)、pending 和 flush()，在 batch_notifications() 中先排队、结束时合并发送；
+有待发送队列的渠道实现 discard()，重试用尽后丢弃未发送的内容，不会混入下一次通知
+"""
+
+import asyncio
+import smtplib
+import socket
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from pipeline.resilience import RetryPolicy, RetryableError
+from .email import EmailNotifier
+from .wechat import WeChatNotifier, pack_blocks
+
+
+@dataclass
+class Notification:
+    """一条日报通知"""
+    report_type: str  # 报告类型（如 "Zread" 或 "GitHub"）
+    report_path: Path  # Markdown 报告文件路径
+    total_projects: int  # 项目总数
+    generate_time: str  # 生成时间
+    markdown: Optional[str] = None  # 已渲染的完整 Markdown 报告（不提供时从 report_path 读取）
+    on_delivered: Optional[Callable[[], None]] = None  # 所有渠道都发送成功后调用（合并模式下在合并发送成功后）
+
+
+def is_retryable(error: Exception) -> bool:
+    """通知发送失败是否值得重试"""
+    if isinstance(error, RetryableError):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 4xx 为临时错误；认证失败等 5xx 错误重试也无济于事
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    # 套接字层面的错误（连接被拒绝或重置、超时、DNS 解析失败）；
+    # 不能笼统匹配 OSError：requests 和 smtplib 的所有异常都是它的子类，其中多数重试无济于事
+    return isinstance(error, (ConnectionError, TimeoutError, socket.gaierror))
+
+
+class EmailChannel:
+    """邮件渠道：发送日报摘要邮件，多次发送复用同一个 SMTP 会话"""
+    name = '邮件'
+
+    def __init__(self, notifier: EmailNotifier):
+        self.notifier = notifier
+
+    def send(self, notification: Notification) -> None:
+        # 首次发送时打开会话，之后的通知（另一个数据源、定时任务的下一次运行）复用
+        self.notifier.open_session()
+        self.notifier.deliver(self.notifier.build_report_summary(
+            notification.report_type,
+            notification.report_path,
+            notification.total_projects,
+            notification.generate_time
+        ))
+
+    def describe(self) -> str:
+        return self.notifier.recipient
+
+    def close(self) -> None:
+        self.notifier.close()
+
+
+class WeChatChannel:
+    """
+    企业微信渠道：发送摘要和按长度上限拆分的完整报告，复用同一个 HTTP 会话
+
+    排队的多个数据源合并为尽量少的消息按顺序发送；发送失败重试时从未发送的消息继续
+    """
+    name = '企业微信'
+
+    def __init__(self, notifier: WeChatNotifier, full_report: bool = True):
+        self.notifier = notifier
+        self.full_report = full_report
+        self._pending: List[Notification] = []
+        self._outbox: List[str] = []
+        self._lock = threading.Lock()
+
+    def _blocks(self, notification: Notification) -> List[str]:
+        content = None
+        if self.full_report:
+            content = notification.markdown
+            if content is None:
+                try:
+                    content = Path(notification.report_path).read_text(encoding='utf-8')
+                except OSError:
+                    content = None
+        return self.notifier.build_report_blocks(
+            notification.report_type,
+            notification.report_path,
+            notification.total_projects,
+            notification.generate_time,
+            content
+        )
+
+    @property
+    def pending(self) -> bool:
+        """是否有待发送的通知"""
+        return bool(self._pending or self._outbox)
+
+    def queue(self, notification: Notification) -> None:
+        """排队，等 flush() 时与其他数据源合并发送"""
+        with self._lock:
+            self._pending.append(notification)
+
+    def send(self, notification: Notification) -> None:
+        self.queue(notification)
+        self.flush()
+
+    def flush(self) -> None:
+        """把排队的通知合并为尽量少的消息并按顺序发送"""
+        with self._lock:
+            if self._pending:
+                # 各数据源的摘要放在最前面，之后是各自的完整报告
+                blocks = [self._blocks(n) for n in self._pending]
+                self._outbox.extend(pack_blocks(
+                    [b[0] for b in blocks] + [block for b in blocks for block in b[1:]]
+                ))
+                self._pending = []
+            while self._outbox:
+                self.notifier.post({"msgtype": "markdown", "markdown": {"content": self._outbox[0]}})
+                self._outbox.pop(0)
+
+    def discard(self) -> int:
+        """
+        丢弃未发送的消息（重试用尽后调用，避免在下一次通知之前补发过时的内容）
+
+        Returns:
+            int: 丢弃的消息数
+        """
+        with self._lock:
+            dropped = len(self._outbox) + len(self._pending)
+            self._outbox = []
+            self._pending = []
+            return dropped
+
+    def describe(self) -> str:
+        return '群机器人'
+
+    def close(self) -> None:
+        self.notifier.close()
+
+
+class NotificationDispatcher:
+    """多渠道通知分发器"""
+
+    def __init__(self, retry_policy: Optional[RetryPolicy] = None):
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.channels: List = []
+        self.batching = False  # 合并模式：支持合并的渠道先排队，flush() 时统一发送
+        self._awaiting: List[Notification] = []  # 已排队、等合并发送成功后确认送达的通知
+
+    def add_channel(self, channel) -> None:
+        """注册一个通知渠道"""
+        self.channels.append(channel)
+
+    async def _send_with_retry(self, channel, send, *args) -> bool:
+        """在线程中发送，可重试的失败按指数退避重试"""
+        policy = self.retry_policy
+        for attempt in range(1, policy.max_attempts + 1):
+            try:
+                await asyncio.to_thread(send, *args)
+                return True
+            except Exception as e:
+                if not is_retryable(e) or attempt >= policy.max_attempts:
+                    print(f"  ⚠ {channel.name}通知发送失败: {e}")
+                    discard = getattr(channel, 'discard', None)
+                    dropped = discard() if discard is not None else 0
+                    if dropped:
+                        print(f"  ⚠ 已丢弃 {dropped} 条未发送的{channel.name}消息")
+                    return False
+                delay = policy.backoff(attempt)
+                retry_after = getattr(e, 'retry_after', None)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                print(f"  ↻ {channel.name}通知发送失败（{e}），{delay:.1f} 秒后重试（第 {attempt} 次）")
+                await asyncio.sleep(delay)
+        return False
+
+    async def dispatch(self, notification: Notification) -> Dict[str, bool]:
+        """
+        并发发送到所有渠道
+
+        Returns:
+            Dict[str, bool]: 各渠道是否发送成功
+        """
+        channels = self.channels
+        queued = False
+        if self.batching:
+            for channel in channels:
+                if hasattr(channel, 'queue'):
+                    channel.queue(notification)
+                    queued = True
+            channels = [channel for channel in channels if not hasattr(channel, 'queue')]
+        
+        results = await asyncio.gather(
+            *(self._send_with_retry(channel, channel.send, notification) for channel in channels)
+        )
+        for channel, success in zip(channels, results):
+            if success:
+                print(f"  ✓ {notification.report_type} 日报{channel.name}通知已发送到 {channel.describe()}")
+        if notification.on_delivered is not None and all(results):
+            if queued:
+                self._awaiting.append(notification)
+            else:
+                notification.on_delivered()
+        return {channel.name: success for channel, success in zip(channels, results)}
+
+    async def flush(self) -> Dict[str, bool]:
+        """发送各渠道排队的通知"""
+        channels = [channel for channel in self.channels if getattr(channel, 'pending', False)]
+        results = await asyncio.gather(
+            *(self._send_with_retry(channel, channel.flush) for channel in channels)
+        )
+        for channel, success in zip(channels, results):
+            if success:
+                print(f"  ✓ {channel.name}通知已合并发送到 {channel.describe()}")
+        awaiting, self._awaiting = self._awaiting, []
+        if all(results):
+            for notification in awaiting:
+                notification.on_delivered()
+        return {channel.name: success for channel, success in zip(channels, results)}
+
+    def close(self) -> None:
+        """关闭各渠道的连接"""
+        for channel in self.channels:
+            try:
+                channel.close()
+            except Exception:
+                pass
+
+
+def create_dispatcher(notification_config, retry_policy: Optional[RetryPolicy] = None) -> Optional[NotificationDispatcher]:
+    """
+    按通知配置创建分发器（没有可用渠道时返回 None）
+
+    Args:
+        notification_config: NotificationConfig 配置对象
+        retry_policy: 重试策略（可选）
+    """
+    dispatcher = NotificationDispatcher(retry_policy or RetryPolicy(
+        max_attempts=notification_config.max_attempts,
+        base_delay=notification_config.retry_base_delay
+    ))
+    # 汇总模式下邮件改为在全部数据源完成后统一发送（见 digest.py）
+    if notification_config.email_recipient and not notification_config.digest:
+        notifier = EmailNotifier(recipient=notification_config.email_recipient)
+        if notifier.smtp_server:
+            dispatcher.add_channel(EmailChannel(notifier))
+    if notification_config.wechat_webhook_url:
+        notifier = WeChatNotifier(notification_config.wechat_webhook_url,
+                                  rate_limit=notification_config.wechat_rate_limit)
+        dispatcher.add_channel(WeChatChannel(notifier, full_report=notification_config.wechat_full_report))
+    return dispatcher if dispatcher.channels else None
+
+
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher(notification_config) -> Optional[NotificationDispatcher]:
+    """获取本次运行共享的分发器（两个数据源复用同一个 SMTP / HTTP 会话）"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = create_dispatcher(notification_config)
+        return _dispatcher
+
+
+def close_dispatcher() -> None:
+    """关闭共享的分发器（运行结束时调用）"""
+    global _dispatcher
+    with _dispatcher_lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.close()
+
+
+async def notify_report(notification_config, notification: Notification) -> Dict[str, bool]:
+    """
+    发送日报通知到所有已配置的渠道
+
+    Args:
+        notification_config: NotificationConfig 配置对象
+        notification: 日报通知
+
+    Returns:
+        Dict[str, bool]: 各渠道是否发送成功（没有可用渠道时为空）
+    """
+    dispatcher = get_dispatcher(notification_config)
+    if dispatcher is None:
+        if not notification_config.digest:
+            print("  ℹ 未配置可用的通知渠道（邮件需要 SMTP_SERVER，企业微信需要 Webhook URL）")
+        if notification.on_delivered is not None:
+            # 没有需要发送的渠道，不再等待送达
+            notification.on_delivered()
+        return {}
+    return await dispatcher.dispatch(notification)
+
+
+@asynccontextmanager
+async def batch_notifications(notification_config):
+    """
+    合并通知：范围内各数据源的企业微信消息先排队，退出时合并为尽量少的消息发送
+
+    用法:
+        async with batch_notifications(config.notification):
+            await asyncio.gather(generate_zread_report(config), generate_github_report(config))
+    """
+    dispatcher = get_dispatcher(notification_config) if notification_config.enabled else None
+    if dispatcher is None:
+        yield
+        return
+    dispatcher.batching = True
+    try:
+        yield
+    finally:
+        dispatcher.batching = False
+        await dispatcher.flush()
@@ -6,6 +6,7 @@
 
 import os
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -24,7 +25,8 @@ class EmailNotifier:
         smtp_port: Optional[int] = None,
         smtp_user: Optional[str] = None,
         smtp_password: Optional[str] = None,
-        use_tls: bool = True
+        use_tls: Optional[bool] = None,
+        timeout: float = 30
     ):
         """
         初始化邮件通知器
@@ -35,14 +37,22 @@ class EmailNotifier:
             smtp_port: SMTP 端口，如果不提供则从环境变量 SMTP_PORT 读取（默认 587）
             smtp_user: SMTP 用户名，如果不提供则从环境变量 SMTP_USER 读取
             smtp_password: SMTP 密码，如果不提供则从环境变量 SMTP_PASSWORD 读取
-            use_tls: 是否使用 TLS（默认 True）
+            use_tls: 是否使用 TLS，如果不提供则从环境变量 SMTP_USE_TLS 读取（默认 True）
+            timeout: 连接和读写超时（秒）
         """
         self.recipient = recipient or os.getenv('EMAIL_RECIPIENT')
         self.smtp_server = smtp_server or os.getenv('SMTP_SERVER')
         self.smtp_port = smtp_port or int(os.getenv('SMTP_PORT', '587'))
         self.smtp_user = smtp_user or os.getenv('SMTP_USER')
         self.smtp_password = smtp_password or os.getenv('SMTP_PASSWORD')
+        if use_tls is None:
+            use_tls = os.getenv('SMTP_USE_TLS', 'true').lower() in ('true', '1', 'yes')
         self.use_tls = use_tls
+        self.timeout = timeout
+        
+        # 持久 SMTP 会话（open_session() 打开后多封邮件复用同一连接）
+        self._server: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
         
         if not self.recipient:
             raise ValueError("未提供收件人邮箱，请通过参数或环境变量 EMAIL_RECIPIENT 设置")
@@ -51,6 +61,113 @@ class EmailNotifier:
         if not self.smtp_server:
             print("警告: 未配置 SMTP 服务器，邮件通知功能将被禁用")
     
+    def _connect(self) -> smtplib.SMTP:
+        """建立 SMTP 连接（STARTTLS 并登录）"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            
+            if self.smtp_user and self.smtp_password:
+                server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def open_session(self) -> 'EmailNotifier':
+        """打开持久 SMTP 会话，之后发送的邮件复用同一连接，直到 close() """
+        with self._lock:
+            if self._server is None:
+                self._server = self._connect()
+        return self
+    
+    def close(self) -> None:
+        """关闭持久 SMTP 会话"""
+        with self._lock:
+            server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except smtplib.SMTPException:
+                server.close()
+            except OSError:
+                pass
+    
+    def __enter__(self) -> 'EmailNotifier':
+        return self.open_session()
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def build_message(
+        self,
+        subject: str,
+        body: str,
+        body_type: str = 'plain',
+        attachments: Optional[List[Path]] = None,
+        recipient: Optional[str] = None
+    ) -> MIMEMultipart:
+        """
+        构建邮件消息
+        
+        Args:
+            subject: 邮件主题
+            body: 邮件正文
+            body_type: 正文类型，'plain' 或 'html'
+            attachments: 附件列表（可选）
+            recipient: 收件人（默认为初始化时的收件人）
+        """
+        msg = MIMEMultipart()
+        msg['From'] = self.smtp_user or 'noreply@github.com'
+        msg['To'] = recipient or self.recipient
+        msg['Subject'] = subject
+        
+        # 添加正文
+        msg.attach(MIMEText(body, body_type, 'utf-8'))
+        
+        # 添加附件
+        if attachments:
+            for attachment_path in attachments:
+                if attachment_path.exists():
+                    with open(attachment_path, 'rb') as f:
+                        part = MIMEBase('application', 'octet-stream')
+                        part.set_payload(f.read())
+                        encoders.encode_base64(part)
+                        part.add_header(
+                            'Content-Disposition',
+                            f'attachment; filename= {attachment_path.name}'
+                        )
+                        msg.attach(part)
+        
+        return msg
+    
+    def deliver(self, msg: MIMEMultipart, to_addrs: Optional[List[str]] = None) -> None:
+        """
+        发送已构建的邮件（失败时抛出异常，由调用方决定是否重试）
+        
+        已打开持久会话时复用该连接，连接被服务器断开时重连一次；否则为本封邮件单独建立连接
+        
+        Args:
+            msg: 邮件消息
+            to_addrs: 信封收件人（默认取邮件头中的收件人）
+        """
+        if not self.smtp_server:
+            raise smtplib.SMTPException("未配置 SMTP 服务器")
+        
+        with self._lock:
+            if self._server is None:
+                with self._connect() as server:
+                    server.send_message(msg, to_addrs=to_addrs)
+                return
+            
+            try:
+                self._server.send_message(msg, to_addrs=to_addrs)
+            except smtplib.SMTPServerDisconnected:
+                # 空闲会话被服务器关闭，重连后重发
+                self._server = self._connect()
+                self._server.send_message(msg, to_addrs=to_addrs)
+    
     def send_email(
         self,
         subject: str,
@@ -75,39 +192,7 @@ class EmailNotifier:
             return False
         
         try:
-            # 创建邮件消息
-            msg = MIMEMultipart()
-            msg['From'] = self.smtp_user or 'noreply@github.com'
-            msg['To'] = self.recipient
-            msg['Subject'] = subject
-            
-            # 添加正文
-            msg.attach(MIMEText(body, body_type, 'utf-8'))
-            
-            # 添加附件
-            if attachments:
-                for attachment_path in attachments:
-                    if attachment_path.exists():
-                        with open(attachment_path, 'rb') as f:
-                            part = MIMEBase('application', 'octet-stream')
-                            part.set_payload(f.read())
-                            encoders.encode_base64(part)
-                            part.add_header(
-                                'Content-Disposition',
-                                f'attachment; filename= {attachment_path.name}'
-                            )
-                            msg.attach(part)
-            
-            # 连接 SMTP 服务器并发送
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                
-                if self.smtp_user and self.smtp_password:
-                    server.login(self.smtp_user, self.smtp_password)
-                
-                server.send_message(msg)
-            
+            self.deliver(self.build_message(subject, body, body_type, attachments))
             return True
             
         except smtplib.SMTPException as e:
@@ -143,16 +228,16 @@ class EmailNotifier:
         """
         return self.send_email(subject, html_content, 'html')
     
-    def send_report_summary(
+    def build_report_summary(
         self,
         report_type: str,
         report_path: Path,
         total_projects: int,
         generate_time: str,
         send_attachment: bool = True
-    ) -> bool:
+    ) -> MIMEMultipart:
         """
-        发送日报摘要邮件
+        构建日报摘要邮件
         
         Args:
             report_type: 报告类型（如 "Zread" 或 "GitHub"）
@@ -160,9 +245,6 @@ class EmailNotifier:
             total_projects: 项目总数
             generate_time: 生成时间
             send_attachment: 是否发送报告文件作为附件（默认 True）
-        
-        Returns:
-            bool: 发送是否成功
         """
         # 读取报告文件的前几行作为摘要
         try:
@@ -212,7 +294,44 @@ class EmailNotifier:
         subject = f"📊 {report_type} Trending 日报 - {generate_time}"
         attachments = [report_path] if send_attachment and report_path.exists() else None
         
-        return self.send_email(subject, html_content, 'html', attachments)
+        return self.build_message(subject, html_content, 'html', attachments)
+    
+    def send_report_summary(
+        self,
+        report_type: str,
+        report_path: Path,
+        total_projects: int,
+        generate_time: str,
+        send_attachment: bool = True
+    ) -> bool:
+        """
+        发送日报摘要邮件
+        
+        Args:
+            report_type: 报告类型（如 "Zread" 或 "GitHub"）
+            report_path: 报告文件路径
+            total_projects: 项目总数
+            generate_time: 生成时间
+            send_attachment: 是否发送报告文件作为附件（默认 True）
+        
+        Returns:
+            bool: 发送是否成功
+        """
+        if not self.smtp_server:
+            print("无法发送邮件: 未配置 SMTP 服务器")
+            return False
+        
+        try:
+            self.deliver(self.build_report_summary(
+                report_type, report_path, total_projects, generate_time, send_attachment
+            ))
+            return True
+        except smtplib.SMTPException as e:
+            print(f"发送邮件时 SMTP 错误: {e}")
+            return False
+        except Exception as e:
+            print(f"发送邮件时出错: {e}")
+            return False
     
     def send_simple_notification(
         self,
@@ -5,24 +5,156 @@
 """
 
 import os
+import re
+import threading
+import time
+from collections import deque
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pathlib import Path
 
+from pipeline.resilience import RetryableError, RETRYABLE_STATUSES, retry_after_seconds
+
+# 企业微信接口调用频率超限的错误码
+RATE_LIMIT_ERRCODE = 45009
+
+# Markdown 消息内容上限（UTF-8 字节）
+MARKDOWN_MAX_BYTES = 4096
+
+# 每个机器人每分钟最多发送的消息数
+RATE_LIMIT_PER_MINUTE = 20
+
+# 在标题前断开
+_HEADING_SPLIT = re.compile(r'\n(?=#{1,6} )')
+
+
+def _byte_len(text: str) -> int:
+    return len(text.encode('utf-8'))
+
+
+def _cut_bytes(text: str, max_bytes: int) -> List[str]:
+    """按字节数硬切分（不会切断多字节字符）"""
+    pieces = []
+    encoded = text.encode('utf-8')
+    while encoded:
+        piece = encoded[:max_bytes].decode('utf-8', errors='ignore')
+        pieces.append(piece)
+        encoded = encoded[len(piece.encode('utf-8')):]
+    return pieces
+
+
+def pack_blocks(blocks: List[str], max_bytes: int = MARKDOWN_MAX_BYTES, separator: str = '\n\n') -> List[str]:
+    """
+    按顺序把内容块合并为尽量少的消息，每条消息不超过 max_bytes
+
+    单个内容块超长时先按行拆分，单行仍超长时按字节切分
+    """
+    sep_bytes = _byte_len(separator)
+    pieces = []
+    for block in blocks:
+        block = block.strip('\n')
+        if not block:
+            continue
+        if _byte_len(block) <= max_bytes:
+            pieces.append(block)
+            continue
+        for line in block.split('\n'):
+            if _byte_len(line) <= max_bytes:
+                pieces.append(line)
+            else:
+                pieces.extend(_cut_bytes(line, max_bytes))
+
+    messages = []
+    current, current_bytes = [], 0
+    for piece in pieces:
+        size = _byte_len(piece)
+        if current and current_bytes + sep_bytes + size > max_bytes:
+            messages.append(separator.join(current))
+            current, current_bytes = [], 0
+        current_bytes += size + (sep_bytes if current else 0)
+        current.append(piece)
+    if current:
+        messages.append(separator.join(current))
+    return messages
+
+
+def split_markdown(content: str) -> List[str]:
+    """把 Markdown 报告拆分为内容块（在标题处断开，一个项目为一块）"""
+    return [block for block in _HEADING_SPLIT.split(content) if block.strip()]
+
+
+class RateLimiter:
+    """滑动窗口限流：period 秒内最多 max_calls 次"""
+
+    def __init__(self, max_calls: int, period: float = 60.0):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """等待直到可以发送下一条消息"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            print(f"  ℹ 企业微信消息达到每分钟 {self.max_calls} 条的上限，等待 {wait:.0f} 秒")
+            time.sleep(wait)
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(webhook_url: str, max_calls: int = RATE_LIMIT_PER_MINUTE) -> RateLimiter:
+    """同一个 Webhook 共用一个限流器（限额按机器人计算）"""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(webhook_url)
+        if limiter is None or limiter.max_calls != max_calls:
+            limiter = RateLimiter(max_calls)
+            _rate_limiters[webhook_url] = limiter
+        return limiter
+
+
+class WeChatError(Exception):
+    """企业微信返回的业务错误（不可重试）"""
+    
+    def __init__(self, errcode: int, errmsg: str):
+        super().__init__(f"errcode={errcode}: {errmsg}")
+        self.errcode = errcode
+        self.errmsg = errmsg
+
 
 class WeChatNotifier:
     """企业微信消息推送类"""
     
-    def __init__(self, webhook_url: Optional[str] = None):
+    def __init__(self, webhook_url: Optional[str] = None,
+                 session: Optional[requests.Session] = None, timeout: float = 10,
+                 rate_limit: int = RATE_LIMIT_PER_MINUTE):
         """
         初始化企业微信通知器
         
         Args:
             webhook_url: 企业微信 Webhook URL，如果不提供则从环境变量 WECHAT_WEBHOOK_URL 读取
+            session: 复用的 HTTP 会话（可选，默认为本通知器创建一个）
+            timeout: 请求超时（秒）
+            rate_limit: 每分钟最多发送的消息数（0 表示不限流）
         """
         self.webhook_url = webhook_url or os.getenv('WECHAT_WEBHOOK_URL')
         if not self.webhook_url:
             raise ValueError("未提供 Webhook URL，请通过参数或环境变量 WECHAT_WEBHOOK_URL 设置")
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.rate_limiter = get_rate_limiter(self.webhook_url, rate_limit) if rate_limit > 0 else None
+    
+    def close(self) -> None:
+        """关闭 HTTP 会话"""
+        self.session.close()
     
     def send_text(self, content: str, mentioned_list: Optional[list] = None) -> bool:
         """
@@ -69,7 +201,7 @@ class WeChatNotifier:
     def send_report_summary(self, report_type: str, report_path: Path, 
                            total_projects: int, generate_time: str) -> bool:
         """
-        发送日报摘要消息
+        发送日报消息：摘要加完整报告，按消息长度上限拆分后依次发送
         
         Args:
             report_type: 报告类型（如 "Zread" 或 "GitHub"）
@@ -80,34 +212,34 @@ class WeChatNotifier:
         Returns:
             bool: 发送是否成功
         """
-        # 读取报告文件的前几行作为摘要
         try:
-            with open(report_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()[:15]  # 读取前15行
-                preview = ''.join(lines)
-                if len(preview) > 1000:
-                    preview = preview[:1000] + "\n\n...（内容过长，已截断）"
+            content = Path(report_path).read_text(encoding='utf-8')
         except Exception as e:
-            preview = f"无法读取报告内容: {e}"
+            content = f"无法读取报告内容: {e}"
         
-        # 构建 Markdown 消息
-        markdown_content = f"""# 📊 {report_type} Trending 日报已生成
-
+        blocks = self.build_report_blocks(report_type, report_path, total_projects, generate_time, content)
+        for message in pack_blocks(blocks):
+            if not self.send_markdown(message):
+                return False
+        return True
+    
+    def build_report_blocks(self, report_type: str, report_path: Path, total_projects: int,
+                            generate_time: str, content: Optional[str] = None) -> List[str]:
+        """
+        构建日报消息的内容块：摘要块，以及完整报告按项目拆分的内容块
+        
+        Args:
+            report_type: 报告类型
+            report_path: 报告文件路径
+            total_projects: 项目总数
+            generate_time: 生成时间
+            content: 完整的 Markdown 报告（None 表示只发送摘要）
+        """
+        summary = f"""# 📊 {report_type} Trending 日报已生成
 **生成时间**: {generate_time}
 **项目总数**: {total_projects} 个
-**报告文件**: `{report_path.name}`
-
-## 📄 报告预览
-
-```
-{preview}
-```
-
----
-*报告文件已保存到: {report_path}*
-"""
-        
-        return self.send_markdown(markdown_content)
+**报告文件**: `{Path(report_path).name}`"""
+        return [summary] + (split_markdown(content) if content else [])
     
     def send_simple_notification(self, title: str, content: str, 
                                  report_type: Optional[str] = None) -> bool:
@@ -129,6 +261,35 @@ class WeChatNotifier:
         
         return self.send_text(text)
     
+    def post(self, data: Dict[str, Any]) -> None:
+        """
+        发送消息到企业微信（失败时抛出异常，由调用方决定是否重试）
+        
+        429、5xx 响应和频率超限（errcode 45009）抛出 RetryableError，其他错误码抛出 WeChatError
+        
+        Args:
+            data: 消息数据（JSON 格式）
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        response = self.session.post(self.webhook_url, json=data, timeout=self.timeout)
+        if response.status_code in RETRYABLE_STATUSES:
+            raise RetryableError(
+                f"HTTP {response.status_code}",
+                retry_after=retry_after_seconds(response.headers),
+                status=response.status_code
+            )
+        response.raise_for_status()
+        
+        result = response.json()
+        errcode = result.get('errcode')
+        if errcode == 0:
+            return
+        if errcode == RATE_LIMIT_ERRCODE:
+            # 机器人每分钟最多发送 20 条消息，超限后等待下一分钟
+            raise RetryableError(f"企业微信频率超限: {result.get('errmsg')}", retry_after=60)
+        raise WeChatError(errcode, result.get('errmsg', '未知错误'))
+    
     def _send(self, data: Dict[str, Any]) -> bool:
         """
         发送消息到企业微信
@@ -140,21 +301,12 @@ class WeChatNotifier:
             bool: 发送是否成功
         """
         try:
-            response = requests.post(
-                self.webhook_url,
-                json=data,
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            if result.get('errcode') == 0:
-                return True
-            else:
-                print(f"企业微信推送失败: {result.get('errmsg', '未知错误')}")
-                return False
-                
-        except requests.exceptions.RequestException as e:
+            self.post(data)
+            return True
+        except WeChatError as e:
+            print(f"企业微信推送失败: {e.errmsg}")
+            return False
+        except (requests.exceptions.RequestException, RetryableError) as e:
             print(f"发送企业微信消息时出错: {e}")
             return False
         except Exception as e:
@@ -0,0 +1,64 @@
+"""
+数据处理流水线模块
+包含项目详情获取、页面解析进程池、README 亮点缓存、跨数据源详情共享、出站请求弹性层、运行检查点、数据集指纹、HTML 报告输出、运行数据、分布式任务队列和内存限制
+
+导出的名称按需导入（PEP 562）：首次访问时才加载对应的子模块，
+只用到指纹或检查点的命令不会因此加载 BeautifulSoup、lxml 等重量级依赖
+"""
+
+import importlib
+
+# 子模块 -> 导出的名称
+_SUBMODULE_EXPORTS = {
+    'enrich': ['enrich_projects', 'apply_details', 'empty_details'],
+    'extract': [
+        'extract_project_details',
+        'parse_project_page',
+        'configure_parse_pool',
+        'shutdown_parse_pool',
+    ],
+    'highlight_cache': ['HighlightCache', 'configure_highlight_cache', 'get_highlight_cache'],
+    'registry': ['EnrichmentRegistry', 'get_enrichment_registry'],
+    'resilience': [
+        'Resilience',
+        'RetryPolicy',
+        'CircuitBreaker',
+        'RequestBudget',
+        'ResilienceError',
+        'CircuitOpenError',
+        'BudgetExhaustedError',
+        'RetryableError',
+        'configure_resilience',
+        'get_resilience',
+    ],
+    'checkpoint': ['RunJournal', 'open_run_journal'],
+    'fingerprint': ['dataset_fingerprint', 'FingerprintStore', 'open_fingerprint_store'],
+    'html_output': ['HtmlOutput', 'minify_html', 'publish_stylesheet', 'write_html_report'],
+    'history': ['RunRecord', 'RunStore', 'open_run_store', 'save_run'],
+    'queue': [
+        'WorkQueue',
+        'MemoryWorkQueue',
+        'SQLiteWorkQueue',
+        'RedisWorkQueue',
+        'create_work_queue',
+    ],
+    'worker': ['run_worker', 'worker_loop', 'enrich_projects_distributed'],
+    'memory': ['MemoryGovernor', 'RunMemory', 'configure_memory_governor', 'get_memory_governor', 'read_limited'],
+}
+
+_EXPORTS = {name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value  # 缓存，之后的访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Playwright 页面加载模块
+两个数据源都只需要页面 DOM，不需要图片、字体、样式表和统计脚本。
+本模块按数据源的 BrowserConfig 创建精简的浏览器上下文并拦截不需要的请求，
+同时统计请求数、拦截数、传输字节数和加载耗时，便于对比开启前后的效果
+
+服务模式下可通过 warm_browser() 在事件循环中常驻一个浏览器进程，每次抓取只新建上下文
+"""
+
+import asyncio
+import json
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+# 常见统计/追踪服务域名
+TRACKER_DOMAINS = frozenset({
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'segment.io',
+    'segment.com',
+    'hotjar.com',
+    'clarity.ms',
+    'mixpanel.com',
+    'amplitude.com',
+    'posthog.com',
+    'plausible.io',
+    'sentry.io',
+    'intercom.io',
+    'hm.baidu.com',
+    'cnzz.com',
+})
+
+# 精简浏览器的启动参数
+LIGHTWEIGHT_LAUNCH_ARGS = [
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-dev-shm-usage',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--no-first-run',
+    '--mute-audio',
+]
+
+# 页面加载统计日志（追加写入，便于对比拦截策略开启前后的效果）
+METRICS_LOG = Path('.cache/browser_metrics.jsonl')
+
+
+@dataclass
+class PageLoadMetrics:
+    """单次页面加载统计"""
+    source: str
+    requests: int = 0  # 放行的请求数
+    blocked: int = 0  # 拦截的请求数
+    bytes: int = 0  # 传输字节数（响应头 + 响应体）
+    load_seconds: float = 0.0  # 从开始导航到页面 load 事件的耗时（不含之后的等待和滚动；未触发 load 时为 0）
+    policy: str = 'default'  # 使用的拦截策略
+
+    def summary(self) -> str:
+        loaded = f"{self.load_seconds:.1f} 秒" if self.load_seconds else "未完成加载"
+        return (f"{self.source} 页面加载: {loaded}，"
+                f"{self.requests} 个请求（拦截 {self.blocked} 个），"
+                f"传输 {self.bytes / 1024:.0f} KB（策略: {self.policy}）")
+
+
+def _domain_matches(host: str, domains) -> bool:
+    """host 是否属于 domains 中的某个域名（含子域名）"""
+    parts = host.split('.')
+    return any('.'.join(parts[i:]) in domains for i in range(len(parts) - 1))
+
+
+def _site(host: str) -> str:
+    """粗略的站点域名（取最后两段），用于判断第三方请求"""
+    return '.'.join(host.split('.')[-2:])
+
+
+def should_block(browser_config, resource_type: str, url: str, page_site: str) -> bool:
+    """
+    判断请求是否应被拦截
+
+    Args:
+        browser_config: BrowserConfig 配置对象
+        resource_type: Playwright 的资源类型（document、script、image 等）
+        url: 请求地址
+        page_site: 页面所在站点域名
+    """
+    if not browser_config.block_resources or resource_type == 'document':
+        return False
+    if resource_type in browser_config.blocked_resource_types:
+        return True
+    host = urlparse(url).hostname or ''
+    if browser_config.block_trackers and _domain_matches(host, TRACKER_DOMAINS):
+        return True
+    if browser_config.block_third_party and host and _site(host) != page_site:
+        return True
+    return False
+
+
+def _policy_name(browser_config) -> str:
+    if not browser_config.block_resources:
+        return '不拦截'
+    parts = ['/'.join(browser_config.blocked_resource_types) or '无类型拦截']
+    if browser_config.block_trackers:
+        parts.append('追踪脚本')
+    if browser_config.block_third_party:
+        parts.append('第三方')
+    if not browser_config.javascript_enabled:
+        parts.append('禁用JS')
+    return '+'.join(parts)
+
+
+# 常驻的浏览器：(事件循环, Browser)，只在启动它的事件循环中使用
+_warm_browser = None
+
+
+@asynccontextmanager
+async def warm_browser():
+    """
+    在当前事件循环中常驻一个浏览器进程（服务模式）
+
+    期间 open_light_page 复用这个浏览器，每次只新建和关闭上下文，省去每次启动 Chromium 的开销；
+    上下文之间不共享 Cookie 和缓存，抓取结果与每次新启动浏览器相同
+    """
+    global _warm_browser
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=LIGHTWEIGHT_LAUNCH_ARGS)
+        _warm_browser = (asyncio.get_running_loop(), browser)
+        try:
+            yield browser
+        finally:
+            _warm_browser = None
+            await browser.close()
+
+
+def _shared_browser():
+    """当前事件循环中可用的常驻浏览器（没有或已断开时返回 None）"""
+    if _warm_browser is None:
+        return None
+    loop, browser = _warm_browser
+    if loop is not asyncio.get_running_loop() or not browser.is_connected():
+        return None
+    return browser
+
+
+@asynccontextmanager
+async def open_light_page(url: str, source: str, browser_config):
+    """
+    打开一个精简的浏览器页面（退出时关闭上下文和浏览器并输出加载统计；使用常驻浏览器时只关闭上下文）
+
+    Args:
+        url: 目标页面地址（用于判断第三方请求）
+        source: 数据源名称
+        browser_config: BrowserConfig 配置对象
+
+    Yields:
+        Tuple[Page, PageLoadMetrics]: 页面对象和加载统计
+    """
+    from playwright.async_api import async_playwright
+
+    metrics = PageLoadMetrics(source=source, policy=_policy_name(browser_config))
+    page_site = _site(urlparse(url).hostname or '')
+
+    async with AsyncExitStack() as stack:
+        browser = _shared_browser()
+        if browser is None:
+            p = await stack.enter_async_context(async_playwright())
+            browser = await p.chromium.launch(headless=True, args=LIGHTWEIGHT_LAUNCH_ARGS)
+            stack.push_async_callback(browser.close)
+        context = await browser.new_context(
+            java_script_enabled=browser_config.javascript_enabled,
+            service_workers='block',
+            viewport={'width': 1280, 'height': 2000},
+            reduced_motion='reduce',
+        )
+
+        if browser_config.block_resources:
+            async def handle_route(route):
+                request = route.request
+                if should_block(browser_config, request.resource_type, request.url, page_site):
+                    metrics.blocked += 1
+                    await route.abort()
+                else:
+                    await route.continue_()
+
+            await context.route('**/*', handle_route)
+
+        async def on_request_finished(request):
+            metrics.requests += 1
+            try:
+                sizes = await request.sizes()
+                metrics.bytes += sizes['responseBodySize'] + sizes['responseHeadersSize']
+            except Exception:
+                pass  # 页面关闭后无法再读取大小
+
+        context.on('requestfinished', on_request_finished)
+
+        page = await context.new_page()
+        page.set_default_timeout(60000)  # 60秒
+        started = time.monotonic()
+
+        # 只计到首次 load 事件：调用方之后的等待、滚动加载和内容提取不计入加载耗时
+        def on_load(_page):
+            if not metrics.load_seconds:
+                metrics.load_seconds = time.monotonic() - started
+
+        page.on('load', on_load)
+        try:
+            yield page, metrics
+        finally:
+            await context.close()
+            print(f"  ℹ {metrics.summary()}")
+            record_metrics(metrics)
+
+
+def record_metrics(metrics: PageLoadMetrics) -> None:
+    """追加写入页面加载统计"""
+    try:
+        METRICS_LOG.parent.mkdir(parents=True, exist_ok=True)
+        record = {'time': datetime.now().isoformat(), **asdict(metrics)}
+        with open(METRICS_LOG, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    except OSError:
+        pass
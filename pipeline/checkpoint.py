@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+运行检查点模块
+把每次运行的中间结果（解析后的 Trending 列表、每个已完成的项目详情）追加写入本地日志，
+进程中断或工作流超时后可通过 --resume 从上次停止的位置继续，只重跑缺失的部分
+
+只恢复未完成、且在当天（或 checkpoint.resume_within 秒以内）开始的运行；
+已完成或过期的日志不会被重放到新的日报中，而是清空后重新开始
+
+日志为 JSON Lines 格式，每个数据源一个文件：
+    {"type": "start", "time": "..."}
+    {"type": "list", "items": [...]}
+    {"type": "details", "repo": "owner/repo", "details": {...}}
+    {"type": "complete", "time": "..."}
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+
+class RunJournal:
+    """单个数据源的运行日志"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.started: Optional[str] = None
+        self.trending: Optional[List[Dict[str, Any]]] = None
+        self.details: Dict[str, Dict[str, Any]] = {}
+        self.completed = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: Path, resume: bool = False, resume_within: float = 0.0,
+             now: Optional[datetime] = None) -> Tuple['RunJournal', Optional[str]]:
+        """
+        打开运行日志
+
+        Args:
+            path: 日志文件路径
+            resume: 是否从已有日志恢复；否则清空日志开始新的运行
+            resume_within: 可恢复的日志最多开始于多少秒以前（0 表示只恢复当天开始的运行）
+
+        Returns:
+            tuple: (运行日志, 已有日志不可恢复的原因)；恢复了已有日志或未要求恢复时原因为 None
+        """
+        journal = cls(path)
+        journal.path.parent.mkdir(parents=True, exist_ok=True)
+        reason = None
+        if resume and journal.path.exists():
+            journal._load()
+            reason = journal._unresumable_reason(resume_within, now or datetime.now())
+            if reason is None:
+                return journal, None
+            journal = cls(path)
+        journal.path.write_text('', encoding='utf-8')
+        journal._append({'type': 'start', 'time': datetime.now().isoformat()})
+        return journal, reason
+
+    def _unresumable_reason(self, resume_within: float, now: datetime) -> Optional[str]:
+        """已有日志不能恢复的原因（可以恢复时返回 None）"""
+        if self.trending is None:
+            return '没有已解析的列表'
+        if self.completed:
+            return '上次运行已完成'
+        try:
+            started = datetime.fromisoformat(self.started or '')
+        except ValueError:
+            return '缺少开始时间'
+        if resume_within > 0:
+            if (now - started).total_seconds() > resume_within:
+                return f"开始于 {self.started}，超过 {resume_within:g} 秒"
+        elif started.date() != now.date():
+            return f"开始于 {self.started}，不是当天的运行"
+        return None
+
+    def _load(self) -> None:
+        """读取已有日志，忽略中断时写了一半的最后一行"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                record_type = record.get('type')
+                if record_type == 'start':
+                    self.started = record.get('time')
+                elif record_type == 'list':
+                    self.trending = record['items']
+                elif record_type == 'details':
+                    self.details[record['repo']] = record['details']
+                elif record_type == 'complete':
+                    self.completed = True
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """追加一条记录并落盘"""
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        if record['type'] == 'start':
+            self.started = record['time']
+
+    def record_list(self, items: List[Dict[str, Any]]) -> None:
+        """记录解析后的 Trending 列表"""
+        self.trending = items
+        self._append({'type': 'list', 'items': items})
+
+    def record_details(self, repo_name: str, details: Dict[str, Any]) -> None:
+        """记录一个已完成的项目详情"""
+        self.details[repo_name] = details
+        self._append({'type': 'details', 'repo': repo_name, 'details': details})
+
+    async def record_details_async(self, repo_name: str, details: Dict[str, Any]) -> None:
+        """在线程中记录项目详情（每条记录都会 fsync，不在事件循环中等待磁盘）"""
+        import asyncio
+        await asyncio.to_thread(self.record_details, repo_name, details)
+
+    def mark_complete(self) -> None:
+        """标记本次运行已完成（报告已生成）"""
+        self.completed = True
+        self._append({'type': 'complete', 'time': datetime.now().isoformat()})
+
+
+def open_run_journal(source: str, config=None) -> Optional[RunJournal]:
+    """
+    打开数据源的运行日志
+
+    Args:
+        source: 数据源名称（如 "Zread" 或 "GitHub"）
+        config: 配置对象（未启用检查点时返回 None）
+
+    Returns:
+        Optional[RunJournal]: 运行日志
+    """
+    if config is None or not config.checkpoint.enabled:
+        return None
+
+    path = Path(config.checkpoint.journal_dir) / f"{source.lower()}.jsonl"
+    journal, reason = RunJournal.open(path, resume=config.checkpoint.resume,
+                                      resume_within=config.checkpoint.resume_within)
+    if config.checkpoint.resume:
+        if journal.trending is None:
+            detail = f"（{reason}）" if reason else ''
+            print(f"  ℹ 未找到 {source} 的可恢复检查点{detail}，重新开始")
+        else:
+            print(f"  ↻ 从检查点恢复 {source}（开始于 {journal.started}）："
+                  f"{len(journal.trending)} 个项目，{len(journal.details)} 个详情")
+    return journal
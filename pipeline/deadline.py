@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+运行时间预算模块
+每个数据源的一次运行有总时间预算，抓取列表和获取详情两个阶段各有自己的预算（取与剩余总预算的较小值）：
+- 抓取列表超时：跳过该数据源，另一个数据源照常生成和通知
+- 获取详情超时：不再发起新的获取，已完成的详情照常使用，未完成的项目标记为未获取详情，
+  用已有的数据渲染报告并发送通知
+- 数据源的请求预算用尽时同样按未获取详情处理
+
+这样一个很慢的依赖（翻译服务、卡住的 GitHub 页面）最多拖慢一个阶段，不会让整天的报告都超时丢失
+"""
+
+import time
+from typing import Dict, Optional
+
+from .resilience import RequestBudget
+
+# 未获取详情的原因（写入项目的 unenriched 字段，报告中显示）
+UNENRICHED_DEADLINE = '超出时间预算'
+UNENRICHED_BUDGET = '请求预算用尽'
+
+STAGES = ('fetch', 'enrich')
+
+
+class RunDeadline:
+    """一个数据源本次运行的时间和请求预算"""
+
+    def __init__(self, source: str, deadline_config=None):
+        """
+        Args:
+            source: 数据源名称
+            deadline_config: DeadlineConfig 配置对象（None 表示不限制）
+        """
+        self.source = source
+        self.config = deadline_config
+        self.started = time.monotonic()
+        self.degraded: Dict[str, str] = {}  # 阶段 -> 降级说明
+        limit = deadline_config.max_requests if deadline_config is not None else 0
+        self.request_budget = RequestBudget(limit) if limit else None
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> Optional[float]:
+        """剩余的总时间（秒，不限制时返回 None）"""
+        if self.config is None or not self.config.total:
+            return None
+        return max(0.0, self.config.total - self.elapsed)
+
+    def stage_timeout(self, stage: str) -> Optional[float]:
+        """
+        某个阶段可用的时间：阶段预算与剩余总预算的较小值
+
+        Returns:
+            Optional[float]: 秒数（不限制时返回 None）
+        """
+        limits = [self.remaining()]
+        if self.config is not None and getattr(self.config, stage, 0):
+            limits.append(getattr(self.config, stage))
+        limits = [limit for limit in limits if limit is not None]
+        return min(limits) if limits else None
+
+    def mark(self, stage: str, message: str) -> None:
+        """记录某个阶段的降级"""
+        self.degraded[stage] = message
+        print(f"  ⚠ {self.source} {message}")
+
+    def summary(self) -> str:
+        text = f"{self.source} 用时 {self.elapsed:.1f} 秒"
+        if self.request_budget is not None:
+            text += f"，请求 {self.request_budget.used}/{self.request_budget.limit}"
+        if self.degraded:
+            text += "，降级: " + '；'.join(self.degraded.values())
+        return text
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+项目详情获取模块
+Zread 和 GitHub 两个数据源共用的项目详情（简介、亮点、主要语言）获取流程
+"""
+
+import asyncio
+from typing import List, Dict, Any, Optional
+
+from .highlight_cache import configure_highlight_cache, get_highlight_cache
+from .identity import configure_identity_index, get_identity_index
+from .deadline import UNENRICHED_BUDGET, UNENRICHED_DEADLINE
+from .freshness import PreviousDetails, fill_stale_details, reuse_details
+from .registry import get_enrichment_registry
+from .resilience import BudgetExhaustedError, get_resilience
+
+# 默认并发数（同时请求 GitHub 项目首页的数量）
+DEFAULT_CONCURRENCY = 3
+
+
+def empty_details() -> Dict[str, Any]:
+    """获取失败时使用的空详情"""
+    return {
+        'description': '',
+        'highlights': [],
+        'language': ''
+    }
+
+
+def apply_details(project: Dict[str, Any], details: Dict[str, Any],
+                  prefer_existing_language: bool = False) -> None:
+    """
+    将详情写回项目字典
+
+    Args:
+        project: 项目字典
+        details: fetch_project_details 返回的详情
+        prefer_existing_language: 项目已有语言时是否保留（GitHub Trending 列表自带语言）
+    """
+    # 改名或大小写不同的仓库换成 GitHub 上的当前名称
+    canonical_name = details.get('repo')
+    if canonical_name and canonical_name != project['repo']:
+        if project.get('url', '').lower().startswith('https://github.com/'):
+            project['url'] = f"https://github.com/{canonical_name}"
+        project['repo'] = canonical_name
+    if details.get('fork_of'):
+        project['fork_of'] = details['fork_of']
+    project['intro'] = details.get('description', '')
+    project['highlights'] = details.get('highlights', [])
+    if details.get('language') and not (prefer_existing_language and project.get('language')):
+        project['language'] = details['language']
+
+
+def mark_unenriched(project: Dict[str, Any], reason: str, prefer_existing_language: bool = False) -> None:
+    """把未能获取详情的项目标记出来（使用空详情，报告中显示原因）"""
+    apply_details(project, empty_details(), prefer_existing_language)
+    project['unenriched'] = reason
+
+
+async def enrich_projects(projects: List[Dict[str, Any]], config=None,
+                          prefer_existing_language: bool = False, journal=None, deadline=None,
+                          source: Optional[str] = None) -> None:
+    """
+    并发获取项目详情并写回项目字典
+
+    启用分布式模式时任务会交给任务队列中的 worker 处理，否则在当前进程内并发获取
+
+    Args:
+        projects: 需要获取详情的项目列表
+        config: 配置对象（可选）
+        prefer_existing_language: 项目已有语言时是否保留
+        journal: 运行检查点（可选），已记录的详情直接复用，新完成的详情会写入检查点
+        deadline: 数据源的时间预算（RunDeadline，可选）；超时后停止获取，未完成的项目标记为未获取详情
+        source: 数据源名称（可选），沿用已有详情时用于判断列表信息是否变化
+    """
+    if journal is not None:
+        pending = []
+        for project in projects:
+            if project['repo'] in journal.details:
+                apply_details(project, journal.details[project['repo']], prefer_existing_language)
+            else:
+                pending.append(project)
+        if len(pending) < len(projects):
+            print(f"  ↻ 从检查点复用 {len(projects) - len(pending)} 个项目详情")
+        projects = pending
+        if not projects:
+            return
+
+    def apply(project, details):
+        apply_details(project, details, prefer_existing_language)
+
+    # 最近数据集中的已有详情：列表信息未变化的仓库直接沿用，获取失败的项目改用
+    reuse_for = config.enrich.reuse_details_for if config is not None else 0
+    stale_for = config.enrich.stale_details_for if config is not None else 0
+    previous = PreviousDetails.load(config, max(reuse_for, stale_for)) if reuse_for or stale_for else None
+    if previous and reuse_for:
+        pending = reuse_details(projects, previous, reuse_for, source, apply)
+        if len(pending) < len(projects):
+            print(f"  ↻ 沿用 {len(projects) - len(pending)} 个项目最近的详情（{reuse_for / 3600:g} 小时内，列表信息未变化）")
+        projects = pending
+        if not projects:
+            return
+
+    try:
+        await _fetch_details(projects, config, prefer_existing_language, journal, deadline)
+    finally:
+        if previous and stale_for:
+            filled = fill_stale_details(projects, previous, stale_for, apply)
+            if filled:
+                print(f"  ↻ {filled} 个项目未能获取详情，改用 {stale_for / 3600:g} 小时内保存的详情")
+
+
+async def _fetch_details(projects: List[Dict[str, Any]], config, prefer_existing_language: bool,
+                         journal, deadline) -> None:
+    """获取项目详情（分布式或当前进程内并发）"""
+    timeout = deadline.stage_timeout('enrich') if deadline is not None else None
+    if config is not None and config.distributed.enabled:
+        from .worker import enrich_projects_distributed
+        await enrich_projects_distributed(projects, config, prefer_existing_language, journal, timeout)
+        return
+
+    from tqdm import tqdm
+    # 解析进程池所在的模块依赖 bs4，获取详情时才导入
+    from .extract import configure_parse_pool
+    # 延迟导入避免循环依赖
+    from zread_trending_daily import fetch_project_details
+
+    concurrency = DEFAULT_CONCURRENCY
+    if config is not None:
+        concurrency = config.enrich.concurrency
+        configure_parse_pool(config.enrich.parse_workers)
+        configure_highlight_cache(config.enrich)
+        configure_identity_index(config.enrich)
+
+    total_projects = len(projects)
+    print(f"\n正在获取 {total_projects} 个项目的详细信息...")
+
+    # 使用信号量限制并发数，避免过载
+    semaphore = asyncio.Semaphore(concurrency)
+    registry = get_enrichment_registry()
+
+    # 创建进度条
+    pbar = tqdm(total=total_projects, desc="获取项目详情", unit="项目", ncols=100, leave=True)
+
+    async def fetch_with_progress(project):
+        """获取项目详情并更新进度条"""
+        # 检查点按列表中的原名称记录（apply_details 可能把项目换成改名后的名称）
+        repo_name = project['repo']
+        try:
+            # 同一次运行中两个数据源的相同仓库只获取一次
+            details = await registry.fetch(
+                repo_name,
+                lambda: fetch_project_details(repo_name, semaphore, raise_errors=True)
+            )
+        except BudgetExhaustedError as e:
+            mark_unenriched(project, UNENRICHED_BUDGET, prefer_existing_language)
+            pbar.set_postfix_str(f"✗ {repo_name}: {str(e)[:30]}")
+            return False
+        except Exception as e:
+            # 失败的项目不写入检查点，--resume 时会重新获取
+            apply_details(project, empty_details(), prefer_existing_language)
+            pbar.set_postfix_str(f"✗ {repo_name}: {str(e)[:30]}")
+            return False
+        else:
+            apply_details(project, details, prefer_existing_language)
+            if journal is not None:
+                await journal.record_details_async(repo_name, details)
+            pbar.set_postfix_str(f"✓ {repo_name}")
+            return True
+        finally:
+            pbar.update(1)
+
+    # 并发执行所有任务（有时间预算时最多等待到预算用完）
+    tasks = [asyncio.create_task(fetch_with_progress(project)) for project in projects]
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    if pending:
+        # 不再发起新的获取；线程中进行中的请求由各自的超时结束，结果丢弃
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for project, task in zip(projects, tasks):
+            if task in pending:
+                mark_unenriched(project, UNENRICHED_DEADLINE, prefer_existing_language)
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+
+    # 关闭进度条
+    pbar.close()
+    if pending:
+        deadline.mark('enrich', f"获取详情超出时间预算（{timeout:.0f} 秒），{len(pending)} 个项目未获取详情")
+    budget_exhausted = sum(1 for project in projects if project.get('unenriched') == UNENRICHED_BUDGET)
+    if budget_exhausted and deadline is not None:
+        deadline.mark('requests', f"请求预算用尽，{budget_exhausted} 个项目未获取详情")
+    print(f"  ℹ 请求统计: {get_resilience().summary()}")
+    print(f"  ℹ 详情共享: {registry.summary()}")
+    highlight_cache = get_highlight_cache()
+    if highlight_cache is not None:
+        print(f"  ℹ {highlight_cache.summary()}")
+    identity = get_identity_index()
+    if identity is not None:
+        print(f"  ℹ {identity.summary()}")
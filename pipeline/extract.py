@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+项目页面解析模块
+从 GitHub 项目首页 HTML 中提取简介、亮点和主要语言
+
+解析是 CPU 密集型操作，大型 README 页面在事件循环线程中解析会因 GIL 阻塞其他协程，
+因此解析可交给进程池执行：传入原始字节，返回精简的字典结果
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import threading
+from typing import Dict, Any, List, Optional, Union
+
+from bs4 import BeautifulSoup
+
+# 全局解析进程池（按需创建，同一进程内复用）
+_parse_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_parse_pool_workers = 0
+_parse_pool_lock = threading.Lock()
+
+
+# 身份字段 -> GitHub 项目首页的 meta 名称
+IDENTITY_META = {
+    'repo': 'octolytics-dimension-repository_nwo',
+    'fork_of': 'octolytics-dimension-repository_parent_nwo',
+    'network_root': 'octolytics-dimension-repository_network_root_nwo',
+}
+
+
+def readme_content_hash(readme_elem) -> str:
+    """计算 README 内容哈希（用于跨仓库、跨日期复用已提取和翻译的亮点）"""
+    return hashlib.blake2b(readme_elem.encode(), digest_size=16).hexdigest()
+
+
+def extract_project_details(html_content: Union[bytes, str],
+                            known_readme_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    解析项目首页，提取未翻译的简介、亮点和主要语言
+
+    该函数为模块级纯函数，可在进程池中执行
+
+    Args:
+        html_content: 页面原始内容（字节或字符串）
+        known_readme_hash: 已缓存亮点的 README 哈希；README 未变化时跳过亮点提取
+
+    Returns:
+        Dict: {'description': str, 'highlights': Optional[List[str]], 'language': str,
+               'readme_hash': Optional[str], 'repo': str, 'fork_of': str, 'network_root': str}，
+              跳过亮点提取时 highlights 为 None；repo 等身份字段取自页面的 octolytics 元数据（缺失时为空）
+    """
+    soup = BeautifulSoup(html_content, 'lxml')
+
+    # 仓库身份：页面中的规范 owner/repo（改名后为新名称）、fork 的上游和 fork 网络的根仓库
+    identity = {}
+    for field, meta_name in IDENTITY_META.items():
+        meta = soup.find('meta', attrs={'name': meta_name})
+        identity[field] = meta.get('content', '').strip() if meta else ''
+
+    # 提取项目描述（在仓库标题下方）
+    description = ""
+    desc_selectors = [
+        'p[data-pjax="#repo-content-pjax-container"]',
+        'div[itemprop="about"]',
+        'p.f4.my-3',
+        'div.Box-body p',
+        'span[itemprop="about"]',
+    ]
+
+    for selector in desc_selectors:
+        desc_elements = soup.select(selector)
+        if desc_elements:
+            for elem in desc_elements:
+                text = elem.get_text(strip=True)
+                if len(text) > 20:  # 选择有意义的描述
+                    description = text[:500]  # 限制长度
+                    break
+            if description:
+                break
+
+    # 提取主要编程语言
+    language = ""
+    # GitHub 的语言信息通常在语言统计栏中，格式为 <li> 包含语言名和百分比
+    # 查找语言统计区域
+    lang_stats_container = soup.find('ul', class_=lambda x: x and 'list-style-none' in ' '.join(x) if x else False)
+    if not lang_stats_container:
+        # 尝试其他可能的容器
+        lang_stats_container = soup.find('div', class_=lambda x: x and 'language' in ' '.join(x).lower() if x else False)
+
+    if lang_stats_container:
+        # 查找第一个语言项（通常是主要语言）
+        lang_items = lang_stats_container.find_all('li', limit=1)
+        if lang_items:
+            # 提取语言名称（通常在 span 中，且不包含百分比）
+            lang_spans = lang_items[0].find_all('span')
+            for span in lang_spans:
+                text = span.get_text(strip=True)
+                # 排除百分比（包含 %）和空文本
+                if text and '%' not in text and len(text) < 30:
+                    language = text
+                    break
+
+    # 如果还没找到，尝试使用 itemprop 属性
+    if not language:
+        lang_elem = soup.find('span', itemprop='programmingLanguage')
+        if lang_elem:
+            language = lang_elem.get_text(strip=True)
+
+    # 如果还没找到，尝试从链接中提取
+    if not language:
+        lang_links = soup.find_all('a', href=lambda x: x and '/search' in x and 'l=' in x if x else False)
+        if lang_links:
+            # 从第一个语言链接中提取语言名
+            for link in lang_links[:1]:
+                text = link.get_text(strip=True)
+                if text and len(text) < 30:
+                    language = text
+                    break
+
+    # 提取亮点：从 README 中提取关键信息
+    highlights = []
+    readme_selectors = [
+        'div#readme',
+        'article.markdown-body',
+        'div[data-target="readme-toc.content"]',
+    ]
+
+    readme_hash = None
+    for selector in readme_selectors:
+        readme_elem = soup.select_one(selector)
+        if readme_elem:
+            if readme_hash is None:
+                readme_hash = readme_content_hash(readme_elem)
+                if readme_hash == known_readme_hash:
+                    # README 未变化，亮点直接复用缓存
+                    highlights = None
+                    break
+            # 从 README 中提取列表项、粗体文本或标题作为亮点
+            # 查找列表项（通常是特性列表）
+            list_items = readme_elem.find_all(['li', 'strong', 'b'])
+            for item in list_items[:10]:  # 最多检查前10个
+                text = item.get_text(strip=True)
+                # 过滤掉太短或太长的文本
+                if 15 < len(text) < 200:
+                    # 检查是否是列表项的开头（通常包含特性描述）
+                    if item.name == 'li' or (item.name in ['strong', 'b'] and len(text) > 20):
+                        if text not in highlights:
+                            highlights.append(text)
+                            if len(highlights) >= 5:  # 最多5个亮点
+                                break
+            if highlights:
+                break
+
+            # 如果没有找到列表项，尝试从标题中提取
+            if not highlights:
+                headings = readme_elem.find_all(['h2', 'h3'])
+                for heading in headings[:5]:
+                    text = heading.get_text(strip=True)
+                    if 10 < len(text) < 100:
+                        highlights.append(text)
+                        if len(highlights) >= 5:
+                            break
+
+    # 立即释放解析树：节点之间互相引用，不释放时要等到循环垃圾回收，并发解析时会累积多棵整页的树
+    soup.decompose()
+
+    return {
+        'description': description,
+        'highlights': highlights[:5] if highlights is not None else None,
+        'language': language,
+        'readme_hash': readme_hash,
+        **identity
+    }
+
+
+def configure_parse_pool(workers: int) -> None:
+    """
+    设置解析进程池大小
+
+    Args:
+        workers: 进程数，0 表示不使用进程池（在线程中解析）
+    """
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if workers == _parse_pool_workers:
+            return
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+        _parse_pool_workers = max(0, workers)
+
+
+def _get_parse_pool() -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    """获取（必要时创建）解析进程池"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None and _parse_pool_workers > 0:
+            _parse_pool = concurrent.futures.ProcessPoolExecutor(max_workers=_parse_pool_workers)
+        return _parse_pool
+
+
+def _discard_parse_pool(pool: concurrent.futures.ProcessPoolExecutor) -> None:
+    """丢弃已损坏的进程池"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_parse_pool() -> None:
+    """关闭解析进程池"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=True)
+            _parse_pool = None
+
+
+async def parse_project_page(html_content: Union[bytes, str],
+                             known_readme_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    异步解析项目首页：配置了进程池时在子进程中解析，否则在线程中解析
+
+    Args:
+        html_content: 页面原始内容（字节或字符串）
+        known_readme_hash: 已缓存亮点的 README 哈希（可选）
+
+    Returns:
+        Dict: extract_project_details 的结果
+    """
+    pool = _get_parse_pool()
+    if pool is None:
+        return await asyncio.to_thread(extract_project_details, html_content, known_readme_hash)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, extract_project_details, html_content, known_readme_hash)
+    except concurrent.futures.process.BrokenProcessPool:
+        # 子进程异常退出时丢弃进程池（下次调用时重建），本次回退到线程中解析
+        print("  ⚠ 解析进程池异常，将重建进程池")
+        _discard_parse_pool(pool)
+        return await asyncio.to_thread(extract_project_details, html_content, known_readme_hash)
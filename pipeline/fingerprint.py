@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+数据集指纹模块
+对每个数据源获取详情后的项目列表计算指纹，与上次生成报告时的指纹比较，
+数据未变化（如同一天手动重跑）时跳过报告渲染、写文件、通知和提交
+
+指纹保存在报告目录下的 .fingerprints.json 中，随报告一起提交，CI 的下次运行也能读取：
+    {"GitHub": {"fingerprint": "...", "time": "...", "outputs": ["reports/..."], "notified": true}}
+
+notified 记录通知是否已送达：报告写入后先记为 false，各通知途径都发送成功后才改为 true。
+通知失败或进程在发送前退出时，下次运行不会因为数据未变化而跳过，会重新生成并补发通知
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Dict, Any, Optional
+
+FINGERPRINT_FILE = '.fingerprints.json'
+
+
+def _normalise(value):
+    """规范化字段值：去掉字符串首尾空白，递归处理列表和字典"""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return [_normalise(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalise(item) for key, item in value.items()}
+    return value
+
+
+def dataset_fingerprint(projects: List[Dict[str, Any]]) -> str:
+    """
+    计算项目列表的指纹
+
+    项目顺序（排名）计入指纹，字典键顺序和字符串首尾空白不计入
+
+    Args:
+        projects: 获取详情后的项目列表
+    """
+    canonical = json.dumps(_normalise(projects), ensure_ascii=False, sort_keys=True,
+                           separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class FingerprintStore:
+    """各数据源最近一次生成报告时的指纹"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._records = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def unchanged(self, source: str, fingerprint: str, outputs: List[Path],
+                  require_notified: bool = False) -> bool:
+        """
+        数据是否与上次生成报告时相同
+
+        指纹相同且本次要生成的报告文件都已存在时才认为未变化
+        （新的一天或新增报告格式时文件不存在，仍会生成）
+
+        Args:
+            source: 数据源名称
+            fingerprint: 本次数据的指纹
+            outputs: 本次要生成的报告文件
+            require_notified: 上次的通知未送达时视为有变化（启用通知时传入 True）
+        """
+        record = self._records.get(source)
+        if not record or record.get('fingerprint') != fingerprint:
+            return False
+        if require_notified and not record.get('notified', True):
+            return False
+        recorded = set(record.get('outputs', []))
+        return all(str(path) in recorded and Path(path).exists() for path in outputs)
+
+    def record(self, source: str, fingerprint: str, outputs: List[Path],
+               notifications: int = 0) -> Optional[Callable[[], None]]:
+        """
+        记录本次生成报告时的指纹（重新读取文件后合并，保留其他数据源的记录）
+
+        Args:
+            notifications: 本次需要送达的通知途径数（如即时通知和汇总邮件），为 0 时直接记为已通知
+
+        Returns:
+            Optional[Callable]: 每个通知途径发送成功后调用的回调，全部调用后记为已通知
+        """
+        self._records = self._load()
+        self._records[source] = {
+            'fingerprint': fingerprint,
+            'time': datetime.now().isoformat(),
+            'outputs': [str(path) for path in outputs],
+            'notified': notifications <= 0
+        }
+        self._save()
+        if notifications <= 0:
+            return None
+
+        remaining = [notifications]
+        lock = threading.Lock()
+
+        def delivered() -> None:
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] != 0:
+                    return
+            try:
+                self.mark_notified(source, fingerprint)
+            except OSError as e:
+                print(f"  ⚠ 记录 {source} 通知状态失败: {e}")
+
+        return delivered
+
+    def mark_notified(self, source: str, fingerprint: str) -> None:
+        """记录通知已送达（指纹已被更新的运行覆盖时不修改）"""
+        self._records = self._load()
+        record = self._records.get(source)
+        if record is None or record.get('fingerprint') != fingerprint:
+            return
+        record['notified'] = True
+        self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self._records, ensure_ascii=False, indent=2), encoding='utf-8')
+        tmp_path.replace(self.path)
+
+
+def open_fingerprint_store(config=None) -> Optional[FingerprintStore]:
+    """
+    打开报告目录下的指纹记录
+
+    Args:
+        config: 配置对象（未启用跳过时返回 None）
+    """
+    if config is None or not config.report.skip_unchanged:
+        return None
+    return FingerprintStore(Path(config.report.output_dir) / FINGERPRINT_FILE)
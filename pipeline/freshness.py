@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+数据新鲜度模块
+运行数据目录中保存着每个数据源最近成功获取的详情，在可接受的陈旧程度内直接复用，而不是每次都重新获取：
+
+- 复用（enrich.reuse_details_for）：最近的数据集中已有详情、且列表中的信息没有变化的仓库直接使用已有详情，
+  不再请求 GitHub 和翻译服务（适合 CI 中的重跑：昨天的详情对没有变化的仓库已经足够）
+- 兜底（enrich.stale_details_for）：获取失败、超出时间或请求预算的项目改用已有详情，
+  而不是以空详情出现在报告中
+
+陈旧程度按数据集中记录的生成时间计算（不依赖文件修改时间，检出到 CI 后同样准确）；
+沿用的详情在项目中记录 details_from（数据集的生成时间），报告中标注
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .history import open_run_store
+from .identity import repo_key
+
+# 项目字典中记录沿用详情来源时间的字段
+DETAILS_FROM = 'details_from'
+# 获取失败（非超时、非预算用尽）后改用已有详情时记录的原因
+STALE_FAILED = '获取详情失败'
+
+
+def format_timestamp(timestamp: float) -> str:
+    """数据生成时间的显示格式"""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+def _has_details(project: Dict[str, Any]) -> bool:
+    """项目是否有成功获取的详情（未获取或获取失败的项目不能被沿用）"""
+    return not project.get('unenriched') and bool(project.get('intro') or project.get('highlights'))
+
+
+class PreviousDetails:
+    """最近保存的数据集中各仓库的详情（按仓库规范键，同一仓库取最新的一条）"""
+
+    def __init__(self, entries: Dict[str, Tuple[float, str, Dict[str, Any]]]):
+        """
+        Args:
+            entries: 规范键 -> (数据集生成时间, 数据源, 项目字典)
+        """
+        self.entries = entries
+
+    @classmethod
+    def load(cls, config, max_age: float, now: Optional[float] = None) -> 'PreviousDetails':
+        """
+        读取生成时间在 max_age 秒以内的数据集
+
+        Args:
+            config: 配置对象（未启用运行数据时为空）
+            max_age: 最大陈旧程度（秒）
+        """
+        entries: Dict[str, Tuple[float, str, Dict[str, Any]]] = {}
+        store = open_run_store(config)
+        if store is None or max_age <= 0:
+            return cls(entries)
+        cutoff = (now if now is not None else time.time()) - max_age
+        cutoff_date = datetime.fromtimestamp(cutoff).strftime('%Y%m%d')
+        # 按日期倒序读取，同一仓库先读到的为最新的详情
+        for source, date, _ in reversed(store.runs()):
+            if date < cutoff_date:
+                break
+            record = store.load(source, date)
+            if record is None or record.timestamp < cutoff:
+                continue
+            for project in record.projects:
+                if _has_details(project):
+                    entries.setdefault(repo_key(project['repo']), (record.timestamp, source, project))
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, project: Dict[str, Any], max_age: float, source: Optional[str] = None,
+            require_unchanged: bool = True, now: Optional[float] = None) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        查找项目可沿用的详情
+
+        Args:
+            project: 本次列表中的项目
+            max_age: 最大陈旧程度（秒）
+            source: 本次的数据源；与已有详情来自同一数据源时才能比较列表中的信息
+            require_unchanged: 列表中的简介与上次不同时不沿用（视为仓库有变化）
+
+        Returns:
+            Optional[tuple]: (apply_details 使用的详情, 数据集生成时间)
+        """
+        entry = self.entries.get(repo_key(project['repo']))
+        if entry is None:
+            return None
+        updated, previous_source, previous = entry
+        if (now if now is not None else time.time()) - updated > max_age:
+            return None
+        if require_unchanged and previous_source == source:
+            before, after = previous.get('description') or '', project.get('description') or ''
+            if before and after and before != after:
+                return None
+        details = {
+            'description': previous.get('intro', ''),
+            'highlights': previous.get('highlights', []),
+            'language': previous.get('language', ''),
+            'repo': previous.get('repo', ''),
+            'fork_of': previous.get('fork_of', ''),
+        }
+        return details, updated
+
+
+def reuse_details(projects: List[Dict[str, Any]], previous: PreviousDetails, max_age: float,
+                  source: Optional[str], apply) -> List[Dict[str, Any]]:
+    """
+    为列表中没有变化的项目沿用已有详情
+
+    Args:
+        projects: 需要获取详情的项目
+        previous: 已有详情
+        max_age: 最大陈旧程度（秒）
+        source: 数据源名称
+        apply: 把详情写回项目的函数（project, details）
+
+    Returns:
+        List[Dict[str, Any]]: 仍需获取详情的项目
+    """
+    pending = []
+    for project in projects:
+        found = previous.get(project, max_age, source)
+        if found is None:
+            pending.append(project)
+            continue
+        details, updated = found
+        apply(project, details)
+        project[DETAILS_FROM] = format_timestamp(updated)
+    return pending
+
+
+def fill_stale_details(projects: List[Dict[str, Any]], previous: PreviousDetails, max_age: float,
+                       apply) -> int:
+    """
+    获取失败或未获取详情的项目改用已有详情（不要求列表信息未变化：陈旧的详情好过没有详情）
+
+    Returns:
+        int: 改用已有详情的项目数
+    """
+    filled = 0
+    for project in projects:
+        if _has_details(project):
+            continue
+        found = previous.get(project, max_age, require_unchanged=False)
+        if found is None:
+            continue
+        details, updated = found
+        reason = project.pop('unenriched', None) or STALE_FAILED
+        apply(project, details)
+        project[DETAILS_FROM] = format_timestamp(updated)
+        project['stale_reason'] = reason
+        filled += 1
+    return filled
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+README 亮点缓存模块
+以 README 内容哈希为键保存已翻译的亮点，README 未变化的仓库跳过亮点提取和翻译
+
+缓存为本地 SQLite 文件，Zread 和 GitHub 两个数据源、不同日期的运行共用：
+- readme 表：README 哈希 -> 已翻译的亮点
+- repo_readme 表：仓库规范键（见 pipeline/identity.py）-> 最近一次的 README 哈希（解析时据此判断 README 是否变化）
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, List
+
+
+class HighlightCache:
+    """README 亮点缓存"""
+
+    def __init__(self, path: str = '.cache/highlights.db'):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS readme (
+                hash TEXT PRIMARY KEY,
+                highlights TEXT NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS repo_readme (
+                repo TEXT PRIMARY KEY,
+                hash TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def readme_hash_for(self, repo_name: str) -> Optional[str]:
+        """仓库最近一次的 README 哈希（仅当该哈希的亮点仍在缓存中时返回）"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT r.hash FROM repo_readme r JOIN readme h ON h.hash = r.hash WHERE r.repo = ?',
+                (repo_name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, readme_hash: str) -> Optional[List[str]]:
+        """按 README 哈希读取已翻译的亮点，并记录命中统计"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT highlights FROM readme WHERE hash = ?', (readme_hash,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, readme_hash: str, highlights: List[str], repo_name: Optional[str] = None) -> None:
+        """保存已翻译的亮点，并关联到仓库"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO readme (hash, highlights, updated) VALUES (?, ?, ?)',
+                (readme_hash, json.dumps(highlights, ensure_ascii=False), time.time())
+            )
+            if repo_name:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO repo_readme (repo, hash) VALUES (?, ?)',
+                    (repo_name, readme_hash)
+                )
+            self._conn.commit()
+
+    def link(self, repo_name: str, readme_hash: str) -> None:
+        """把仓库关联到 README 哈希（命中其他仓库或其他日期的缓存时使用）"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO repo_readme (repo, hash) VALUES (?, ?)',
+                (repo_name, readme_hash)
+            )
+            self._conn.commit()
+
+    def summary(self) -> str:
+        return f"README 缓存命中 {self.hits} 次，未命中 {self.misses} 次"
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_highlight_cache: Optional[HighlightCache] = None
+_highlight_cache_lock = threading.Lock()
+
+
+def configure_highlight_cache(enrich_config) -> Optional[HighlightCache]:
+    """
+    按配置打开亮点缓存（同一路径重复调用复用已打开的缓存，两个数据源共享）
+
+    Args:
+        enrich_config: EnrichConfig 配置对象
+    """
+    global _highlight_cache
+    with _highlight_cache_lock:
+        if not enrich_config.highlight_cache:
+            _highlight_cache = None
+        elif _highlight_cache is None or _highlight_cache.path != Path(enrich_config.highlight_cache_path):
+            _highlight_cache = HighlightCache(enrich_config.highlight_cache_path)
+        return _highlight_cache
+
+
+def get_highlight_cache() -> Optional[HighlightCache]:
+    """获取当前的亮点缓存（未配置或已禁用时返回 None）"""
+    return _highlight_cache
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+运行数据模块
+每次生成报告后把获取详情后的项目列表保存为结构化数据，随报告一起提交，
+归档站点等离线功能从这里读取历史数据，而不是重新解析 Markdown 报告
+
+每个数据源一个子目录，每天一个文件（同一天重跑时覆盖）：
+    reports/data/github/20261019.json
+    {"source": "GitHub", "date": "20261019", "generate_time": "...", "projects": [...]}
+
+保存数据之前生成的报告可通过 backfill_from_reports() 从 Markdown 报告补录
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+REPORT_FILE = re.compile(r'^(?P<source>[a-z]+)_trending_report_(?P<date>\d{8})\.md$')
+SOURCE_NAMES = {'github': 'GitHub', 'zread': 'Zread'}
+
+_GENERATE_TIME = re.compile(r'^生成时间: (.+)$', re.MULTILINE)
+_PROJECT_HEADING = re.compile(r'^### \d+\. (\S+)\s*$', re.MULTILINE)
+_FIELD = re.compile(r'^\*\*(?P<name>[^*]+)\*\*:\s*(?P<value>.*)$')
+# 报告中的生成时间格式
+GENERATE_TIME_FORMAT = '%Y年%m月%d日 %H:%M:%S'
+
+
+@dataclass
+class RunRecord:
+    """一个数据源某一天的运行数据"""
+    source: str
+    date: str  # YYYYMMDD
+    generate_time: str
+    projects: List[Dict[str, Any]]
+
+    @property
+    def timestamp(self) -> float:
+        """数据的生成时间（Unix 时间戳；生成时间无法解析时取当天零点）：不依赖文件修改时间，检出到 CI 后同样准确"""
+        try:
+            return datetime.strptime(self.generate_time, GENERATE_TIME_FORMAT).timestamp()
+        except ValueError:
+            return datetime.strptime(self.date, '%Y%m%d').timestamp()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'source': self.source,
+            'date': self.date,
+            'generate_time': self.generate_time,
+            'projects': self.projects
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RunRecord':
+        return cls(
+            source=data['source'],
+            date=data['date'],
+            generate_time=data.get('generate_time', ''),
+            projects=data.get('projects', [])
+        )
+
+
+def parse_markdown_report(text: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    从 report.md.j2 渲染的 Markdown 报告中还原生成时间和项目列表（用于补录历史数据）
+
+    Returns:
+        tuple: (generate_time, projects)
+    """
+    match = _GENERATE_TIME.search(text)
+    generate_time = match.group(1).strip() if match else ''
+
+    headings = list(_PROJECT_HEADING.finditer(text))
+    projects = []
+    for i, heading in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+        project: Dict[str, Any] = {'repo': heading.group(1)}
+        in_highlights = False
+        for line in text[heading.end():end].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if in_highlights and line.startswith('- '):
+                project.setdefault('highlights', []).append(line[2:].strip())
+                continue
+            in_highlights = False
+            field = _FIELD.match(line)
+            if not field:
+                continue
+            name, value = field.group('name'), field.group('value').strip()
+            if name == '简介':
+                project['intro'] = value
+            elif name == '主要语言':
+                project['language'] = value
+            elif name == 'Fork 自':
+                project['fork_of'] = value
+            elif name == '亮点':
+                in_highlights = True
+            elif name == '标签':
+                project['tags'] = [tag.strip() for tag in value.split(',') if tag.strip()]
+            elif name == 'Stars':
+                project['stars'] = value
+            elif name == '链接':
+                project['url'] = value
+        projects.append(project)
+    return generate_time, projects
+
+
+class RunStore:
+    """按数据源和日期保存的运行数据"""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+
+    def path(self, source: str, date: str) -> Path:
+        return self.data_dir / source.lower() / f"{date}.json"
+
+    def save(self, record: RunRecord) -> Path:
+        """保存一天的运行数据（先写临时文件再替换，中断时不会留下半个文件）"""
+        path = self.path(record.source, record.date)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(record.to_dict(), ensure_ascii=False, indent=1), encoding='utf-8')
+        tmp_path.replace(path)
+        return path
+
+    def load(self, source: str, date: str) -> Optional[RunRecord]:
+        path = self.path(source, date)
+        try:
+            return RunRecord.from_dict(json.loads(path.read_text(encoding='utf-8')))
+        except (OSError, json.JSONDecodeError, KeyError):
+            return None
+
+    def runs(self) -> List[Tuple[str, str, Path]]:
+        """已保存的全部运行：(数据源, 日期, 文件路径)，按日期、数据源排序"""
+        runs = []
+        if not self.data_dir.exists():
+            return runs
+        for source_dir in self.data_dir.iterdir():
+            if not source_dir.is_dir():
+                continue
+            source = SOURCE_NAMES.get(source_dir.name, source_dir.name)
+            for path in source_dir.glob('*.json'):
+                if path.stem.isdigit() and len(path.stem) == 8:
+                    runs.append((source, path.stem, path))
+        return sorted(runs, key=lambda run: (run[1], run[0]))
+
+    def latest(self, source: str) -> Optional[str]:
+        """某个数据源最近一次运行的日期（没有运行数据时返回 None）"""
+        source_dir = self.data_dir / source.lower()
+        dates = [path.stem for path in source_dir.glob('*.json') if path.stem.isdigit() and len(path.stem) == 8]
+        return max(dates) if dates else None
+
+    def iter_records(self) -> Iterator[RunRecord]:
+        """按日期顺序读取全部运行数据（跳过损坏的文件）"""
+        for source, date, _ in self.runs():
+            record = self.load(source, date)
+            if record is not None:
+                yield record
+
+    def backfill_from_reports(self, reports_dir: Path) -> int:
+        """
+        从已有的 Markdown 报告补录缺失的运行数据
+
+        Args:
+            reports_dir: 报告目录
+
+        Returns:
+            int: 补录的天数
+        """
+        count = 0
+        reports_dir = Path(reports_dir)
+        if not reports_dir.exists():
+            return count
+        for path in sorted(reports_dir.glob('*_trending_report_*.md')):
+            match = REPORT_FILE.match(path.name)
+            if not match:
+                continue
+            source = SOURCE_NAMES.get(match.group('source'), match.group('source'))
+            if self.path(source, match.group('date')).exists():
+                continue
+            generate_time, projects = parse_markdown_report(path.read_text(encoding='utf-8'))
+            if projects:
+                self.save(RunRecord(source, match.group('date'), generate_time, projects))
+                count += 1
+        return count
+
+
+def open_run_store(config=None) -> Optional[RunStore]:
+    """
+    打开运行数据目录
+
+    Args:
+        config: 配置对象（未启用时返回 None）
+    """
+    if config is None or not config.history.enabled:
+        return None
+    return RunStore(Path(config.history.data_dir))
+
+
+def save_run(config, source: str, date: str, generate_time: str,
+             projects: List[Dict[str, Any]]) -> Optional[Path]:
+    """保存一个数据源本次运行的数据（未启用时不保存）"""
+    store = open_run_store(config)
+    if store is None:
+        return None
+    return store.save(RunRecord(source, date, generate_time, projects))
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+HTML 报告输出模块
+report.html.j2 默认把样式内联到每天的报告中（standalone 模式，单个文件即可离线打开）。
+compact 模式面向长期静态托管的报告归档：
+- 样式发布为报告目录下按内容哈希命名的共享样式表（assets/report.<hash>.css），
+  所有报告引用同一个文件，样式不变时不会重复写入，可设置长期缓存
+- 渲染后的标记去掉缩进、换行和注释
+- 可选预压缩为 .gz / .br，供静态服务器直接返回（brotli 为可选依赖，未安装时跳过）
+"""
+
+import gzip
+import hashlib
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ASSETS_DIR = 'assets'
+STYLESHEET_TEMPLATE = 'report.css'
+_SUFFIXES = {'gzip': '.gz', 'br': '.br'}  # 预压缩格式 -> 文件后缀
+
+# 内容需要原样保留的元素
+_PRESERVED = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+_BETWEEN_TAGS = re.compile(r'>\s*\n\s*<')  # 只去掉换行缩进，同一行标签间的空格可能影响排版
+_WHITESPACE = re.compile(r'\s+')
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_PUNCT = re.compile(r'\s*([{};:,>])\s*')
+
+
+@dataclass
+class HtmlOutput:
+    """一份 HTML 报告的输出结果（字节数）"""
+    path: Path
+    size: int
+    rendered_size: int  # 压缩标记前的大小
+    stylesheet: Optional[Path] = None  # compact 模式引用的共享样式表
+    compressed: Dict[str, int] = field(default_factory=dict)  # 预压缩文件后缀 -> 字节数
+
+    def summary(self) -> str:
+        """形如 "12.3 KB，gzip 3.1 KB" 的大小说明"""
+        parts = [f"{self.size / 1024:.1f} KB"]
+        if self.rendered_size != self.size:
+            parts[0] += f"（压缩前 {self.rendered_size / 1024:.1f} KB）"
+        for suffix, size in self.compressed.items():
+            parts.append(f"{suffix.lstrip('.')} {size / 1024:.1f} KB")
+        return '，'.join(parts)
+
+
+def minify_html(html: str) -> str:
+    """
+    压缩 HTML 标记：去掉注释和标签之间的换行缩进，其余连续空白折叠为一个空格
+
+    pre / textarea / script / style 的内容原样保留
+    """
+    pieces = _PRESERVED.split(html)
+    out = []
+    # split 的结果依次为：普通片段、保留元素、元素名、普通片段……
+    for i in range(0, len(pieces), 3):
+        text = _COMMENT.sub('', pieces[i])
+        # 与保留元素相邻的一侧补上标签边界，保留元素前后的换行缩进同样去掉
+        before = '>' if i else ''
+        after = '<' if i + 1 < len(pieces) else ''
+        text = _BETWEEN_TAGS.sub('><', before + text + after)
+        text = text[len(before):len(text) - len(after)]
+        out.append(_WHITESPACE.sub(' ', text))
+        if i + 1 < len(pieces):
+            out.append(pieces[i + 1])
+    return ''.join(out).strip()
+
+
+def minify_css(css: str) -> str:
+    """压缩样式表：去掉注释和多余空白"""
+    css = _CSS_COMMENT.sub('', css)
+    css = _WHITESPACE.sub(' ', css)
+    return _CSS_PUNCT.sub(r'\1', css).replace(';}', '}').strip()
+
+
+def publish_stylesheet(env, output_dir: Path) -> Path:
+    """
+    把 report.css 发布为按内容哈希命名的共享样式表（内容不变时不重复写入）
+
+    Args:
+        env: Jinja2 环境（从模板目录读取样式）
+        output_dir: 报告目录
+
+    Returns:
+        Path: 样式表路径
+    """
+    source, _, _ = env.loader.get_source(env, STYLESHEET_TEMPLATE)
+    css = minify_css(source)
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]
+    path = Path(output_dir) / ASSETS_DIR / f"report.{digest}.css"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(css, encoding='utf-8')
+        tmp_path.replace(path)
+    return path
+
+
+_brotli_warned = False
+
+
+def _brotli():
+    global _brotli_warned
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        if not _brotli_warned:
+            _brotli_warned = True
+            print("  ⚠ 未安装 brotli，跳过 .br 预压缩（uv pip install brotli）")
+        return None
+
+
+def precompress(path: Path, data: bytes, encodings: List[str], overwrite: bool = True) -> Dict[str, int]:
+    """
+    写入预压缩文件（path.gz / path.br）
+
+    Args:
+        path: 原文件路径
+        data: 原文件内容
+        encodings: gzip / br
+        overwrite: 预压缩文件已存在时是否重新压缩（内容按哈希命名的文件无需重复压缩）
+
+    Returns:
+        Dict[str, int]: 预压缩文件后缀 -> 字节数
+    """
+    sizes = {}
+    for encoding in encodings:
+        suffix = _SUFFIXES.get(encoding)
+        if suffix and not overwrite and Path(f"{path}{suffix}").exists():
+            sizes[suffix] = Path(f"{path}{suffix}").stat().st_size
+            continue
+        if encoding == 'gzip':
+            # mtime 固定为 0，内容不变时压缩结果也不变
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        elif encoding == 'br':
+            brotli = _brotli()
+            if brotli is None:
+                continue
+            compressed = brotli.compress(data, quality=11)
+        else:
+            print(f"  ⚠ 不支持的预压缩格式: {encoding}")
+            continue
+        Path(f"{path}{suffix}").write_bytes(compressed)
+        sizes[suffix] = len(compressed)
+    return sizes
+
+
+def write_html_report(env, template_data: dict, path: Path, report_config) -> HtmlOutput:
+    """
+    按报告配置渲染并写入 HTML 报告
+
+    Args:
+        env: Jinja2 环境
+        template_data: 模板数据
+        path: 输出文件路径
+        report_config: ReportConfig 配置对象（html_mode、precompress）
+
+    Returns:
+        HtmlOutput: 输出结果
+    """
+    path = Path(path)
+    template = env.get_template("report.html.j2")
+    stylesheet = None
+    if report_config.html_mode == 'compact':
+        stylesheet = publish_stylesheet(env, path.parent)
+        precompress(stylesheet, stylesheet.read_bytes(), report_config.precompress, overwrite=False)
+        rendered = template.render(**template_data, stylesheet=stylesheet.relative_to(path.parent).as_posix())
+        html = minify_html(rendered)
+    else:
+        rendered = html = template.render(**template_data)
+
+    data = html.encode('utf-8')
+    path.write_bytes(data)
+    return HtmlOutput(
+        path=path,
+        size=len(data),
+        rendered_size=len(rendered.encode('utf-8')),
+        stylesheet=stylesheet,
+        compressed=precompress(path, data, report_config.precompress)
+    )
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+仓库身份规范化模块
+Zread 从 zread.ai 链接的前两段路径取仓库名，GitHub Trending 从 github.com 链接取仓库名，
+大小写不同、改名或转移后的仓库在不同日期、不同数据源中会被当作不同的项目。
+身份索引把它们统一到同一个规范键（小写 owner/repo）：
+
+- 规范化：去掉 github.com 前缀、.git 后缀和多余路径，转为小写
+- 改名 / 转移：获取详情时 GitHub 会重定向到新地址，页面中也带有规范的 owner/repo，
+  旧名称作为别名记录在磁盘上，之后的运行直接请求新地址
+- fork：记录上游仓库和所属 fork 网络的根仓库，历史搜索按网络分组展示（group()）
+
+索引为本地 SQLite 文件（与亮点缓存同目录），打开时整体读入内存；
+别名在写入时做路径压缩（a -> b、b -> c 时把 a 直接指向 c），查询始终是一次字典查找。
+运行数据、亮点缓存、跨数据源详情共享和历史搜索都使用这里的规范键。
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+_GITHUB_PREFIX = re.compile(r'^(?:https?://)?(?:www\.)?github\.com/', re.IGNORECASE)
+
+
+def repo_path(value: str) -> Optional[str]:
+    """从仓库名或 GitHub 地址中取出 owner/repo（保留大小写，无法识别时返回 None）"""
+    text = _GITHUB_PREFIX.sub('', (value or '').strip())
+    text = re.split(r'[?#]', text, maxsplit=1)[0].strip('/')
+    parts = text.split('/')
+    if len(parts) < 2 or not parts[0] or not parts[1]:
+        return None
+    owner, name = parts[0], parts[1]
+    if name.lower().endswith('.git'):
+        name = name[:-4]
+    return f"{owner}/{name}" if name else None
+
+
+def normalise_repo(value: str) -> Optional[str]:
+    """
+    把仓库名或 GitHub 地址规范化为小写的 owner/repo（不查询别名）
+
+    Returns:
+        Optional[str]: 规范化后的键（无法识别为仓库时返回 None）
+    """
+    path = repo_path(value)
+    return path.lower() if path else None
+
+
+def _fallback_key(repo_name: str) -> str:
+    return normalise_repo(repo_name) or (repo_name or '').strip('/').lower()
+
+
+class RepoIdentityIndex:
+    """仓库身份索引（别名 -> 规范键、规范名称、fork 关系）"""
+
+    def __init__(self, path: str = '.cache/identity.db'):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS aliases (
+                alias TEXT PRIMARY KEY,
+                canonical TEXT NOT NULL,
+                seq INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS aliases_canonical ON aliases (canonical)')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS repos (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                parent TEXT,
+                root TEXT,
+                updated REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self._aliases: Dict[str, str] = dict(self._conn.execute('SELECT alias, canonical FROM aliases'))
+        self._repos: Dict[str, Tuple[str, Optional[str], Optional[str]]] = {
+            key: (name, parent, root)
+            for key, name, parent, root in self._conn.execute('SELECT key, name, parent, root FROM repos')
+        }
+        self._seq = self._conn.execute('SELECT coalesce(max(seq), 0) FROM aliases').fetchone()[0]
+
+    def key(self, repo_name: str) -> str:
+        """规范键（已知的旧名称解析为当前名称）"""
+        key = _fallback_key(repo_name)
+        return self._aliases.get(key, key)
+
+    def name(self, repo_name: str) -> str:
+        """当前的规范名称（保留大小写）；未记录时返回原名称"""
+        record = self._repos.get(self.key(repo_name))
+        return record[0] if record else (repo_name or '').strip('/')
+
+    def parent(self, repo_name: str) -> Optional[str]:
+        """fork 的上游仓库名称（不是 fork 或未记录时返回 None）"""
+        record = self._repos.get(self.key(repo_name))
+        return record[1] if record else None
+
+    def group(self, repo_name: str) -> str:
+        """fork 网络分组键：fork 归到网络的根仓库，其他仓库为自身的规范键"""
+        key = self.key(repo_name)
+        record = self._repos.get(key)
+        if record and record[2]:
+            return self.key(record[2])
+        return key
+
+    def url(self, repo_name: str) -> str:
+        """GitHub 项目首页地址（已知改名时直接使用新地址，省去一次重定向）"""
+        return f"https://github.com/{self.name(repo_name)}"
+
+    @property
+    def seq(self) -> int:
+        """别名变更序号（每记录一个别名加一，历史搜索据此增量更新规范键）"""
+        return self._seq
+
+    def record(self, requested: str, canonical: str, parent: Optional[str] = None,
+               root: Optional[str] = None) -> bool:
+        """
+        记录一次解析结果
+
+        Args:
+            requested: 请求时使用的仓库名
+            canonical: 重定向后（或页面中）的规范 owner/repo
+            parent: fork 的上游仓库（可选）
+            root: fork 网络的根仓库（可选）
+
+        Returns:
+            bool: 索引是否有变化（没有变化时不写磁盘）
+        """
+        canonical_name = repo_path(canonical)
+        if not canonical_name:
+            return False
+        canonical_key = canonical_name.lower()
+        requested_key = _fallback_key(requested)
+        parent = parent or None
+        root = root if root and _fallback_key(root) != canonical_key else None
+
+        with self._lock:
+            changed = False
+            with self._conn:
+                if requested_key != canonical_key and self._aliases.get(requested_key) != canonical_key:
+                    # 序号在语句内从数据库取得，多个 worker 进程同时写入时也不会重复
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO aliases (alias, canonical, seq) '
+                        'VALUES (?, ?, (SELECT coalesce(max(seq), 0) + 1 FROM aliases))',
+                        (requested_key, canonical_key)
+                    )
+                    self._aliases[requested_key] = canonical_key
+                    # 路径压缩：指向旧名称的别名直接改指新名称
+                    for (alias,) in self._conn.execute(
+                            'SELECT alias FROM aliases WHERE canonical = ?', (requested_key,)).fetchall():
+                        self._conn.execute(
+                            'UPDATE aliases SET canonical = ?, seq = (SELECT max(seq) + 1 FROM aliases) '
+                            'WHERE alias = ?', (canonical_key, alias)
+                        )
+                        self._aliases[alias] = canonical_key
+                    self._seq = self._conn.execute('SELECT max(seq) FROM aliases').fetchone()[0]
+                    # 旧名称不再是规范键
+                    self._conn.execute('DELETE FROM repos WHERE key = ?', (requested_key,))
+                    self._repos.pop(requested_key, None)
+                    changed = True
+                if canonical_key in self._aliases:
+                    # 仓库改回了原来的名称
+                    self._conn.execute('DELETE FROM aliases WHERE alias = ?', (canonical_key,))
+                    del self._aliases[canonical_key]
+                    changed = True
+                if self._repos.get(canonical_key) != (canonical_name, parent, root):
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO repos (key, name, parent, root, updated) VALUES (?, ?, ?, ?, ?)',
+                        (canonical_key, canonical_name, parent, root, time.time())
+                    )
+                    self._repos[canonical_key] = (canonical_name, parent, root)
+                    changed = True
+            return changed
+
+    def changes_since(self, seq: int) -> List[Tuple[str, str]]:
+        """序号之后新增或变化的别名：[(别名, 规范键)]"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT alias, canonical FROM aliases WHERE seq > ? ORDER BY seq', (seq,)
+            ).fetchall()
+
+    def summary(self) -> str:
+        forks = sum(1 for record in self._repos.values() if record[1])
+        return f"身份索引: {len(self._repos)} 个仓库，{len(self._aliases)} 个别名，{forks} 个 fork"
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_identity_index: Optional[RepoIdentityIndex] = None
+_identity_index_lock = threading.Lock()
+
+
+def configure_identity_index(enrich_config) -> Optional[RepoIdentityIndex]:
+    """
+    按配置打开身份索引（同一路径重复调用复用已打开的索引，两个数据源共享）
+
+    Args:
+        enrich_config: EnrichConfig 配置对象
+    """
+    global _identity_index
+    with _identity_index_lock:
+        if not enrich_config.identity_index:
+            _identity_index = None
+        elif _identity_index is None or _identity_index.path != Path(enrich_config.identity_index_path):
+            _identity_index = RepoIdentityIndex(enrich_config.identity_index_path)
+        return _identity_index
+
+
+def get_identity_index() -> Optional[RepoIdentityIndex]:
+    """获取当前的身份索引（未配置或已禁用时返回 None）"""
+    return _identity_index
+
+
+def repo_key(repo_name: str) -> str:
+    """仓库的规范键（未配置身份索引时只做大小写和地址格式的规范化）"""
+    index = _identity_index
+    return index.key(repo_name) if index is not None else _fallback_key(repo_name)
+
+
+def canonicalise_projects(projects: List[Dict[str, Any]], config=None) -> List[Dict[str, Any]]:
+    """
+    规范化项目列表：已知改名的仓库换成当前名称，同一仓库的重复条目只保留排名靠前的一条
+
+    Args:
+        projects: 解析得到的项目列表
+        config: 配置对象（可选，用于打开身份索引）
+
+    Returns:
+        List[Dict[str, Any]]: 去重后的项目列表（项目字典原地修改）
+    """
+    index = configure_identity_index(config.enrich) if config is not None else get_identity_index()
+    seen = set()
+    result = []
+    for project in projects:
+        key = repo_key(project['repo'])
+        if key in seen:
+            continue
+        seen.add(key)
+        if index is not None:
+            name = index.name(project['repo'])
+            if name != project['repo'] and name.lower() == key:
+                if project.get('url', '').lower().startswith('https://github.com/'):
+                    project['url'] = f"https://github.com/{name}"
+                project['repo'] = name
+            parent = index.parent(name)
+            if parent:
+                project['fork_of'] = parent
+        result.append(project)
+    if len(result) < len(projects):
+        print(f"  ℹ 合并了 {len(projects) - len(result)} 个重复的仓库（大小写不同或已改名）")
+    return result
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+内存限制模块
+抓取大量项目时进程内存主要来自同时在处理的项目页面（下载的 HTML、解析树、翻译中的文本）：
+
+- 项目页面流式下载，超过 memory.max_page_bytes 的部分丢弃，单个异常大的页面不会撑大进程
+- 解析树在提取完成后立即释放（见 extract.py 和各数据源的列表解析）
+- 设置 memory.max_rss_mb 后，常驻内存超过上限时暂停发起新的详情获取，进行中的获取完成、内存回落后再继续；
+  没有进行中的获取时仍放行一个，保证总能完成
+- 每个数据源的运行结束时报告期间的峰值常驻内存
+
+常驻内存从 /proc/self/statm 读取（Linux）；其他平台无法读取当前值时只报告进程峰值，不做限流
+"""
+
+import asyncio
+import gc
+import os
+import resource
+import sys
+import threading
+from contextlib import asynccontextmanager
+from typing import Optional
+
+MB = 1024 * 1024
+
+# 流式下载的块大小
+CHUNK_SIZE = 64 * 1024
+# 未配置内存限流器时（如单独运行的 worker）单个页面的下载上限，与 MemoryConfig 默认值一致
+DEFAULT_MAX_PAGE_BYTES = 5 * MB
+
+
+def current_rss() -> Optional[int]:
+    """当前进程的常驻内存（字节，无法读取时返回 None）"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss() -> int:
+    """进程启动以来的峰值常驻内存（字节）"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 上单位为 KB，macOS 上为字节
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def read_limited(response, max_bytes: Optional[int] = None) -> bytes:
+    """
+    流式读取响应体，最多读取 max_bytes 字节（需以 stream=True 发起请求）
+
+    超出的部分丢弃并关闭连接：项目页面的元信息和 README 开头都在前面，截断只影响很长的 README 末尾
+
+    Args:
+        response: requests.Response
+        max_bytes: 最多读取的字节数（None 时取 memory.max_page_bytes，0 表示不限制）
+    """
+    if max_bytes is None:
+        governor = get_memory_governor()
+        max_bytes = governor.config.max_page_bytes if governor is not None else DEFAULT_MAX_PAGE_BYTES
+    if not max_bytes:
+        return response.content
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        chunks.append(chunk[:max_bytes - size])
+        size += len(chunk)
+        if size >= max_bytes:
+            governor = get_memory_governor()
+            if governor is not None:
+                governor.count('truncated')
+            break
+    response.close()
+    return b''.join(chunks)
+
+
+class MemoryGovernor:
+    """按常驻内存上限限制详情获取的并发（进程内共享）"""
+
+    def __init__(self, memory_config):
+        """
+        Args:
+            memory_config: MemoryConfig 配置对象
+        """
+        self.config = memory_config
+        self.limit = memory_config.max_rss_mb * MB
+        self.active = 0
+        self.stats = {'throttled': 0, 'truncated': 0}
+        self._lock = threading.Lock()
+        self._warned = False
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def over_limit(self) -> bool:
+        if not self.limit:
+            return False
+        rss = current_rss()
+        if rss is None:
+            if not self._warned:
+                self._warned = True
+                print("  ⚠ 无法读取当前常驻内存（非 Linux），memory.max_rss_mb 不生效")
+            return False
+        return rss > self.limit
+
+    @asynccontextmanager
+    async def slot(self):
+        """占用一个获取名额：超过内存上限且有其他进行中的获取时等待内存回落"""
+        if self.active and self.over_limit():
+            self.count('throttled')
+            # 先回收一次循环引用（解析树、异常回溯等），多数情况下足以回落
+            gc.collect()
+            while self.active and self.over_limit():
+                await asyncio.sleep(self.config.sample_interval)
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+
+
+_memory_governor: Optional[MemoryGovernor] = None
+_memory_governor_lock = threading.Lock()
+
+
+def configure_memory_governor(memory_config) -> MemoryGovernor:
+    """
+    按配置创建内存限流器（配置未变化时复用，两个数据源共享）
+
+    Args:
+        memory_config: MemoryConfig 配置对象
+    """
+    global _memory_governor
+    with _memory_governor_lock:
+        if _memory_governor is None or _memory_governor.config != memory_config:
+            _memory_governor = MemoryGovernor(memory_config)
+        return _memory_governor
+
+
+def get_memory_governor() -> Optional[MemoryGovernor]:
+    """获取当前的内存限流器（未配置时返回 None）"""
+    return _memory_governor
+
+
+@asynccontextmanager
+async def memory_slot():
+    """详情获取的内存名额（未配置内存限流器时不限制）"""
+    governor = _memory_governor
+    if governor is None:
+        yield
+        return
+    async with governor.slot():
+        yield
+
+
+class RunMemory:
+    """一个数据源本次运行期间的内存统计（后台定时采样常驻内存）"""
+
+    def __init__(self, source: str, memory_config=None):
+        self.source = source
+        self.config = memory_config
+        self.peak = current_rss() or 0
+        self._task: Optional[asyncio.Task] = None
+        governor = configure_memory_governor(memory_config) if memory_config is not None else None
+        self._governor = governor
+        self._start_stats = dict(governor.stats) if governor is not None else {}
+
+    def sample(self) -> None:
+        rss = current_rss()
+        if rss is not None and rss > self.peak:
+            self.peak = rss
+
+    async def _sample_loop(self) -> None:
+        interval = self.config.sample_interval if self.config is not None else 0.5
+        while True:
+            self.sample()
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """在当前事件循环中开始采样"""
+        self._task = asyncio.get_running_loop().create_task(self._sample_loop())
+
+    def stop(self) -> None:
+        self.sample()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def summary(self) -> str:
+        text = f"{self.source} 内存: 运行期间峰值 {self.peak / MB:.0f} MB（进程峰值 {peak_rss() / MB:.0f} MB）"
+        if self._governor is not None:
+            if self._governor.limit:
+                text += f"，上限 {self._governor.limit / MB:.0f} MB"
+            stats = {key: value - self._start_stats.get(key, 0) for key, value in self._governor.stats.items()}
+            if stats['throttled']:
+                text += f"，限流 {stats['throttled']} 次"
+            if stats['truncated']:
+                text += f"，截断页面 {stats['truncated']} 个"
+        return text
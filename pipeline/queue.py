@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+分布式任务队列模块
+协调者把每个项目的详情获取任务放入队列，多个 worker 进程/节点领取并回写结果
+
+支持的后端：
+- sqlite: 本地文件队列（默认），同一台机器或共享磁盘上的多个进程可用
+- memory: 进程内队列，用于单进程运行和本地测试
+- redis: Redis 兼容队列（可选依赖，需要安装 redis 包）
+
+任务语义：
+- 入队幂等：相同 job_id 重复入队不会产生重复任务，已完成的结果会被直接复用
+- 租约超时：worker 领取任务后持有租约，超时未完成的任务会被重新分配
+- 重试上限：任务失败或租约过期后重新排队，超过最大尝试次数标记为失败
+- 过期清理：已完成和失败的任务保留 distributed.retention_days 天，之后由协调者清除
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable
+
+# 任务状态
+STATUS_PENDING = 'pending'
+STATUS_LEASED = 'leased'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+@dataclass
+class Job:
+    """队列中的单个任务"""
+    job_id: str
+    payload: Dict[str, Any]
+    attempts: int = 0
+    max_attempts: int = 3
+
+
+class WorkQueue:
+    """任务队列接口，各后端需实现以下方法"""
+
+    def enqueue(self, job_id: str, payload: Dict[str, Any], max_attempts: int = 3) -> bool:
+        """
+        放入任务（幂等）
+
+        已完成或正在执行的任务不会重复入队；之前失败的任务会重置尝试次数后重新排队
+
+        Returns:
+            bool: 是否新排入了任务（已存在且无需重试的任务返回 False）
+        """
+        raise NotImplementedError
+
+    def claim(self, worker_id: str, lease_timeout: float) -> Optional[Job]:
+        """领取一个待处理任务，没有可领取的任务时返回 None"""
+        raise NotImplementedError
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """
+        提交任务结果
+
+        Returns:
+            bool: 结果是否被接受（任务已完成时重复提交返回 False）
+        """
+        raise NotImplementedError
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> None:
+        """报告任务失败，未达到最大尝试次数时重新排队"""
+        raise NotImplementedError
+
+    def status(self, job_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        查询任务状态
+
+        Returns:
+            Dict: job_id -> {'status': ..., 'result': ..., 'error': ...}
+        """
+        raise NotImplementedError
+
+    def prune(self, older_than: float) -> int:
+        """
+        清除入队时间早于 older_than 秒之前的已完成和失败任务
+
+        Returns:
+            int: 清除的任务数（不支持清理的后端返回 0）
+        """
+        return 0
+
+    def close(self) -> None:
+        """释放队列资源"""
+        pass
+
+
+class MemoryWorkQueue(WorkQueue):
+    """进程内任务队列（本地测试和单进程运行使用）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def enqueue(self, job_id: str, payload: Dict[str, Any], max_attempts: int = 3) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                if job['status'] != STATUS_FAILED:
+                    return False
+                job.update(status=STATUS_PENDING, attempts=0, max_attempts=max_attempts, error=None)
+                return True
+            self._jobs[job_id] = {
+                'payload': payload,
+                'status': STATUS_PENDING,
+                'attempts': 0,
+                'max_attempts': max_attempts,
+                'worker_id': None,
+                'lease_expires': 0.0,
+                'result': None,
+                'error': None,
+                'created': time.time(),
+            }
+            return True
+
+    def claim(self, worker_id: str, lease_timeout: float) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            for job_id, job in sorted(self._jobs.items(), key=lambda item: item[1]['created']):
+                expired = job['status'] == STATUS_LEASED and job['lease_expires'] < now
+                if job['status'] != STATUS_PENDING and not expired:
+                    continue
+                if job['attempts'] >= job['max_attempts']:
+                    job['status'] = STATUS_FAILED
+                    job['error'] = job['error'] or '租约超时次数过多'
+                    continue
+                job['status'] = STATUS_LEASED
+                job['attempts'] += 1
+                job['worker_id'] = worker_id
+                job['lease_expires'] = now + lease_timeout
+                return Job(job_id, job['payload'], job['attempts'], job['max_attempts'])
+        return None
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] == STATUS_DONE:
+                return False
+            job['status'] = STATUS_DONE
+            job['result'] = result
+            job['worker_id'] = worker_id
+            return True
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] != STATUS_LEASED or job['worker_id'] != worker_id:
+                return
+            job['error'] = error
+            job['status'] = STATUS_FAILED if job['attempts'] >= job['max_attempts'] else STATUS_PENDING
+
+    def status(self, job_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                job_id: {
+                    'status': self._jobs[job_id]['status'],
+                    'result': self._jobs[job_id]['result'],
+                    'error': self._jobs[job_id]['error'],
+                }
+                for job_id in job_ids if job_id in self._jobs
+            }
+
+    def prune(self, older_than: float) -> int:
+        cutoff = time.time() - older_than
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['status'] in (STATUS_DONE, STATUS_FAILED) and job['created'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """基于 SQLite 文件的任务队列（默认后端）"""
+
+    def __init__(self, path: str = '.cache/work_queue.db'):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None 以便手动控制事务，领取任务时使用 BEGIN IMMEDIATE 加写锁
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                worker_id TEXT,
+                lease_expires REAL NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                created REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created)')
+
+    def enqueue(self, job_id: str, payload: Dict[str, Any], max_attempts: int = 3) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO jobs (job_id, payload, status, max_attempts, created) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (job_id, json.dumps(payload, ensure_ascii=False), STATUS_PENDING, max_attempts, time.time())
+            )
+            if cursor.rowcount == 0:
+                cursor = self._conn.execute(
+                    'UPDATE jobs SET status = ?, attempts = 0, max_attempts = ?, error = NULL '
+                    'WHERE job_id = ? AND status = ?',
+                    (STATUS_PENDING, max_attempts, job_id, STATUS_FAILED)
+                )
+            return cursor.rowcount > 0
+
+    def claim(self, worker_id: str, lease_timeout: float) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                # 租约过期且已用完尝试次数的任务直接标记为失败
+                self._conn.execute(
+                    'UPDATE jobs SET status = ?, error = COALESCE(error, ?) '
+                    'WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts',
+                    (STATUS_FAILED, '租约超时次数过多', STATUS_LEASED, now)
+                )
+                row = self._conn.execute(
+                    'SELECT job_id, payload, attempts, max_attempts FROM jobs '
+                    'WHERE status = ? OR (status = ? AND lease_expires < ?) '
+                    'ORDER BY created LIMIT 1',
+                    (STATUS_PENDING, STATUS_LEASED, now)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute('COMMIT')
+                    return None
+                job_id, payload, attempts, max_attempts = row
+                self._conn.execute(
+                    'UPDATE jobs SET status = ?, attempts = ?, worker_id = ?, lease_expires = ? '
+                    'WHERE job_id = ?',
+                    (STATUS_LEASED, attempts + 1, worker_id, now + lease_timeout, job_id)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return Job(job_id, json.loads(payload), attempts + 1, max_attempts)
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, worker_id = ?, error = NULL '
+                'WHERE job_id = ? AND status != ?',
+                (STATUS_DONE, json.dumps(result, ensure_ascii=False), worker_id, job_id, STATUS_DONE)
+            )
+            return cursor.rowcount > 0
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                'UPDATE jobs SET error = ?, '
+                'status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END '
+                'WHERE job_id = ? AND status = ? AND worker_id = ?',
+                (error, STATUS_FAILED, STATUS_PENDING, job_id, STATUS_LEASED, worker_id)
+            )
+
+    def status(self, job_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        job_ids = list(job_ids)
+        if not job_ids:
+            return {}
+        placeholders = ','.join('?' * len(job_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT job_id, status, result, error FROM jobs WHERE job_id IN ({placeholders})',
+                job_ids
+            ).fetchall()
+        return {
+            job_id: {
+                'status': status,
+                'result': json.loads(result) if result else None,
+                'error': error,
+            }
+            for job_id, status, result, error in rows
+        }
+
+    def prune(self, older_than: float) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM jobs WHERE status IN (?, ?) AND created < ?',
+                (STATUS_DONE, STATUS_FAILED, time.time() - older_than)
+            )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisWorkQueue(WorkQueue):
+    """Redis 兼容任务队列（可选后端）"""
+
+    def __init__(self, redis_url: str, namespace: str = 'trending:queue'):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("使用 Redis 队列需要安装 redis 包: uv add redis")
+
+        self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        self._jobs_key = f"{namespace}:jobs"
+        self._pending_key = f"{namespace}:pending"
+        self._leases_key = f"{namespace}:leases"
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self._redis.hget(self._jobs_key, job_id)
+        return json.loads(raw) if raw else None
+
+    def _save(self, job_id: str, job: Dict[str, Any]) -> None:
+        self._redis.hset(self._jobs_key, job_id, json.dumps(job, ensure_ascii=False))
+
+    def enqueue(self, job_id: str, payload: Dict[str, Any], max_attempts: int = 3) -> bool:
+        job = {
+            'payload': payload,
+            'status': STATUS_PENDING,
+            'attempts': 0,
+            'max_attempts': max_attempts,
+            'worker_id': None,
+            'result': None,
+            'error': None,
+        }
+        if not self._redis.hsetnx(self._jobs_key, job_id, json.dumps(job, ensure_ascii=False)):
+            existing = self._load(job_id)
+            if existing is None or existing['status'] != STATUS_FAILED:
+                return False
+            existing.update(status=STATUS_PENDING, attempts=0, max_attempts=max_attempts, error=None)
+            self._save(job_id, existing)
+        self._redis.rpush(self._pending_key, job_id)
+        return True
+
+    def _requeue_expired(self) -> None:
+        """将租约过期的任务放回待处理队列"""
+        for job_id in self._redis.zrangebyscore(self._leases_key, 0, time.time()):
+            # zrem 返回 1 表示当前进程抢到了这次重排，避免多个 worker 重复放回
+            if not self._redis.zrem(self._leases_key, job_id):
+                continue
+            job = self._load(job_id)
+            if job is None or job['status'] != STATUS_LEASED:
+                continue
+            if job['attempts'] >= job['max_attempts']:
+                job['status'] = STATUS_FAILED
+                job['error'] = job['error'] or '租约超时次数过多'
+                self._save(job_id, job)
+            else:
+                job['status'] = STATUS_PENDING
+                self._save(job_id, job)
+                self._redis.rpush(self._pending_key, job_id)
+
+    def claim(self, worker_id: str, lease_timeout: float) -> Optional[Job]:
+        self._requeue_expired()
+        while True:
+            job_id = self._redis.lpop(self._pending_key)
+            if job_id is None:
+                return None
+            job = self._load(job_id)
+            if job is None or job['status'] != STATUS_PENDING:
+                continue
+            job['status'] = STATUS_LEASED
+            job['attempts'] += 1
+            job['worker_id'] = worker_id
+            self._save(job_id, job)
+            self._redis.zadd(self._leases_key, {job_id: time.time() + lease_timeout})
+            return Job(job_id, job['payload'], job['attempts'], job['max_attempts'])
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        job = self._load(job_id)
+        if job is None or job['status'] == STATUS_DONE:
+            return False
+        job.update(status=STATUS_DONE, result=result, worker_id=worker_id, error=None)
+        self._save(job_id, job)
+        self._redis.zrem(self._leases_key, job_id)
+        return True
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> None:
+        job = self._load(job_id)
+        if job is None or job['status'] != STATUS_LEASED or job['worker_id'] != worker_id:
+            return
+        self._redis.zrem(self._leases_key, job_id)
+        job['error'] = error
+        if job['attempts'] >= job['max_attempts']:
+            job['status'] = STATUS_FAILED
+            self._save(job_id, job)
+        else:
+            job['status'] = STATUS_PENDING
+            self._save(job_id, job)
+            self._redis.rpush(self._pending_key, job_id)
+
+    def status(self, job_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        job_ids = list(job_ids)
+        if not job_ids:
+            return {}
+        statuses = {}
+        for job_id, raw in zip(job_ids, self._redis.hmget(self._jobs_key, job_ids)):
+            if raw:
+                job = json.loads(raw)
+                statuses[job_id] = {
+                    'status': job['status'],
+                    'result': job['result'],
+                    'error': job['error'],
+                }
+        return statuses
+
+    def close(self) -> None:
+        self._redis.close()
+
+
+def create_work_queue(distributed_config) -> WorkQueue:
+    """
+    根据配置创建任务队列
+
+    Args:
+        distributed_config: DistributedConfig 配置对象
+
+    Returns:
+        WorkQueue: 任务队列实例
+    """
+    backend = distributed_config.backend
+    if backend == 'sqlite':
+        return SQLiteWorkQueue(distributed_config.queue_path)
+    if backend == 'memory':
+        return MemoryWorkQueue()
+    if backend == 'redis':
+        if not distributed_config.redis_url:
+            raise ValueError("使用 Redis 队列需要配置 redis_url 或环境变量 REDIS_URL")
+        return RedisWorkQueue(distributed_config.redis_url)
+    raise ValueError(f"不支持的队列后端: {backend}")
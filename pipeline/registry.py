@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+项目详情共享注册表（single-flight）
+同一次运行中 Zread 和 GitHub 两个数据源经常包含相同的仓库，
+注册表保证同一仓库的详情只获取一次：并发请求等待同一个获取任务，已完成的结果直接复用
+
+注册表按事件循环划分：每次 asyncio.run() 的运行拥有独立的注册表，两个数据源通过
+asyncio.gather 在同一事件循环中运行时自然共享
+"""
+
+import asyncio
+import time
+import weakref
+from typing import Dict, Any, Callable, Awaitable, Optional, Tuple
+
+from .identity import repo_key
+
+# 已完成结果的保留时间（秒），长期运行的事件循环中过期后重新获取
+DEFAULT_RESULT_TTL = 3600.0
+
+
+class EnrichmentRegistry:
+    """单事件循环内的项目详情共享注册表"""
+
+    def __init__(self, result_ttl: float = DEFAULT_RESULT_TTL):
+        self.result_ttl = result_ttl
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._results: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self.stats = {'fetched': 0, 'joined': 0, 'reused': 0}
+
+    @staticmethod
+    def key(repo_name: str) -> str:
+        """注册表键（仓库规范键：不区分大小写，已知改名的仓库解析为当前名称）"""
+        return repo_key(repo_name)
+
+    async def fetch(self, repo_name: str,
+                    fetch_func: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        获取项目详情：已有结果直接返回，已有进行中的获取则等待其结果，否则发起新的获取
+
+        获取失败时异常会传递给所有等待者，且不会缓存，后续调用会重新获取
+
+        Args:
+            repo_name: 仓库名
+            fetch_func: 实际获取详情的协程函数
+        """
+        key = self.key(repo_name)
+
+        cached = self._results.get(key)
+        if cached is not None:
+            finished_at, details = cached
+            if time.monotonic() - finished_at < self.result_ttl:
+                self.stats['reused'] += 1
+                return details
+            del self._results[key]
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats['joined'] += 1
+            try:
+                # shield：某个等待者被取消时不影响其他等待者和获取任务本身
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    # 发起获取的数据源超出时间预算而取消，当前等待者自己重新获取
+                    return await self.fetch(repo_name, fetch_func)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.stats['fetched'] += 1
+        try:
+            details = await fetch_func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 没有其他等待者时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            future.set_result(details)
+            self._results[key] = (time.monotonic(), details)
+            return details
+        finally:
+            self._in_flight.pop(key, None)
+
+    @property
+    def avoided(self) -> int:
+        """避免的重复获取次数"""
+        return self.stats['joined'] + self.stats['reused']
+
+    def summary(self) -> str:
+        return (f"实际获取 {self.stats['fetched']} 次，跨数据源共享避免重复获取 {self.avoided} 次"
+                f"（等待进行中 {self.stats['joined']} 次，复用已完成 {self.stats['reused']} 次）")
+
+
+_registries: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, EnrichmentRegistry]' = weakref.WeakKeyDictionary()
+
+
+def get_enrichment_registry(loop: Optional[asyncio.AbstractEventLoop] = None) -> EnrichmentRegistry:
+    """获取当前事件循环的共享注册表（不存在时创建）"""
+    loop = loop or asyncio.get_running_loop()
+    registry = _registries.get(loop)
+    if registry is None:
+        registry = EnrichmentRegistry()
+        _registries[loop] = registry
+    return registry
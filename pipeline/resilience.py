@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+出站请求弹性模块
+为所有外部调用（GitHub 页面、Zread 页面、翻译服务）提供统一的：
+
+- 指数退避重试（带随机抖动），优先遵循 Retry-After 和 GitHub 的速率限制响应头
+- 按主机划分的熔断器：连续失败达到阈值后暂停对该主机的请求，冷却后放行一个探测请求
+- 单次运行的全局请求预算：预算用尽后不再发起新请求，避免整个运行耗费在注定失败的请求上
+- 数据源请求预算（可选）：通过 use_request_budget() 绑定到当前上下文，
+  asyncio.to_thread 会复制上下文，线程中发出的请求同样计入
+"""
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Callable, Awaitable, Mapping
+from urllib.parse import urlparse
+
+# 可重试的 HTTP 状态码
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class ResilienceError(Exception):
+    """弹性层异常基类"""
+
+
+class CircuitOpenError(ResilienceError):
+    """熔断器处于打开状态，请求被直接拒绝"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} 熔断中，{retry_in:.0f} 秒后重试")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class BudgetExhaustedError(ResilienceError):
+    """本次运行的请求预算已用尽"""
+
+    def __init__(self, limit: int):
+        super().__init__(f"本次运行的请求预算（{limit} 次）已用尽")
+        self.limit = limit
+
+
+class RetryableError(ResilienceError):
+    """可重试的错误（如 429/5xx 响应），可携带服务端建议的等待时间"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, status: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status = status
+
+
+@dataclass
+class RetryPolicy:
+    """指数退避重试策略"""
+    max_attempts: int = 3  # 最大尝试次数（含首次）
+    base_delay: float = 1.0  # 首次重试的基准等待时间（秒）
+    max_delay: float = 30.0  # 单次等待上限（秒）
+
+    def backoff(self, attempt: int) -> float:
+        """
+        第 attempt 次失败后的等待时间（full jitter）
+
+        Args:
+            attempt: 已失败次数（从 1 开始）
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+def retry_after_seconds(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+    """
+    从响应头中解析服务端建议的等待时间
+
+    支持 Retry-After（秒数或 HTTP 日期）以及 GitHub 的 X-RateLimit-Remaining / X-RateLimit-Reset
+
+    Returns:
+        Optional[float]: 等待秒数，无相关响应头时返回 None
+    """
+    now = now if now is not None else time.time()
+    # 统一为小写键，兼容 requests 和 Playwright 的响应头
+    headers = {key.lower(): value for key, value in headers.items()}
+
+    retry_after = headers.get('retry-after')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+
+    if headers.get('x-ratelimit-remaining') == '0' and headers.get('x-ratelimit-reset'):
+        try:
+            return max(0.0, float(headers['x-ratelimit-reset']) - now)
+        except ValueError:
+            pass
+
+    return None
+
+
+class CircuitBreaker:
+    """单个主机的熔断器"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """请求前检查，熔断中时抛出 CircuitOpenError"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now < self.opened_until:
+                    raise CircuitOpenError(self.host, self.opened_until - now)
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                # 半开状态只放行一个探测请求
+                if self._probe_in_flight:
+                    raise CircuitOpenError(self.host, self.reset_timeout)
+                self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """请求没有得到主机的响应（如预算用尽、本地错误）：不改变状态，只释放半开状态的探测名额"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open(self.reset_timeout)
+
+    def hold_open(self, seconds: float) -> None:
+        """服务端要求长时间等待时直接打开熔断器"""
+        with self._lock:
+            self._probe_in_flight = False
+            self._open(seconds)
+
+    def _open(self, seconds: float) -> None:
+        self.state = self.OPEN
+        self.opened_until = max(self.opened_until, time.monotonic() + seconds)
+
+
+class RequestBudget:
+    """单次运行的请求预算（线程安全）"""
+
+    def __init__(self, limit: int = 0):
+        self.limit = limit  # 0 表示不限制
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self.limit and self.used >= self.limit:
+                raise BudgetExhaustedError(self.limit)
+            self.used += 1
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return max(0, self.limit - self.used) if self.limit else None
+
+
+# 当前上下文（数据源的任务）的请求预算
+_context_budget: contextvars.ContextVar[Optional[RequestBudget]] = contextvars.ContextVar(
+    'request_budget', default=None
+)
+
+
+def use_request_budget(budget: Optional[RequestBudget]) -> contextvars.Token:
+    """把请求预算绑定到当前上下文（返回的 token 交给 reset_request_budget 恢复）"""
+    return _context_budget.set(budget)
+
+
+def reset_request_budget(token: contextvars.Token) -> None:
+    """恢复绑定请求预算之前的上下文"""
+    _context_budget.reset(token)
+
+
+def _is_transient(error: Exception) -> bool:
+    """判断异常是否值得重试"""
+    if isinstance(error, (RetryableError, ConnectionError, TimeoutError)):
+        return True
+    try:
+        import requests
+    except ImportError:
+        pass
+    else:
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in RETRYABLE_STATUSES
+    try:
+        # 页面加载超时、net::ERR_* 等导航错误（TimeoutError 是 Error 的子类）
+        from playwright.async_api import Error as PlaywrightError
+    except ImportError:
+        pass
+    else:
+        if isinstance(error, PlaywrightError):
+            return True
+    try:
+        from deep_translator.exceptions import RequestError, TooManyRequests
+    except ImportError:
+        pass
+    else:
+        if isinstance(error, (RequestError, TooManyRequests)):
+            return True
+    return False
+
+
+def _is_http_response(error: Exception) -> bool:
+    """异常是否来自主机的正常 HTTP 响应（如 404），说明主机可用"""
+    try:
+        import requests
+    except ImportError:
+        return False
+    return isinstance(error, requests.HTTPError) and error.response is not None
+
+
+class Resilience:
+    """弹性调用器：组合重试策略、按主机熔断器和请求预算"""
+
+    def __init__(self, resilience_config=None):
+        if resilience_config is None:
+            from config.config import ResilienceConfig
+            resilience_config = ResilienceConfig()
+        self.config = resilience_config
+        self.policy = RetryPolicy(
+            max_attempts=resilience_config.max_attempts,
+            base_delay=resilience_config.base_delay,
+            max_delay=resilience_config.max_delay,
+        )
+        self.budget = RequestBudget(resilience_config.request_budget)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = self._empty_stats()
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {'requests': 0, 'retries': 0, 'short_circuited': 0, 'throttled': 0, 'failures': 0}
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """获取（必要时创建）主机对应的熔断器"""
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(
+                    host,
+                    failure_threshold=self.config.failure_threshold,
+                    reset_timeout=self.config.reset_timeout,
+                )
+            return self._breakers[host]
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _before_attempt(self, host: str) -> CircuitBreaker:
+        breaker = self.breaker(host)
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            self._count('short_circuited')
+            raise
+        try:
+            context_budget = _context_budget.get()
+            if context_budget is not None:
+                context_budget.acquire()
+            self.budget.acquire()
+        except BudgetExhaustedError:
+            # 请求没有发出：释放可能已占用的半开探测名额，否则该主机会一直处于熔断中
+            breaker.release_probe()
+            raise
+        self._count('requests')
+        return breaker
+
+    def _after_failure(self, host: str, breaker: CircuitBreaker, error: Exception,
+                       attempt: int) -> Optional[float]:
+        """
+        记录失败并计算下次重试前的等待时间
+
+        Returns:
+            Optional[float]: 等待秒数；返回 None 表示不再重试
+        """
+        if not _is_transient(error):
+            if _is_http_response(error):
+                # 主机正常响应（如 404），不计入熔断
+                breaker.record_success()
+            else:
+                # 其他错误（如解析响应出错）不能说明主机的状态，只释放探测名额
+                breaker.release_probe()
+            return None
+
+        breaker.record_failure()
+        self._count('failures')
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            self._count('throttled')
+            if retry_after > self.config.max_retry_after:
+                # 服务端要求等待太久：打开熔断器直到限流解除，本次运行不再浪费请求
+                breaker.hold_open(retry_after)
+                print(f"  ⚠ {host} 限流，需等待 {retry_after:.0f} 秒，暂停请求该主机")
+                return None
+        if attempt >= self.policy.max_attempts:
+            return None
+        self._count('retries')
+        return retry_after if retry_after is not None else self.policy.backoff(attempt)
+
+    def call(self, host: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        同步弹性调用（在线程中执行的请求使用）
+
+        Args:
+            host: 目标主机（熔断器按主机划分）
+            func: 实际执行请求的函数
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker = self._before_attempt(host)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                delay = self._after_failure(host, breaker, e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+    async def call_async(self, host: str, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        异步弹性调用（Playwright 页面加载等协程使用）
+
+        Args:
+            host: 目标主机
+            coro_factory: 每次调用返回一个新协程的函数
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker = self._before_attempt(host)
+            try:
+                result = await coro_factory()
+            except Exception as e:
+                delay = self._after_failure(host, breaker, e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+    def _session(self):
+        """每个线程复用一个 requests.Session（连接池）"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            import requests
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def get(self, url: str, **kwargs):
+        """
+        弹性 GET 请求
+
+        429/5xx 响应会按 Retry-After 或退避策略重试，最终失败时抛出 requests.HTTPError
+
+        Returns:
+            requests.Response: 成功的响应
+        """
+        import requests
+
+        def do_get():
+            response = self._session().get(url, **kwargs)
+            if response.status_code >= 400:
+                # 流式请求（stream=True）未读取的响应体不会自动归还连接
+                response.close()
+            if response.status_code in RETRYABLE_STATUSES or (
+                response.status_code == 403 and response.headers.get('X-RateLimit-Remaining') == '0'
+            ):
+                raise RetryableError(
+                    f"HTTP {response.status_code}: {url}",
+                    retry_after=retry_after_seconds(response.headers),
+                    status=response.status_code,
+                )
+            response.raise_for_status()
+            return response
+
+        try:
+            return self.call(urlparse(url).hostname or url, do_get)
+        except RetryableError as e:
+            raise requests.HTTPError(str(e)) from e
+
+    def reset_budget(self) -> None:
+        """开始新的一次运行：重置请求预算和请求统计，保留连接池和熔断器状态（服务模式下跨运行复用）"""
+        self.budget = RequestBudget(self.config.request_budget)
+        with self._stats_lock:
+            self.stats = self._empty_stats()
+
+    def summary(self) -> str:
+        """本次运行的请求统计"""
+        text = (f"请求 {self.stats['requests']} 次，重试 {self.stats['retries']} 次，"
+                f"限流 {self.stats['throttled']} 次，熔断跳过 {self.stats['short_circuited']} 次")
+        if self.budget.limit:
+            text += f"，预算剩余 {self.budget.remaining}/{self.budget.limit}"
+        return text
+
+
+_resilience: Optional[Resilience] = None
+_resilience_lock = threading.Lock()
+
+
+def configure_resilience(resilience_config) -> Resilience:
+    """
+    按配置创建新的弹性调用器（每次运行开始时调用，重置熔断器和请求预算）
+
+    Args:
+        resilience_config: ResilienceConfig 配置对象
+    """
+    global _resilience
+    with _resilience_lock:
+        _resilience = Resilience(resilience_config)
+        return _resilience
+
+
+def get_resilience() -> Resilience:
+    """获取当前的弹性调用器（未配置时使用默认配置）"""
+    global _resilience
+    with _resilience_lock:
+        if _resilience is None:
+            _resilience = Resilience()
+        return _resilience
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+分布式 worker 与协调者模块
+
+协调者（生成日报的进程）只抓取一次 Trending 列表，把每个项目的详情获取任务放入任务队列，
+由一个或多个 worker 进程/节点领取执行，结果写回队列后再由协调者汇总用于渲染日报。
+
+启动外部 worker：
+    python trending_daily.py --worker --config config.json
+"""
+
+import asyncio
+import multiprocessing
+import os
+import socket
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from .deadline import UNENRICHED_DEADLINE
+from .enrich import apply_details, empty_details, mark_unenriched
+from .extract import configure_parse_pool, shutdown_parse_pool
+from .highlight_cache import configure_highlight_cache
+from .identity import configure_identity_index, repo_key
+from .memory import configure_memory_governor
+from .resilience import configure_resilience
+from .queue import WorkQueue, Job, create_work_queue, STATUS_DONE, STATUS_FAILED
+
+# 轮询任务队列的间隔（秒）
+POLL_INTERVAL = 1.0
+
+# 协调者启动的本地 worker 空闲多久后退出（秒）
+LOCAL_WORKER_IDLE_EXIT = 5.0
+
+
+def job_id_for(repo_name: str, run_date: Optional[str] = None) -> str:
+    """
+    生成任务 ID
+
+    同一天同一个仓库的任务 ID 相同，重跑或多个数据源重复入队时会复用已有结果
+    """
+    run_date = run_date or datetime.now().strftime('%Y%m%d')
+    return f"details:{run_date}:{repo_name}"
+
+
+def default_worker_id() -> str:
+    """默认 worker ID：主机名-进程号"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+async def _process_job(queue: WorkQueue, job: Job, worker_id: str,
+                       semaphore: asyncio.Semaphore) -> bool:
+    """执行单个任务并回写结果"""
+    # 延迟导入避免循环依赖
+    from zread_trending_daily import fetch_project_details
+
+    repo_name = job.payload['repo']
+    try:
+        details = await fetch_project_details(repo_name, semaphore, raise_errors=True)
+    except Exception as e:
+        print(f"  ✗ [{worker_id}] {repo_name} 第 {job.attempts}/{job.max_attempts} 次尝试失败: {e}")
+        await asyncio.to_thread(queue.fail, job.job_id, worker_id, str(e)[:500])
+        return False
+
+    await asyncio.to_thread(queue.complete, job.job_id, worker_id, details)
+    return True
+
+
+async def worker_loop(queue: WorkQueue, distributed_config, worker_id: str,
+                      idle_exit: Optional[float] = None,
+                      stop_event: Optional[asyncio.Event] = None) -> int:
+    """
+    worker 主循环：持续领取并执行任务
+
+    Args:
+        queue: 任务队列
+        distributed_config: DistributedConfig 配置对象
+        worker_id: worker 标识
+        idle_exit: 连续空闲多少秒后退出（None 表示一直运行）
+        stop_event: 外部停止信号（可选）
+
+    Returns:
+        int: 成功完成的任务数
+    """
+    concurrency = max(1, distributed_config.worker_concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    completed = 0
+
+    async def slot():
+        nonlocal completed
+        idle_since = time.monotonic()
+        while not (stop_event and stop_event.is_set()):
+            job = await asyncio.to_thread(queue.claim, worker_id, distributed_config.lease_timeout)
+            if job is None:
+                if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                    return
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+            if await _process_job(queue, job, worker_id, semaphore):
+                completed += 1
+            idle_since = time.monotonic()
+
+    await asyncio.gather(*(slot() for _ in range(concurrency)))
+    return completed
+
+
+def run_worker(config, worker_id: Optional[str] = None,
+               idle_exit: Optional[float] = None) -> int:
+    """
+    运行 worker（阻塞直到空闲超时或被中断）
+
+    Args:
+        config: 配置对象
+        worker_id: worker 标识（默认：主机名-进程号）
+        idle_exit: 连续空闲多少秒后退出（None 表示一直运行）
+
+    Returns:
+        int: 成功完成的任务数
+    """
+    worker_id = worker_id or default_worker_id()
+    distributed_config = config.distributed
+    if distributed_config.backend == 'memory':
+        raise ValueError("memory 队列只能在协调者进程内使用，独立 worker 请使用 sqlite 或 redis 后端")
+
+    configure_parse_pool(config.enrich.parse_workers)
+    configure_highlight_cache(config.enrich)
+    configure_identity_index(config.enrich)
+    configure_resilience(config.resilience)
+    configure_memory_governor(config.memory)
+    queue = create_work_queue(distributed_config)
+    print(f"worker {worker_id} 已启动（后端: {distributed_config.backend}，并发: {distributed_config.worker_concurrency}）")
+    completed = 0
+    try:
+        completed = asyncio.run(worker_loop(queue, distributed_config, worker_id, idle_exit))
+    except KeyboardInterrupt:
+        print(f"\nworker {worker_id} 已停止")
+    finally:
+        queue.close()
+        shutdown_parse_pool()
+    print(f"worker {worker_id} 共完成 {completed} 个任务")
+    return completed
+
+
+def _worker_process_entry(config_dict: Dict[str, Any], worker_id: str, idle_exit: float) -> None:
+    """本地 worker 子进程入口（需为模块级函数以便 spawn 方式序列化）"""
+    from config import Config
+    run_worker(Config.from_dict(config_dict), worker_id=worker_id, idle_exit=idle_exit)
+
+
+async def enrich_projects_distributed(projects: List[Dict[str, Any]], config,
+                                      prefer_existing_language: bool = False,
+                                      journal=None, timeout: Optional[float] = None) -> None:
+    """
+    协调者：通过任务队列分发详情获取任务并汇总结果
+
+    Args:
+        projects: 需要获取详情的项目列表
+        config: 配置对象
+        prefer_existing_language: 项目已有语言时是否保留
+        journal: 运行检查点（可选），成功的结果会写入检查点
+        timeout: 数据源剩余的详情获取时间（秒，与 result_timeout 取较小值），超时未完成的项目标记为未获取详情
+    """
+    from tqdm import tqdm
+
+    distributed_config = config.distributed
+    queue = create_work_queue(distributed_config)
+    if distributed_config.retention_days > 0:
+        pruned = await asyncio.to_thread(queue.prune, distributed_config.retention_days * 86400)
+        if pruned:
+            print(f"↻ 已清理 {pruned} 个过期任务")
+
+    # 入队（幂等）：同一天已完成的任务直接复用结果
+    projects_by_job = {}
+    new_jobs = 0
+    for project in projects:
+        job_id = job_id_for(repo_key(project['repo']))
+        projects_by_job.setdefault(job_id, []).append(project)
+        if await asyncio.to_thread(queue.enqueue, job_id, {'repo': project['repo']},
+                                   distributed_config.max_attempts):
+            new_jobs += 1
+    print(f"\n已放入任务队列: {new_jobs} 个新任务，{len(projects_by_job) - new_jobs} 个复用已有任务")
+
+    # 启动本地 worker
+    processes = []
+    stop_event = None
+    local_task = None
+    if distributed_config.backend == 'memory':
+        # memory 队列无法跨进程共享，在当前事件循环内运行 worker
+        stop_event = asyncio.Event()
+        local_task = asyncio.create_task(
+            worker_loop(queue, distributed_config, f"{default_worker_id()}-local", stop_event=stop_event)
+        )
+    elif distributed_config.local_workers > 0:
+        context = multiprocessing.get_context('spawn')
+        for i in range(distributed_config.local_workers):
+            process = context.Process(
+                target=_worker_process_entry,
+                args=(config.to_dict(), f"{default_worker_id()}-local{i}", LOCAL_WORKER_IDLE_EXIT),
+                daemon=True
+            )
+            process.start()
+            processes.append(process)
+        print(f"已启动 {len(processes)} 个本地 worker 进程")
+
+    pbar = tqdm(total=len(projects_by_job), desc="等待 worker 结果", unit="项目", ncols=100, leave=True)
+    finished = {}
+    result_timeout = distributed_config.result_timeout
+    if timeout is not None:
+        result_timeout = min(result_timeout, timeout)
+    deadline = time.monotonic() + result_timeout
+    try:
+        while len(finished) < len(projects_by_job):
+            pending = [job_id for job_id in projects_by_job if job_id not in finished]
+            statuses = await asyncio.to_thread(queue.status, pending)
+            for job_id, status in statuses.items():
+                if status['status'] in (STATUS_DONE, STATUS_FAILED):
+                    finished[job_id] = status
+                    pbar.update(1)
+            if len(finished) >= len(projects_by_job):
+                break
+            if time.monotonic() > deadline:
+                print(f"\n  ⚠ 等待 worker 结果超时，{len(projects_by_job) - len(finished)} 个项目未完成")
+                break
+            await asyncio.sleep(POLL_INTERVAL)
+    finally:
+        pbar.close()
+        if stop_event is not None:
+            stop_event.set()
+            await local_task
+        for process in processes:
+            await asyncio.to_thread(process.join, LOCAL_WORKER_IDLE_EXIT * 2)
+            if process.is_alive():
+                process.terminate()
+        queue.close()
+
+    # 汇总结果
+    failed = 0
+    for job_id, job_projects in projects_by_job.items():
+        status = finished.get(job_id)
+        details = status['result'] if status and status['status'] == STATUS_DONE else None
+        if status is None:
+            # 等待超时仍未完成
+            failed += 1
+            for project in job_projects:
+                mark_unenriched(project, UNENRICHED_DEADLINE, prefer_existing_language)
+            continue
+        if details is None:
+            failed += 1
+            if status and status.get('error'):
+                print(f"  获取 {job_projects[0]['repo']} 详情失败: {status['error']}")
+            details = empty_details()
+        elif journal is not None:
+            await journal.record_details_async(job_projects[0]['repo'], details)
+        for project in job_projects:
+            apply_details(project, details, prefer_existing_language)
+
+    if failed:
+        print(f"  ⚠ {failed} 个项目详情获取失败")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+页面加载对比脚本
+分别以"不拦截"和配置中的拦截策略加载 Zread / GitHub Trending 页面，
+对比加载耗时、请求数和传输字节数
+
+用法:
+    uv run python scripts/browser_benchmark.py [--config config.json] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+# 允许从 scripts/ 目录直接运行
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import load_config
+from pipeline.browser import open_light_page
+
+SOURCES = {
+    'Zread': ('https://zread.ai/trending', 'zread'),
+    'GitHub': ('https://github.com/trending', 'github'),
+}
+
+
+async def measure(url: str, source: str, browser_config):
+    """加载一次页面并返回统计"""
+    async with open_light_page(url, source, browser_config) as (page, metrics):
+        await page.goto(url, wait_until="load", timeout=60000)
+        await page.content()
+    return metrics
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='对比页面加载拦截策略开启前后的效果')
+    parser.add_argument('--config', type=str, default=None, help='配置文件路径')
+    parser.add_argument('--rounds', type=int, default=3, help='每种策略加载次数')
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+
+    print(f"{'数据源':<8}{'策略':<10}{'平均耗时(秒)':>14}{'请求数':>8}{'拦截数':>8}{'传输(KB)':>10}")
+    for source, (url, key) in SOURCES.items():
+        configured = getattr(config, key).browser
+        baseline = replace(configured, block_resources=False, javascript_enabled=True)
+        for label, browser_config in (('不拦截', baseline), ('拦截', configured)):
+            results = [await measure(url, source, browser_config) for _ in range(args.rounds)]
+            count = len(results)
+            print(f"{source:<8}{label:<10}"
+                  f"{sum(m.load_seconds for m in results) / count:>14.2f}"
+                  f"{sum(m.requests for m in results) // count:>8}"
+                  f"{sum(m.blocked for m in results) // count:>8}"
+                  f"{sum(m.bytes for m in results) / count / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+启动导入耗时对比脚本
+用 python -X importtime 在子进程中测量各命令路径的模块导入耗时，列出最耗时的依赖包
+
+用法:
+    uv run python scripts/import_benchmark.py [--rounds 5] [--top 8] [--budget 150]
+
+--budget 为 `import trending_daily` 和 `import zread_trending_daily` 的导入耗时上限（毫秒），
+任一超出时以非零状态退出，可在 CI 中防止重量级依赖重新回到模块顶层导入
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 受 --budget 约束的场景
+BUDGET_SCENARIOS = ('import trending_daily', 'import zread_trending_daily')
+
+# 场景名称 -> 子进程中执行的代码
+SCENARIOS = {
+    'import trending_daily': 'import trending_daily',
+    'trending_daily --help': (
+        "import runpy, sys\n"
+        "sys.argv = ['trending_daily.py', '--help']\n"
+        "try:\n"
+        "    runpy.run_module('trending_daily', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    ),
+    'import zread_trending_daily': 'import zread_trending_daily',
+}
+
+
+def importtime(code):
+    """
+    运行一次并解析 -X importtime 的输出
+
+    Returns:
+        dict: 模块名 -> 自身导入耗时（微秒）
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def measure(code, baseline, rounds):
+    """
+    多次运行取总耗时最少的一次（不计解释器启动本身导入的模块）
+
+    Returns:
+        tuple: (总耗时毫秒, {顶层包名: 自身耗时毫秒})
+    """
+    best = None
+    for _ in range(rounds):
+        modules = {name: us for name, us in importtime(code).items() if name not in baseline}
+        total = sum(modules.values())
+        if best is None or total < best[0]:
+            best = (total, modules)
+    total, modules = best
+    packages = {}
+    for name, us in modules.items():
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + us
+    return total / 1000, {package: us / 1000 for package, us in packages.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='测量各命令路径的模块导入耗时')
+    parser.add_argument('--rounds', type=int, default=5, help='每个场景运行次数（取最快的一次）')
+    parser.add_argument('--top', type=int, default=8, help='列出最耗时的顶层包数量')
+    parser.add_argument('--budget', type=float, default=None,
+                        help='import trending_daily / zread_trending_daily 的耗时上限（毫秒），超出时以非零状态退出')
+    args = parser.parse_args()
+
+    baseline = set(importtime('pass'))
+
+    over_budget = False
+    for name, code in SCENARIOS.items():
+        total_ms, packages = measure(code, baseline, args.rounds)
+        print(f"{name:<32}{total_ms:>10.1f} ms")
+        for package, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"    {package:<28}{ms:>10.1f} ms")
+        if args.budget is not None and name in BUDGET_SCENARIOS and total_ms > args.budget:
+            over_budget = True
+            print(f"✗ 超出导入耗时上限 {args.budget:.0f} ms")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
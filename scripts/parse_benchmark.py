@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Zread 链接解析对比脚本
+用保存的 Zread 页面校验 extract_trending_items() 与改写前的解析逻辑输出一致，并对比耗时
+
+用法:
+    uv run python scripts/parse_benchmark.py --html zread_trending_raw.html [--rounds 50]
+    uv run python scripts/parse_benchmark.py --links links.json
+    uv run python scripts/parse_benchmark.py --synthetic 2000
+
+--html 为保存的整页 HTML（解析失败时生成的 zread_trending_raw.html 即可），
+--links 为页面内提取脚本返回的链接记录（JSON 数组）；不提供时使用随机生成的链接记录
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# 允许从 scripts/ 目录直接运行
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from zread_trending_daily import extract_trending_items, html_to_links
+
+
+def legacy_extract(links):
+    """改写前的解析逻辑（去掉翻译），作为输出一致性的基准"""
+    trending_data = []
+    seen_projects = set()
+
+    for link in links:
+        href = link.get('href', '')
+        if not href or href == '/' or '/trending' in href or href.startswith('http'):
+            continue
+        href_parts = href.strip('/').split('/')
+        if len(href_parts) < 2:
+            continue
+        repo_name = '/'.join(href_parts[:2])
+        if repo_name in seen_projects or repo_name in ['private/repo', 'subscription', 'library']:
+            continue
+
+        link_text = link.get('text', '')
+        lines = [line.strip() for line in link_text.split('\n') if line.strip()]
+        if len(lines) < 1:
+            continue
+
+        first_line = lines[0]
+        description = ''
+        tags = []
+        stars = None
+
+        first_line_parts = first_line.split()
+        repo_found = False
+        desc_start_idx = 0
+        for i, part in enumerate(first_line_parts):
+            if '/' in part and len(part.split('/')) == 2:
+                repo_found = True
+                desc_start_idx = i + 1
+                break
+
+        if repo_found and desc_start_idx < len(first_line_parts):
+            description_parts = first_line_parts[desc_start_idx:]
+            filtered_desc = []
+            for part in description_parts:
+                if 'k' in part.lower() or (part.replace('.', '').replace(',', '').isdigit() and len(part.replace('.', '').replace(',', '')) >= 3):
+                    if not stars:
+                        stars = part
+                    continue
+                filtered_desc.append(part)
+            description = ' '.join(filtered_desc).strip()
+
+        for line in lines[1:]:
+            for part in line.split():
+                if 'k' in part.lower() or (part.replace('.', '').replace(',', '').isdigit() and len(part.replace('.', '').replace(',', '')) >= 3):
+                    if not stars:
+                        stars = part
+                elif len(part) < 25 and not any(c in part for c in ['/', '\\', '.', ':', '(', ')', '，', '。']):
+                    skip_words = ['the', 'a', 'an', 'is', 'are', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'with', 'by']
+                    if part.lower() not in skip_words and part not in tags:
+                        tags.append(part)
+
+        if not description:
+            title = link.get('title') or ''
+            if title:
+                description = title
+
+        if description:
+            cleaned_desc = []
+            for word in description.split():
+                if len(word) < 15 and word not in ['and', 'the', 'a', 'an', 'is', 'are', 'of', 'in', 'on', 'at', 'to', 'for', 'with']:
+                    if any(c in word for c in ['.', ',', ':', ';', '(', ')', '，', '。']):
+                        cleaned_desc.append(word)
+                    elif len(word) > 3:
+                        cleaned_desc.append(word)
+                else:
+                    cleaned_desc.append(word)
+            description = ' '.join(cleaned_desc).strip()
+
+        seen_projects.add(repo_name)
+        trending_data.append({
+            'repo': repo_name,
+            'description': description[:300] if description else '',
+            'tags': tags[:15],
+            'stars': stars,
+            'url': f"https://zread.ai{href}"
+        })
+
+    return trending_data
+
+
+WORDS = ['agent', 'LLM', 'the', 'a', 'framework', 'for', 'building', 'fast', 'Rust', 'Python',
+         'TypeScript', 'AI', 'with', 'tools', '开源', '智能体', '框架', 'v1.2', 'CLI', 'web',
+         'and', 'an', 'of', 'https://example.com', '(beta)', '1.2k', '3,456', '12k', '789']
+
+
+def synthetic_links(count, seed=0):
+    """随机生成形如 Zread 页面的链接记录（含导航链接、重复项目和无文本的链接）"""
+    rng = random.Random(seed)
+    links = [{'href': '/trending', 'text': 'Trending', 'title': ''}, {'href': '/', 'text': 'Zread', 'title': ''}]
+    for i in range(count):
+        repo = f"owner{rng.randrange(count)}/repo{i % 97}"
+        if rng.random() < 0.2:
+            links.append({'href': f"/{repo}", 'text': '', 'title': repo})
+        description = ' '.join(rng.choice(WORDS) for _ in range(rng.randrange(3, 30)))
+        tag_lines = [' '.join(rng.choice(WORDS) for _ in range(rng.randrange(1, 6)))
+                     for _ in range(rng.randrange(0, 4))]
+        links.append({
+            'href': f"/{repo}",
+            'text': '\n'.join([f"{repo} {description}"] + tag_lines),
+            'title': description if rng.random() < 0.3 else ''
+        })
+    return links
+
+
+def measure(func, links, rounds):
+    """多次运行取最快的一次（秒）"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func(links)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='校验并对比 Zread 链接解析的输出和耗时')
+    parser.add_argument('--html', type=str, nargs='*', default=[], help='保存的 Zread 页面 HTML')
+    parser.add_argument('--links', type=str, nargs='*', default=[], help='页面内提取的链接记录（JSON）')
+    parser.add_argument('--synthetic', type=int, default=1000, help='未提供样本时随机生成的链接数')
+    parser.add_argument('--rounds', type=int, default=50, help='每种实现运行次数')
+    args = parser.parse_args()
+
+    fixtures = {}
+    for path in args.html:
+        fixtures[path] = html_to_links(Path(path).read_text(encoding='utf-8'))
+    for path in args.links:
+        fixtures[path] = json.loads(Path(path).read_text(encoding='utf-8'))
+    if not fixtures:
+        fixtures[f"synthetic({args.synthetic})"] = synthetic_links(args.synthetic)
+
+    failed = False
+    print(f"{'样本':<32}{'链接数':>8}{'项目数':>8}{'改写前(ms)':>12}{'改写后(ms)':>12}{'加速':>8}")
+    for name, links in fixtures.items():
+        expected = legacy_extract(links)
+        actual = extract_trending_items(links)
+        if actual != expected:
+            failed = True
+            print(f"✗ {name}: 输出不一致")
+            for old, new in zip(expected, actual):
+                if old != new:
+                    print(f"  改写前: {old}\n  改写后: {new}")
+                    break
+            continue
+        legacy_seconds = measure(legacy_extract, links, args.rounds)
+        new_seconds = measure(extract_trending_items, links, args.rounds)
+        print(f"{name[-32:]:<32}{len(links):>8}{len(actual):>8}"
+              f"{legacy_seconds * 1000:>12.2f}{new_seconds * 1000:>12.2f}"
+              f"{legacy_seconds / new_seconds:>7.1f}x")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
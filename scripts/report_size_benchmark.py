@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+HTML 报告体积对比脚本
+对比 standalone（样式内联）与 compact（共享样式表 + 压缩标记）两种输出方式下每份报告的体积，
+以及 gzip / brotli 压缩后的传输体积，最后汇总整个归档（compact 的共享样式表只计一次）
+
+用法:
+    uv run python scripts/report_size_benchmark.py --reports reports/*.html
+    uv run python scripts/report_size_benchmark.py --synthetic 30 --days 365
+
+--reports 为已生成的 standalone 报告（内联样式替换为样式表引用后压缩，模拟 compact 输出）；
+不提供时用随机生成的项目数据渲染 --days 份报告
+"""
+
+import argparse
+import gzip
+import random
+import re
+import sys
+from pathlib import Path
+
+# 允许从 scripts/ 目录直接运行
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from jinja2 import Environment, FileSystemLoader
+
+from pipeline.html_output import STYLESHEET_TEMPLATE, minify_css, minify_html
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+_INLINE_STYLE = re.compile(r'<style>.*?</style>', re.DOTALL)
+
+WORDS = ['agent', 'LLM', 'framework', 'Rust', 'Python', 'TypeScript', 'AI', 'tools', 'fast',
+         '开源', '智能体', '框架', '高性能', '数据库', '可视化', '命令行', '工作流', '多模态']
+
+
+def compressed_sizes(data: bytes) -> dict:
+    """原始 / gzip / brotli（未安装时为 None）字节数"""
+    sizes = {'raw': len(data), 'gzip': len(gzip.compress(data, compresslevel=9, mtime=0)), 'br': None}
+    try:
+        import brotli
+        sizes['br'] = len(brotli.compress(data, quality=11))
+    except ImportError:
+        pass
+    return sizes
+
+
+def synthetic_projects(count, rng):
+    """随机生成形如获取详情后的项目列表"""
+    projects = []
+    for i in range(count):
+        words = lambda n: ' '.join(rng.choice(WORDS) for _ in range(n))
+        projects.append({
+            'repo': f"owner{rng.randrange(1000)}/repo{i}",
+            'url': f"https://github.com/owner/repo{i}",
+            'intro': words(rng.randrange(10, 40)),
+            'language': rng.choice(['Python', 'Rust', 'TypeScript', 'Go']),
+            'highlights': [words(rng.randrange(5, 15)) for _ in range(rng.randrange(0, 4))],
+            'tags': [rng.choice(WORDS) for _ in range(rng.randrange(0, 6))],
+            'stars': f"{rng.randrange(1, 200)}k",
+            'stars_today': str(rng.randrange(10, 2000)),
+        })
+    return projects
+
+
+def render_pairs(args, env):
+    """生成 (名称, standalone 标记, compact 标记) 样本"""
+    template = env.get_template('report.html.j2')
+    if args.reports:
+        for path in args.reports:
+            html = Path(path).read_text(encoding='utf-8')
+            compact = _INLINE_STYLE.sub('<link rel="stylesheet" href="assets/report.css">', html, count=1)
+            yield Path(path).name, html, minify_html(compact)
+        return
+    rng = random.Random(0)
+    for day in range(args.days):
+        data = {
+            'source': 'GitHub',
+            'generate_time': f"第 {day + 1} 天",
+            'projects': synthetic_projects(args.synthetic, rng),
+        }
+        data['total_projects'] = len(data['projects'])
+        yield (f"synthetic-day{day + 1}", template.render(**data),
+               minify_html(template.render(**data, stylesheet='assets/report.css')))
+
+
+def kb(size):
+    return '-' if size is None else f"{size / 1024:.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='对比 HTML 报告两种输出方式的体积')
+    parser.add_argument('--reports', type=str, nargs='*', default=[], help='已生成的 standalone HTML 报告')
+    parser.add_argument('--synthetic', type=int, default=30, help='未提供报告时每份报告的项目数')
+    parser.add_argument('--days', type=int, default=30, help='未提供报告时生成的报告份数')
+    parser.add_argument('--quiet', action='store_true', help='只输出归档汇总')
+    args = parser.parse_args()
+
+    env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), trim_blocks=True, lstrip_blocks=True)
+    css, _, _ = env.loader.get_source(env, STYLESHEET_TEMPLATE)
+    stylesheet = compressed_sizes(minify_css(css).encode('utf-8'))
+
+    columns = ('raw', 'gzip', 'br')
+    totals = {'standalone': dict.fromkeys(columns, 0), 'compact': dict(stylesheet)}
+    if not args.quiet:
+        print(f"{'报告':<36}{'standalone(KB)':>16}{'gzip':>8}{'br':>8}{'compact(KB)':>14}{'gzip':>8}{'br':>8}")
+    count = 0
+    for name, standalone_html, compact_html in render_pairs(args, env):
+        count += 1
+        rows = {}
+        for mode, html in (('standalone', standalone_html), ('compact', compact_html)):
+            rows[mode] = compressed_sizes(html.encode('utf-8'))
+            for column in columns:
+                if rows[mode][column] is None or totals[mode][column] is None:
+                    totals[mode][column] = None
+                else:
+                    totals[mode][column] += rows[mode][column]
+        if not args.quiet:
+            print(f"{name[-36:]:<36}" + ''.join(
+                f"{kb(rows[mode][column]):>{width}}"
+                for mode, widths in (('standalone', (16, 8, 8)), ('compact', (14, 8, 8)))
+                for column, width in zip(columns, widths)
+            ))
+
+    if not count:
+        print("没有可对比的报告")
+        sys.exit(1)
+    print(f"\n共 {count} 份报告（compact 含共享样式表 {kb(stylesheet['raw'])} KB，只计一次）")
+    for column in columns:
+        before, after = totals['standalone'][column], totals['compact'][column]
+        if before is None or after is None:
+            print(f"  {column:<6} 未安装 brotli，跳过")
+            continue
+        print(f"  {column:<6} {before / 1024:>10.1f} KB -> {after / 1024:>10.1f} KB"
+              f"（减少 {(1 - after / before) * 100:.0f}%）")
+
+
+if __name__ == "__main__":
+    main()
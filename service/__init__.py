@@ -0,0 +1,9 @@
+"""
+服务模式模块
+常驻进程保留预热的浏览器、连接池和缓存，通过本地 HTTP API 按需生成和查询日报
+"""
+
+from .app import ReportService, RunStatus, UnknownSourceError
+from .server import make_server, serve
+
+__all__ = ['ReportService', 'RunStatus', 'UnknownSourceError', 'make_server', 'serve']
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+日报服务
+常驻进程在一个后台事件循环中运行流水线，跨运行保留预热的资源：
+- 常驻浏览器（每次抓取只新建上下文）、请求连接池和熔断器状态、页面解析进程池
+- 亮点缓存、身份索引、翻译结果缓存、跨数据源详情共享注册表
+- 已读取的运行数据和已渲染的报告（按数据文件修改时间失效）
+
+同一数据源的并发请求合并为一次运行（single-flight）：运行进行中时后来的请求等待同一次运行的结果，
+不会重复抓取；不同数据源可以同时运行，并共享同一事件循环中的详情注册表
+
+最近的报告按 stale-while-revalidate 返回：略旧的数据立即返回并在后台刷新，
+只有太旧（超过 service.max_stale）或还没有数据时请求才等待运行完成
+"""
+
+import asyncio
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pipeline.history import RunRecord, open_run_store
+
+# 已渲染报告的内存缓存条目数
+RENDER_CACHE_SIZE = 64
+
+# 报告格式 -> Content-Type
+CONTENT_TYPES = {
+    'json': 'application/json; charset=utf-8',
+    'markdown': 'text/markdown; charset=utf-8',
+    'html': 'text/html; charset=utf-8',
+}
+
+
+# 后台刷新失败后，至少间隔这么久（秒）才会因为请求再次触发
+MIN_REVALIDATE_INTERVAL = 60.0
+
+
+class UnknownSourceError(KeyError):
+    """未知的数据源"""
+
+
+@dataclass
+class ServedReport:
+    """返回给请求的报告及其新鲜度"""
+    body: bytes
+    updated: float  # 数据的新鲜度时间（Unix 时间戳）
+    age: float  # 距今秒数
+    state: str  # fresh / stale / revalidating（已返回陈旧的数据，后台刷新进行中）
+
+
+@dataclass
+class RunStatus:
+    """一个数据源最近一次（或正在进行的）运行"""
+    source: str
+    state: str = 'running'  # running / finished / failed
+    started: float = 0.0  # 开始时间（Unix 时间戳）
+    finished: Optional[float] = None
+    updated: bool = False  # 是否写入了新的运行数据（数据未变化而跳过时为 False）
+    joined: int = 0  # 合并到这次运行的请求数
+    error: str = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['started'] = datetime.fromtimestamp(self.started).isoformat(timespec='seconds')
+        if self.finished is not None:
+            data['finished'] = datetime.fromtimestamp(self.finished).isoformat(timespec='seconds')
+            data['seconds'] = round(self.finished - self.started, 1)
+        return data
+
+
+class ReportService:
+    """日报服务：后台事件循环 + 按数据源合并的运行 + 运行数据和报告的内存缓存"""
+
+    def __init__(self, config, generators: Dict[str, Callable[..., Awaitable[None]]]):
+        """
+        Args:
+            config: 配置对象
+            generators: 数据源名称 -> 日报生成协程函数（接收配置对象）
+        """
+        self.config = config
+        self.generators = generators
+        self.store = open_run_store(config)
+        self.started = time.time()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stopping: Optional[asyncio.Event] = None
+        self._runs: Dict[str, asyncio.Task] = {}
+        self.status: Dict[str, RunStatus] = {}
+        self._checked: Dict[str, float] = {}  # 数据源 -> 最近一次运行完成的时间（数据未变化时也算）
+        self._records: Dict[Tuple[str, str], Tuple[int, RunRecord]] = {}
+        self._rendered: 'OrderedDict[Tuple[str, str, str], Tuple[int, bytes]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._search = None
+        self._env = None
+
+    # ---- 数据源 ----
+
+    def source_name(self, name: str) -> str:
+        """规范的数据源名称（不区分大小写）"""
+        for source in self.generators:
+            if source.lower() == (name or '').lower():
+                return source
+        raise UnknownSourceError(name)
+
+    # ---- 后台事件循环 ----
+
+    def start(self) -> None:
+        """启动后台事件循环并预热资源"""
+        self._thread = threading.Thread(target=self._run_loop, name='report-service', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self) -> None:
+        asyncio.run(self._main())
+
+    async def _main(self) -> None:
+        from contextlib import AsyncExitStack
+        from pipeline.resilience import configure_resilience
+        from pipeline.identity import configure_identity_index
+        from pipeline.highlight_cache import configure_highlight_cache
+
+        self.loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        # 请求连接池和熔断器在整个服务期间复用，每次运行只重置请求预算
+        configure_resilience(self.config.resilience)
+        configure_identity_index(self.config.enrich)
+        configure_highlight_cache(self.config.enrich)
+        async with AsyncExitStack() as stack:
+            if self.config.service.warm_browser and self.config.memory.max_rss_mb:
+                # 设置了内存上限：浏览器在每次抓取完成后立即关闭，不常驻占用内存
+                print("  ℹ 已设置 memory.max_rss_mb，不常驻浏览器")
+            elif self.config.service.warm_browser:
+                from pipeline.browser import warm_browser
+                try:
+                    await stack.enter_async_context(warm_browser())
+                    print("  ✓ 已启动常驻浏览器")
+                except Exception as e:
+                    print(f"  ⚠ 启动常驻浏览器失败，每次抓取时单独启动: {e}")
+            self._ready.set()
+            await self._stopping.wait()
+            for task in self._runs.values():
+                task.cancel()
+            await asyncio.gather(*self._runs.values(), return_exceptions=True)
+
+    def stop(self) -> None:
+        """停止服务：取消进行中的运行，关闭常驻浏览器和进程池"""
+        from notifiers import close_dispatcher
+        from pipeline.extract import shutdown_parse_pool
+
+        if self.loop is not None and self._stopping is not None:
+            self.loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+        if self._search is not None:
+            self._search.close()
+        close_dispatcher()
+        shutdown_parse_pool()
+
+    # ---- 运行 ----
+
+    def _run_config(self):
+        """API 触发的运行使用的配置（按服务配置决定是否发送通知，不使用汇总模式）"""
+        config = copy.deepcopy(self.config)
+        config.notification.enabled = self.config.service.notify
+        config.notification.digest = False
+        return config
+
+    async def _run(self, source: str, status: RunStatus) -> RunStatus:
+        from pipeline.resilience import get_resilience
+
+        date = self.store.latest(source) if self.store else None
+        before = self._data_mtime(source, date)
+        if not any(not task.done() for name, task in self._runs.items() if name != source):
+            # 没有其他数据源在运行时重置全局请求预算（同时运行的数据源共享预算，与命令行一致）
+            get_resilience().reset_budget()
+        config = self._run_config()
+        try:
+            if await self.generators[source](config):
+                status.state = 'finished'
+            else:
+                status.state = 'failed'
+                status.error = '未能生成报告（详见服务日志）'
+            if status.state == 'finished' and config.archive.enabled:
+                from archive import build_site
+                await asyncio.to_thread(build_site, config)
+        except Exception as e:
+            status.state = 'failed'
+            status.error = str(e)
+            print(f"  ⚠ {source} 运行失败: {e}")
+        status.finished = time.time()
+        date = self.store.latest(source) if self.store else None
+        status.updated = self._data_mtime(source, date) not in (None, before)
+        if status.state == 'finished':
+            self._checked[source] = status.finished
+        return status
+
+    async def refresh(self, source: str) -> RunStatus:
+        """
+        运行一个数据源（在服务的事件循环中调用）：已有进行中的运行时等待它的结果，而不是再发起一次
+
+        Returns:
+            RunStatus: 运行结果
+        """
+        task = self._runs.get(source)
+        if task is None or task.done():
+            status = RunStatus(source, started=time.time())
+            self.status[source] = status
+            task = asyncio.get_running_loop().create_task(self._run(source, status))
+            self._runs[source] = task
+        else:
+            self.status[source].joined += 1
+        # shield：等待的请求超时或断开时不取消运行本身
+        return await asyncio.shield(task)
+
+    def trigger(self, source: str, wait: bool = True) -> RunStatus:
+        """
+        从其他线程（HTTP 请求）触发运行
+
+        Args:
+            source: 数据源名称
+            wait: 是否等待运行完成（最多 service.wait_timeout 秒，超时时返回进行中的状态）
+        """
+        source = self.source_name(source)
+        future = asyncio.run_coroutine_threadsafe(self.refresh(source), self.loop)
+        if not wait:
+            # 等运行登记后再返回，保证返回的是这次运行的状态
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self.loop).result()
+            return self.status[source]
+        try:
+            return future.result(timeout=self.config.service.wait_timeout or None)
+        except TimeoutError:
+            return self.status[source]
+
+    def running(self, source: str) -> bool:
+        task = self._runs.get(source)
+        return task is not None and not task.done()
+
+    # ---- 运行数据 ----
+
+    def _data_mtime(self, source: str, date: Optional[str]) -> Optional[int]:
+        if self.store is None or date is None:
+            return None
+        try:
+            return self.store.path(source, date).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def record(self, source: str, date: Optional[str] = None) -> Optional[RunRecord]:
+        """读取运行数据（date 为空时读取最近一次；按文件修改时间缓存）"""
+        if self.store is None:
+            return None
+        date = date or self.store.latest(source)
+        mtime = self._data_mtime(source, date)
+        if mtime is None:
+            return None
+        with self._cache_lock:
+            cached = self._records.get((source, date))
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        record = self.store.load(source, date)
+        if record is not None:
+            with self._cache_lock:
+                self._records[(source, date)] = (mtime, record)
+        return record
+
+    def updated(self, source: str, record: RunRecord) -> float:
+        """
+        数据的新鲜度时间：数据集的生成时间；最近一次的数据还取本服务最近一次成功运行的时间
+        （数据未变化而跳过生成的运行也算作已确认新鲜）
+        """
+        updated = record.timestamp
+        if self.store is not None and record.date == self.store.latest(source):
+            updated = max(updated, self._checked.get(source, 0.0))
+        return updated
+
+    def age(self, source: str, date: Optional[str] = None) -> Optional[float]:
+        """运行数据距今的秒数（没有数据时返回 None）"""
+        record = self.record(source, date)
+        if record is None:
+            return None
+        return max(0.0, time.time() - self.updated(source, record))
+
+    def revalidate(self, source: str) -> bool:
+        """
+        在后台刷新一个数据源（不等待）
+
+        Returns:
+            bool: 是否有刷新在进行（上次刷新刚失败时不立即重试，返回 False）
+        """
+        if self.running(source):
+            return True
+        last = self.status.get(source)
+        if last is not None and last.state == 'failed' and time.time() - last.started < MIN_REVALIDATE_INTERVAL:
+            return False
+        self.trigger(source, wait=False)
+        return True
+
+    def report(self, source: str, date: Optional[str] = None, fmt: str = 'json',
+               max_age: Optional[float] = None, max_stale: Optional[float] = None) -> Optional[ServedReport]:
+        """
+        获取报告内容（stale-while-revalidate）
+
+        最近一次的报告按新鲜度处理：
+        - 不超过 max_age 秒：直接返回
+        - 超过 max_age 但不超过 max_stale 秒：立即返回已有数据，同时在后台刷新
+        - 超过 max_stale 秒或还没有数据：等待一次运行完成后返回
+
+        Args:
+            source: 数据源名称
+            date: 日期（YYYYMMDD，为空时取最近一次）
+            fmt: json / markdown / html
+            max_age: 数据视为新鲜的秒数（0 表示不触发运行，总是直接返回已有数据）
+            max_stale: 可以先返回再刷新的最大秒数（默认同 max_age，即总是等待刷新）
+
+        Returns:
+            Optional[ServedReport]: 报告和新鲜度（没有数据时返回 None）
+        """
+        source = self.source_name(source)
+        state = None
+        if date is None and max_age:
+            age = self.age(source)
+            if age is not None and age > max_age and age <= (max_stale or 0):
+                state = 'revalidating' if self.revalidate(source) else 'stale'
+            elif age is None or age > max_age:
+                self.trigger(source)
+        record = self.record(source, date)
+        if record is None:
+            return None
+        updated = self.updated(source, record)
+        age = max(0.0, time.time() - updated)
+        if state is None:
+            state = 'fresh' if not max_age or age <= max_age else 'stale'
+        if fmt == 'json':
+            body = self._json(record, updated, age, state)
+        else:
+            body = self._render(source, record, fmt)
+        return ServedReport(body, updated, age, state)
+
+    def _json(self, record: RunRecord, updated: float, age: float, state: str) -> bytes:
+        import json
+
+        data = record.to_dict()
+        data['updated'] = datetime.fromtimestamp(updated).isoformat(timespec='seconds')
+        data['age'] = round(age, 1)
+        data['state'] = state
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def _render(self, source: str, record: RunRecord, fmt: str) -> bytes:
+        """用报告模板渲染运行数据（HTML 使用内联样式的独立页面，不依赖报告目录中的样式表文件）"""
+        from jinja2 import Environment, FileSystemLoader
+        from archive.rebuild import FORMATS, TEMPLATES_DIR
+
+        mtime = self._data_mtime(source, record.date)
+        key = (source, record.date, fmt)
+        with self._cache_lock:
+            cached = self._rendered.get(key)
+            if cached is not None and cached[0] == mtime:
+                self._rendered.move_to_end(key)
+                return cached[1]
+        if self._env is None:
+            self._env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), trim_blocks=True, lstrip_blocks=True)
+        content = self._env.get_template(FORMATS[fmt][0]).render(
+            source=record.source,
+            generate_time=record.generate_time,
+            total_projects=len(record.projects),
+            projects=record.projects
+        ).encode('utf-8')
+        with self._cache_lock:
+            self._rendered[key] = (mtime, content)
+            while len(self._rendered) > RENDER_CACHE_SIZE:
+                self._rendered.popitem(last=False)
+        return content
+
+    # ---- 历史 ----
+
+    def history(self, source: Optional[str] = None, since: Optional[str] = None,
+                until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """已保存的运行列表（日期倒序）"""
+        if self.store is None:
+            return []
+        if source:
+            source = self.source_name(source)
+        runs = []
+        for run_source, date, path in reversed(self.store.runs()):
+            if (source and run_source != source) or (since and date < since) or (until and date > until):
+                continue
+            record = self.record(run_source, date)
+            runs.append({
+                'source': run_source,
+                'date': date,
+                'generate_time': record.generate_time if record else '',
+                'total_projects': len(record.projects) if record else 0,
+            })
+        return runs
+
+    def search(self, query: str, **filters) -> List[Dict[str, Any]]:
+        """全文搜索历史上榜项目（索引在服务期间保持打开，每次查询前同步新的运行数据）"""
+        from archive.fulltext import open_search_database
+
+        with self._cache_lock:
+            if self._search is None:
+                self._search = open_search_database(self.config)
+        if self._search is None:
+            return []
+        self._search.sync(self.store)
+        return [asdict(hit) for hit in self._search.search(query, **filters)]
+
+    def summary(self) -> Dict[str, Any]:
+        """服务状态：各数据源的最近数据和运行"""
+        sources = {}
+        for source in self.generators:
+            age = self.age(source)
+            sources[source] = {
+                'latest': self.store.latest(source) if self.store else None,
+                'age': round(age, 1) if age is not None else None,
+                'running': self.running(source),
+                'last_run': self.status[source].to_dict() if source in self.status else None,
+            }
+        return {'uptime': round(time.time() - self.started, 1), 'sources': sources}
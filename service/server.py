@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+本地 HTTP API（标准库 http.server，每个请求一个线程，流水线在服务的后台事件循环中运行）
+
+    GET  /health                              服务状态、各数据源的最近数据和运行
+    POST /runs/<source>[?wait=0]              触发一次运行（进行中时合并到同一次运行）
+    GET  /runs/<source>                       最近一次运行的状态
+    GET  /reports/<source>[/<date>]           报告：?format=json|markdown|html，
+                                              ?max_age=秒 数据视为新鲜的时间（默认 service.fresh_for），
+                                              ?max_stale=秒 先返回再后台刷新的最大陈旧程度（默认 service.max_stale）
+    GET  /history[?source=&since=&until=]     已保存的运行列表
+    GET  /search?q=...[&source=&days=&since=&until=&language=&limit=]   历史全文搜索
+
+报告响应带有新鲜度：Last-Modified（数据时间）、Age（秒）、X-Data-State（fresh / stale / revalidating），
+JSON 报告中同样包含 updated、age、state 字段
+"""
+
+import json
+from datetime import datetime, timedelta
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from .app import CONTENT_TYPES, ReportService, UnknownSourceError
+
+
+class ApiError(Exception):
+    """请求错误（以对应的 HTTP 状态码返回）"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _date_param(value: Optional[str]) -> Optional[str]:
+    """YYYY-MM-DD 或 YYYYMMDD -> YYYYMMDD"""
+    if not value:
+        return None
+    text = value.replace('-', '')
+    try:
+        datetime.strptime(text, '%Y%m%d')
+    except ValueError:
+        raise ApiError(400, f"无效的日期: {value}（格式: YYYY-MM-DD）")
+    return text
+
+
+def _number_param(params: Dict[str, str], name: str, kind=float) -> Optional[Any]:
+    if name not in params:
+        return None
+    try:
+        return kind(params[name])
+    except ValueError:
+        raise ApiError(400, f"无效的参数 {name}: {params[name]}")
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """把请求路由到 ReportService"""
+
+    server_version = 'TrendingDaily'
+    service: ReportService = None  # 由 make_server 绑定
+
+    def log_message(self, format, *args):
+        print(f"  ℹ {self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: bytes, content_type: str = CONTENT_TYPES['json'],
+              headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Any) -> None:
+        self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            self._route(method, parts, params)
+        except ApiError as e:
+            self._send_json(e.status, {'error': str(e)})
+        except UnknownSourceError as e:
+            self._send_json(404, {'error': f"未知的数据源: {e.args[0]}（可选: {', '.join(self.service.generators)}）"})
+        except Exception as e:
+            print(f"  ⚠ 处理请求 {self.path} 失败: {e}")
+            self._send_json(500, {'error': str(e)})
+
+    def _route(self, method: str, parts, params: Dict[str, str]) -> None:
+        service = self.service
+        if parts == ['health'] and method == 'GET':
+            self._send_json(200, {'status': 'ok', **service.summary()})
+        elif len(parts) == 2 and parts[0] == 'runs':
+            if method == 'POST':
+                status = service.trigger(parts[1], wait=params.get('wait', '1') != '0')
+                self._send_json(200 if status.state != 'running' else 202, status.to_dict())
+            else:
+                source = service.source_name(parts[1])
+                if source not in service.status:
+                    raise ApiError(404, f"{source} 在本次服务期间还没有运行过")
+                self._send_json(200, service.status[source].to_dict())
+        elif parts and parts[0] == 'reports' and len(parts) in (2, 3) and method == 'GET':
+            fmt = params.get('format', 'json')
+            if fmt not in CONTENT_TYPES:
+                raise ApiError(400, f"无效的格式: {fmt}（可选: {', '.join(CONTENT_TYPES)}）")
+            date = _date_param(parts[2]) if len(parts) == 3 and parts[2] != 'latest' else None
+            max_age = _number_param(params, 'max_age')
+            max_stale = _number_param(params, 'max_stale')
+            served = service.report(
+                parts[1], date, fmt,
+                max_age=service.config.service.fresh_for if max_age is None else max_age,
+                max_stale=service.config.service.max_stale if max_stale is None else max_stale
+            )
+            if served is None:
+                raise ApiError(404, f"没有 {parts[1]} {date or '最近'} 的运行数据")
+            self._send(200, served.body, CONTENT_TYPES[fmt], {
+                'Last-Modified': formatdate(served.updated, usegmt=True),
+                'Age': str(int(served.age)),
+                'X-Data-State': served.state,
+            })
+        elif parts == ['history'] and method == 'GET':
+            self._send_json(200, service.history(
+                params.get('source'), _date_param(params.get('since')), _date_param(params.get('until'))
+            ))
+        elif parts == ['search'] and method == 'GET':
+            if not params.get('q'):
+                raise ApiError(400, '缺少查询参数 q')
+            since = _date_param(params.get('since'))
+            days = _number_param(params, 'days', int)
+            if days:
+                recent = (datetime.now() - timedelta(days=days)).strftime('%Y%m%d')
+                since = max(since, recent) if since else recent
+            self._send_json(200, service.search(
+                params['q'], source=params.get('source'), since=since, until=_date_param(params.get('until')),
+                language=params.get('language'), limit=_number_param(params, 'limit', int) or 20
+            ))
+        else:
+            raise ApiError(404 if method == 'GET' else 405, f"不支持的请求: {method} {self.path}")
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_HEAD(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+
+def make_server(service: ReportService, host: str, port: int) -> ThreadingHTTPServer:
+    """创建绑定到服务的 HTTP 服务器"""
+    handler = type('BoundApiHandler', (ApiHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(config, generators) -> None:
+    """
+    启动服务模式（阻塞直到 Ctrl+C）
+
+    Args:
+        config: 配置对象
+        generators: 数据源名称 -> 日报生成协程函数
+    """
+    service_config = config.service
+    if not config.history.enabled:
+        print("  ⚠ 未启用运行数据（history.enabled），服务只能触发运行，无法返回报告")
+    service = ReportService(config, generators)
+    service.start()
+    server = make_server(service, service_config.host, service_config.port)
+    print(f"\n日报服务已启动: http://{service_config.host}:{service_config.port}")
+    print(f"  数据源: {', '.join(generators)}")
+    if service_config.fresh_for:
+        print(f"  报告超过 {service_config.fresh_for:g} 秒时请求会触发一次运行（同一数据源的并发请求合并）；"
+              f"{service_config.max_stale:g} 秒以内的报告先返回再在后台刷新")
+    print("按 Ctrl+C 停止")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        print("日报服务已停止")
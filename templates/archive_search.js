@@ -0,0 +1,182 @@
+// 归档站点的客户端搜索：加载预先构建的倒排索引（archive/search_index.py），在浏览器中直接查询
+(function () {
+    var script = document.currentScript;
+    var input = document.getElementById('q');
+    var sourceSelect = document.getElementById('source');
+    var status = document.getElementById('status');
+    var results = document.getElementById('results');
+    var index = null;
+    var MAX_RESULTS = 50;
+
+    // 与 archive/search_index.py 的 tokenize() 保持一致
+    function tokenize(text) {
+        var tokens = [];
+        var words = (text || '').toLowerCase().match(/[0-9a-z]+|[\u4e00-\u9fff]+/g) || [];
+        words.forEach(function (word) {
+            if (/[\u4e00-\u9fff]/.test(word[0])) {
+                if (word.length === 1) {
+                    tokens.push(word);
+                }
+                for (var i = 0; i + 1 < word.length; i++) {
+                    tokens.push(word.substr(i, 2));
+                }
+            } else {
+                tokens.push(word);
+            }
+        });
+        return tokens;
+    }
+
+    // 与 archive/search_index.py 的 query_clauses() 保持一致：各条件取交集，条件内的词取并集
+    function queryClauses(text) {
+        var clauses = [];
+        var words = (text || '').toLowerCase().match(/[0-9a-z]+|[\u4e00-\u9fff]+/g) || [];
+        words.forEach(function (word) {
+            if (/[\u4e00-\u9fff]/.test(word[0]) && word.length > 2) {
+                var pairs = [];
+                for (var i = 0; i + 1 < word.length; i++) {
+                    pairs.push(word.substr(i, 2));
+                }
+                clauses.push([pairs[0]]);
+                for (var j = 2; j < word.length - 2; j++) {
+                    clauses.push([pairs[j - 1], pairs[j]]);
+                }
+                clauses.push([pairs[pairs.length - 1]]);
+            } else {
+                tokenize(word).forEach(function (token) { clauses.push([token]); });
+            }
+        });
+        return clauses;
+    }
+
+    function decode(deltas) {
+        var ids = [], current = 0;
+        for (var i = 0; i < deltas.length; i++) {
+            current += deltas[i];
+            ids.push(current);
+        }
+        return ids;
+    }
+
+    // terms 升序，二分查找第一个不小于 token 的位置
+    function lowerBound(token) {
+        var terms = index.terms, lo = 0, hi = terms.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (terms[mid] < token) { lo = mid + 1; } else { hi = mid; }
+        }
+        return lo;
+    }
+
+    function matchExact(token) {
+        var i = lowerBound(token);
+        return new Set(index.terms[i] === token ? decode(index.postings[i]) : []);
+    }
+
+    function matchPrefix(prefix) {
+        var terms = index.terms, ids = new Set();
+        for (var i = lowerBound(prefix); i < terms.length && terms[i].lastIndexOf(prefix, 0) === 0; i++) {
+            decode(index.postings[i]).forEach(function (id) { ids.add(id); });
+        }
+        return ids;
+    }
+
+    function search(query, source) {
+        var clauses = queryClauses(query);
+        if (!clauses.length) {
+            return [];
+        }
+        var matched = null;
+        clauses.forEach(function (clause, i) {
+            // 最后一个条件按前缀匹配，方便边输入边搜索
+            var ids = new Set();
+            clause.forEach(function (token) {
+                var found = i === clauses.length - 1 ? matchPrefix(token) : matchExact(token);
+                found.forEach(function (id) { ids.add(id); });
+            });
+            matched = matched === null ? ids : new Set(Array.from(matched).filter(function (id) { return ids.has(id); }));
+        });
+        var sourceId = source ? index.sources.indexOf(source) : -1;
+        return Array.from(matched).sort(function (a, b) { return a - b; }).map(function (id) {
+            return index.docs[id];
+        }).filter(function (doc) {
+            return sourceId < 0 || doc[5].some(function (seen) { return seen[0] === sourceId; });
+        });
+    }
+
+    // 结果只通过 textContent / setAttribute 写入，抓取到的文本和链接不会被当作 HTML 解析
+    function element(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) {
+            node.className = className;
+        }
+        if (text) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    // 项目链接只允许 http(s)，避免 javascript: 等协议
+    function safeUrl(url) {
+        return /^https?:\/\//i.test(url || '') ? url : '#';
+    }
+
+    function formatDate(date) {
+        return date.substr(0, 4) + '-' + date.substr(4, 2) + '-' + date.substr(6, 2);
+    }
+
+    function render() {
+        if (!index) {
+            return;
+        }
+        var query = input.value.trim();
+        if (!query) {
+            results.innerHTML = '';
+            status.textContent = '共 ' + index.docs.length + ' 个项目，输入关键词开始搜索';
+            return;
+        }
+        var found = search(query, sourceSelect.value);
+        status.textContent = '找到 ' + found.length + ' 个项目' + (found.length > MAX_RESULTS ? '，显示最近上榜的 ' + MAX_RESULTS + ' 个' : '');
+        results.textContent = '';
+        found.slice(0, MAX_RESULTS).forEach(function (doc) {
+            var seen = doc[5];
+            var last = seen[seen.length - 1];
+            var source = index.sources[last[0]];
+            var result = element('div', 'result');
+
+            var link = element('a');
+            link.setAttribute('href', safeUrl(doc[1]));
+            link.setAttribute('target', '_blank');
+            link.appendChild(element('strong', '', doc[0]));
+            result.appendChild(link);
+            result.appendChild(document.createTextNode(' '));
+            if (doc[2]) {
+                result.appendChild(element('span', 'language-badge', doc[2]));
+            }
+            result.appendChild(element('p', '', doc[3]));
+
+            var tags = element('div', 'tags');
+            doc[4].forEach(function (tag) { tags.appendChild(element('span', 'tag', tag)); });
+            result.appendChild(tags);
+
+            var seenLine = element('div', 'seen', '上榜 ' + seen.length + ' 次，最近 ');
+            var page = element('a', '', formatDate(last[1]) + '（' + source + ' 第 ' + last[2] + ' 名）');
+            page.setAttribute('href', 'days/' + encodeURIComponent(source.toLowerCase()) + '-' + last[1] + '.html');
+            seenLine.appendChild(page);
+            result.appendChild(seenLine);
+
+            results.appendChild(result);
+        });
+    }
+
+    fetch(script.getAttribute('data-index')).then(function (response) {
+        return response.json();
+    }).then(function (data) {
+        index = data;
+        render();
+    }).catch(function (error) {
+        status.textContent = '索引加载失败: ' + error;
+    });
+    input.addEventListener('input', render);
+    sourceSelect.addEventListener('change', render);
+})();
@@ -0,0 +1,112 @@
+"""运行检查点的恢复规则测试"""
+
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from pipeline.checkpoint import RunJournal
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+class RunJournalOpenTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'checkpoints' / 'github.jsonl'
+
+    def write_journal(self, started, items=True, details=None, complete=False, partial_line=False):
+        records = [{'type': 'start', 'time': started.isoformat() if isinstance(started, datetime) else started}]
+        if items:
+            records.append({'type': 'list', 'items': [{'repo': 'a/b'}, {'repo': 'c/d'}]})
+        for repo, value in (details or {}).items():
+            records.append({'type': 'details', 'repo': repo, 'details': value})
+        if complete:
+            records.append({'type': 'complete', 'time': started.isoformat()})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        text = ''.join(json.dumps(record) + '\n' for record in records)
+        if partial_line:
+            text += '{"type": "details", "repo": "c/d", "det'
+        self.path.write_text(text, encoding='utf-8')
+
+    def open(self, resume=True, resume_within=0.0):
+        return RunJournal.open(self.path, resume=resume, resume_within=resume_within, now=NOW)
+
+    def assert_fresh(self, journal):
+        self.assertIsNone(journal.trending)
+        self.assertEqual(journal.details, {})
+        lines = self.path.read_text(encoding='utf-8').splitlines()
+        self.assertEqual([json.loads(line)['type'] for line in lines], ['start'])
+
+    def test_resumes_unfinished_run_from_today(self):
+        self.write_journal(NOW - timedelta(hours=3), details={'a/b': {'stars': 1}}, partial_line=True)
+        journal, reason = self.open()
+        self.assertIsNone(reason)
+        self.assertEqual(len(journal.trending), 2)
+        # 中断时写了一半的最后一行被忽略
+        self.assertEqual(journal.details, {'a/b': {'stars': 1}})
+
+    def test_without_resume_starts_fresh(self):
+        self.write_journal(NOW - timedelta(hours=1))
+        journal, reason = self.open(resume=False)
+        self.assertIsNone(reason)
+        self.assert_fresh(journal)
+
+    def test_rejects_completed_run(self):
+        self.write_journal(NOW - timedelta(hours=1), complete=True)
+        journal, reason = self.open()
+        self.assertEqual(reason, '上次运行已完成')
+        self.assert_fresh(journal)
+
+    def test_rejects_run_without_list(self):
+        self.write_journal(NOW - timedelta(hours=1), items=False)
+        journal, reason = self.open()
+        self.assertEqual(reason, '没有已解析的列表')
+        self.assert_fresh(journal)
+
+    def test_rejects_bad_start_time(self):
+        self.write_journal('yesterday')
+        journal, reason = self.open()
+        self.assertEqual(reason, '缺少开始时间')
+        self.assert_fresh(journal)
+
+    def test_rejects_run_from_previous_day(self):
+        self.write_journal(NOW.replace(hour=0) - timedelta(minutes=5))
+        journal, reason = self.open()
+        self.assertIn('不是当天的运行', reason)
+        self.assert_fresh(journal)
+
+    def test_resume_within_window(self):
+        # 跨过午夜但在窗口内的运行可以恢复，超出窗口的不行
+        self.write_journal(NOW - timedelta(hours=13))
+        journal, reason = self.open(resume_within=14 * 3600)
+        self.assertIsNone(reason)
+        self.assertEqual(len(journal.trending), 2)
+
+        self.write_journal(NOW - timedelta(hours=1, seconds=1))
+        journal, reason = self.open(resume_within=3600)
+        self.assertIn('超过 3600 秒', reason)
+        self.assert_fresh(journal)
+
+    def test_missing_journal_starts_fresh(self):
+        journal, reason = self.open()
+        self.assertIsNone(reason)
+        self.assert_fresh(journal)
+
+    def test_recorded_entries_survive_reopen(self):
+        journal, _ = RunJournal.open(self.path)
+        journal.record_list([{'repo': 'a/b'}])
+        journal.record_details('a/b', {'stars': 2})
+        reopened, reason = RunJournal.open(self.path, resume=True)
+        self.assertIsNone(reason)
+        self.assertEqual((reopened.trending, reopened.details), ([{'repo': 'a/b'}], {'a/b': {'stars': 2}}))
+
+        reopened.mark_complete()
+        _, reason = RunJournal.open(self.path, resume=True)
+        self.assertEqual(reason, '上次运行已完成')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""数据集指纹测试：数据未变化的判断和通知送达状态"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from pipeline.fingerprint import FingerprintStore, dataset_fingerprint
+
+PROJECTS = [{'repo': 'a/b', 'description': 'Agent framework', 'tags': ['AI']},
+            {'repo': 'c/d', 'description': 'Vector DB', 'tags': []}]
+
+
+class DatasetFingerprintTest(unittest.TestCase):
+    def test_ignores_key_order_and_whitespace(self):
+        reordered = [{'tags': [' AI'], 'description': 'Agent framework ', 'repo': 'a/b'}, PROJECTS[1]]
+        self.assertEqual(dataset_fingerprint(PROJECTS), dataset_fingerprint(reordered))
+
+    def test_rank_and_content_change_fingerprint(self):
+        self.assertNotEqual(dataset_fingerprint(PROJECTS), dataset_fingerprint(PROJECTS[::-1]))
+        changed = [dict(PROJECTS[0], description='Agent toolkit'), PROJECTS[1]]
+        self.assertNotEqual(dataset_fingerprint(PROJECTS), dataset_fingerprint(changed))
+
+
+class FingerprintStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.path = self.dir / '.fingerprints.json'
+        self.report = self.dir / 'github_trending_report.md'
+        self.report.write_text('# report', encoding='utf-8')
+        self.fingerprint = dataset_fingerprint(PROJECTS)
+
+    def store(self):
+        return FingerprintStore(self.path)
+
+    def test_unchanged_requires_same_fingerprint_and_existing_outputs(self):
+        self.store().record('GitHub', self.fingerprint, [self.report])
+        store = self.store()
+        self.assertTrue(store.unchanged('GitHub', self.fingerprint, [self.report]))
+        self.assertFalse(store.unchanged('GitHub', 'other', [self.report]))
+        self.assertFalse(store.unchanged('Zread', self.fingerprint, [self.report]))
+        # 新增的报告格式还没有生成过
+        self.assertFalse(store.unchanged('GitHub', self.fingerprint, [self.report, self.dir / 'report.html']))
+        self.report.unlink()
+        self.assertFalse(store.unchanged('GitHub', self.fingerprint, [self.report]))
+
+    def test_without_notifications_record_is_notified(self):
+        self.assertIsNone(self.store().record('GitHub', self.fingerprint, [self.report]))
+        self.assertTrue(self.store().unchanged('GitHub', self.fingerprint, [self.report], require_notified=True))
+
+    def test_pending_notification_is_not_unchanged_until_all_routes_deliver(self):
+        delivered = self.store().record('GitHub', self.fingerprint, [self.report], notifications=2)
+        store = self.store()
+        self.assertTrue(store.unchanged('GitHub', self.fingerprint, [self.report]))
+        self.assertFalse(store.unchanged('GitHub', self.fingerprint, [self.report], require_notified=True))
+
+        delivered()
+        self.assertFalse(self.store().unchanged('GitHub', self.fingerprint, [self.report], require_notified=True))
+        delivered()
+        self.assertTrue(self.store().unchanged('GitHub', self.fingerprint, [self.report], require_notified=True))
+
+    def test_mark_notified_ignores_superseded_fingerprint(self):
+        delivered = self.store().record('GitHub', self.fingerprint, [self.report], notifications=1)
+        # 通知送达前已有新的运行写入了新指纹
+        self.store().record('GitHub', 'newer', [self.report], notifications=1)
+        delivered()
+        self.assertFalse(self.store().unchanged('GitHub', 'newer', [self.report], require_notified=True))
+        self.assertFalse(self.store().unchanged('GitHub', self.fingerprint, [self.report]))
+
+    def test_record_keeps_other_sources(self):
+        first, second = self.store(), self.store()
+        first.record('GitHub', self.fingerprint, [self.report])
+        second.record('Zread', 'zread', [self.report])
+        store = self.store()
+        self.assertTrue(store.unchanged('GitHub', self.fingerprint, [self.report]))
+        self.assertTrue(store.unchanged('Zread', 'zread', [self.report]))
+
+    def test_corrupt_file_counts_as_changed(self):
+        self.path.write_text('{not json', encoding='utf-8')
+        self.assertFalse(self.store().unchanged('GitHub', self.fingerprint, [self.report]))
+
+
+if __name__ == '__main__':
+    unittest.main()
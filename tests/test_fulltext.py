@@ -0,0 +1,61 @@
+"""历史全文搜索的查询转换和中文检索测试"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from archive.fulltext import SearchDatabase, build_match_query
+from archive.search_index import query_clauses
+
+
+class QueryClausesTest(unittest.TestCase):
+    def test_chinese_run_does_not_require_pairs_across_word_gaps(self):
+        self.assertEqual(query_clauses('智能体框架'), [['智能'], ['能体', '体框'], ['框架']])
+
+    def test_short_chinese_and_english(self):
+        self.assertEqual(query_clauses('AI智能体'), [['ai'], ['智能'], ['能体']])
+        self.assertEqual(query_clauses('智'), [['智']])
+        self.assertEqual(query_clauses('Owner/Repo'), [['owner'], ['repo']])
+
+
+class BuildMatchQueryTest(unittest.TestCase):
+    def test_chinese_term(self):
+        self.assertEqual(build_match_query('智能体框架'), '("智能" AND ("能体" OR "体框") AND "框架")')
+
+    def test_prefix_and_groups(self):
+        self.assertEqual(build_match_query('agent* OR 智'), '("agent"*) OR ("智"*)')
+        self.assertIsNone(build_match_query('  ,, '))
+
+
+class SearchDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db = SearchDatabase(str(Path(tmp.name) / 'search.db'))
+        self.addCleanup(self.db.close)
+        self.db.index_run('GitHub', '20261018', [
+            {'repo': 'a/agents', 'intro': '智能体开发框架', 'language': 'Python'},
+            {'repo': 'b/other', 'intro': '向量数据库', 'highlights': ['支持 RAG 检索']},
+        ])
+        self.db.index_run('Zread', '20261019', [{'repo': 'A/Agents', 'intro': '多智能体框架'}])
+
+    def repos(self, query, **filters):
+        return [hit.repo for hit in self.db.search(query, **filters)]
+
+    def test_chinese_query_spanning_word_gap(self):
+        hits = self.db.search('智能体框架')
+        self.assertEqual([hit.repo for hit in hits], ['A/Agents'])
+        # 同一项目不同大小写的记录合并，上榜记录按日期倒序
+        self.assertEqual(hits[0].appearances, [('Zread', '20261019', 1), ('GitHub', '20261018', 1)])
+
+    def test_mixed_chinese_english_and_filters(self):
+        self.assertEqual(self.repos('rag 检索'), ['b/other'])
+        self.assertEqual(sorted(self.repos('智能体 OR 向量')), ['A/Agents', 'b/other'])
+        self.assertEqual(self.repos('智能体', source='GitHub'), ['a/agents'])
+        self.assertEqual(self.repos('智能体', since='20261019'), ['A/Agents'])
+        self.assertEqual(self.repos('框架', language='python'), ['a/agents'])
+        self.assertEqual(self.repos('数据框架'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
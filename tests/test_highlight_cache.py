@@ -0,0 +1,72 @@
+"""README 亮点缓存测试：翻译失败的亮点不写入缓存"""
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import zread_trending_daily
+from pipeline.highlight_cache import HighlightCache
+
+PARSED = {
+    'description': 'A fast agent framework',
+    'highlights': ['Fast startup', 'Small footprint'],
+    'language': 'Python',
+    'readme_hash': 'h1',
+}
+
+
+class HighlightCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = HighlightCache(str(Path(tmp.name) / 'highlights.db'))
+        self.addCleanup(self.cache.close)
+
+    def test_put_get_and_link(self):
+        self.assertIsNone(self.cache.get('h1'))
+        self.cache.put('h1', ['快速启动'], 'a/b')
+        self.assertEqual(self.cache.get('h1'), ['快速启动'])
+        self.assertEqual(self.cache.readme_hash_for('a/b'), 'h1')
+        self.assertIsNone(self.cache.readme_hash_for('c/d'))
+        self.cache.link('c/d', 'h1')
+        self.assertEqual(self.cache.readme_hash_for('c/d'), 'h1')
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def fetch(self, translate):
+        """用模拟的页面和翻译获取一次项目详情"""
+        response = mock.Mock(url='https://github.com/a/b')
+        resilience = mock.Mock()
+        resilience.get.return_value = response
+        with mock.patch.object(zread_trending_daily, 'get_resilience', return_value=resilience), \
+                mock.patch.object(zread_trending_daily, 'read_limited', return_value=b'<html></html>'), \
+                mock.patch.object(zread_trending_daily, 'get_identity_index', return_value=None), \
+                mock.patch.object(zread_trending_daily, 'get_highlight_cache', return_value=self.cache), \
+                mock.patch.object(zread_trending_daily, 'translate_to_chinese', side_effect=lambda text: text), \
+                mock.patch.object(zread_trending_daily, 'try_translate', side_effect=translate) as try_translate, \
+                mock.patch('pipeline.extract.parse_project_page', mock.AsyncMock(return_value=dict(PARSED))):
+            details = asyncio.run(zread_trending_daily.fetch_project_details('a/b', asyncio.Semaphore(1)))
+        return details, try_translate
+
+    def test_failed_translation_is_not_cached(self):
+        translations = {'Fast startup': '快速启动', 'Small footprint': None}
+        details, _ = self.fetch(translations.get)
+        # 报告中使用原文，但缓存中没有该 README
+        self.assertEqual(details['highlights'], ['快速启动', 'Small footprint'])
+        self.assertIsNone(self.cache.get('h1'))
+        self.assertIsNone(self.cache.readme_hash_for('a/b'))
+
+        # 下次运行翻译成功后写入缓存，之后的运行直接复用
+        translations['Small footprint'] = '占用小'
+        details, _ = self.fetch(translations.get)
+        self.assertEqual(details['highlights'], ['快速启动', '占用小'])
+        self.assertEqual(self.cache.get('h1'), ['快速启动', '占用小'])
+
+        details, try_translate = self.fetch(translations.get)
+        self.assertEqual(details['highlights'], ['快速启动', '占用小'])
+        try_translate.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
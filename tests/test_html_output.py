@@ -0,0 +1,53 @@
+"""HTML 报告压缩测试"""
+
+import unittest
+
+from pipeline.html_output import minify_css, minify_html
+
+
+class MinifyHtmlTest(unittest.TestCase):
+    def test_removes_indentation_comments_and_collapses_whitespace(self):
+        html = """
+        <ul>
+            <!-- 项目列表 -->
+            <li>a   b</li>
+            <li><strong>x</strong> <em>y</em></li>
+        </ul>
+        """
+        self.assertEqual(minify_html(html), '<ul><li>a b</li><li><strong>x</strong> <em>y</em></li></ul>')
+
+    def test_keeps_conditional_comments(self):
+        self.assertEqual(minify_html('<!--[if IE]><p>old</p><![endif]-->'), '<!--[if IE]><p>old</p><![endif]-->')
+
+    def test_preserves_pre_and_script_content(self):
+        pre = '<pre class="code">\n  def f():\n      return 1  # <!-- not a comment -->\n</pre>'
+        script = '<script>\n  if (a  <  b) {\n    x = "  two  spaces  ";\n  }\n</script>'
+        html = f"<div>\n  {pre}\n  <p>  text  </p>\n  {script}\n</div>"
+        minified = minify_html(html)
+        self.assertIn(pre, minified)
+        self.assertIn(script, minified)
+        self.assertEqual(minified, f"<div>{pre}<p> text </p>{script}</div>")
+
+    def test_preserves_textarea_and_style_case_insensitive(self):
+        html = '<TEXTAREA>\n line 1\n\n line 2\n</TEXTAREA>\n<style>\n  a  { color: red }\n</Style >'
+        self.assertEqual(minify_html(html), html.replace('</TEXTAREA>\n<style>', '</TEXTAREA><style>'))
+
+    def test_similar_tag_names_are_not_preserved(self):
+        self.assertEqual(minify_html('<preview>\n  a   b\n</preview>'), '<preview> a b </preview>')
+
+
+class MinifyCssTest(unittest.TestCase):
+    def test_minify_css(self):
+        css = """
+        /* 卡片 */
+        .card > h3 ,
+        .card p {
+            color : #333 ;
+            margin: 0 auto;
+        }
+        """
+        self.assertEqual(minify_css(css), '.card>h3,.card p{color:#333;margin:0 auto}')
+
+
+if __name__ == '__main__':
+    unittest.main()
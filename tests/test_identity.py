@@ -0,0 +1,88 @@
+"""仓库身份索引测试：规范化、改名别名的路径压缩和 fork 网络"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from pipeline.identity import RepoIdentityIndex, normalise_repo, repo_path
+
+
+class NormaliseRepoTest(unittest.TestCase):
+    def test_normalise(self):
+        for value in ('Owner/Repo', 'https://github.com/Owner/Repo.git', 'github.com/owner/repo/tree/main',
+                      'https://www.github.com/Owner/Repo?tab=readme#top', '/owner/repo/'):
+            with self.subTest(value=value):
+                self.assertEqual(normalise_repo(value), 'owner/repo')
+        self.assertEqual(repo_path('https://github.com/Owner/Repo/issues'), 'Owner/Repo')
+        self.assertIsNone(normalise_repo('owner'))
+        self.assertIsNone(normalise_repo(''))
+
+
+class RepoIdentityIndexTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'identity.db'
+        self.index = self.open()
+
+    def open(self):
+        index = RepoIdentityIndex(str(self.path))
+        self.addCleanup(index.close)
+        return index
+
+    def test_rename_chain_is_path_compressed(self):
+        self.assertTrue(self.index.record('old/a', 'Mid/B'))
+        self.assertTrue(self.index.record('mid/b', 'New/C'))
+        # a -> b、b -> c 之后 a 直接指向 c，查询只需一次查找
+        self.assertEqual(self.index._aliases, {'old/a': 'new/c', 'mid/b': 'new/c'})
+        for name in ('old/a', 'OLD/A', 'mid/b', 'new/c'):
+            self.assertEqual(self.index.key(name), 'new/c')
+        self.assertEqual(self.index.name('old/a'), 'New/C')
+        self.assertEqual(self.index.url('old/a'), 'https://github.com/New/C')
+        # 旧的规范记录已删除
+        self.assertEqual(set(self.index._repos), {'new/c'})
+
+        # 重新打开后从磁盘读到相同的结果
+        reopened = self.open()
+        self.assertEqual(reopened._aliases, self.index._aliases)
+        self.assertEqual(reopened.key('old/a'), 'new/c')
+
+    def test_changes_since_reports_compressed_aliases(self):
+        self.index.record('old/a', 'mid/b')
+        seq = self.index.seq
+        self.index.record('mid/b', 'new/c')
+        self.assertGreater(self.index.seq, seq)
+        self.assertEqual(sorted(self.index.changes_since(seq)), [('mid/b', 'new/c'), ('old/a', 'new/c')])
+        self.assertEqual(self.index.changes_since(self.index.seq), [])
+
+    def test_rename_back_removes_alias(self):
+        self.index.record('x/a', 'x/b')
+        self.index.record('x/b', 'x/a')
+        self.assertEqual(self.index._aliases, {'x/b': 'x/a'})
+        self.assertEqual(self.index.key('x/a'), 'x/a')
+        self.assertEqual(self.index.key('x/b'), 'x/a')
+
+    def test_unchanged_record_does_not_write(self):
+        self.assertTrue(self.index.record('Owner/Repo', 'Owner/Repo'))
+        self.assertFalse(self.index.record('owner/repo', 'Owner/Repo'))
+        self.assertFalse(self.index.record('owner/repo', ''))
+        self.assertEqual(self.index._aliases, {})
+
+    def test_fork_network_follows_root_rename(self):
+        self.index.record('fork/repo', 'fork/repo', parent='upstream/repo', root='upstream/repo')
+        self.index.record('upstream/repo', 'upstream/repo')
+        self.assertEqual(self.index.parent('fork/repo'), 'upstream/repo')
+        self.assertEqual(self.index.group('fork/repo'), 'upstream/repo')
+        self.assertEqual(self.index.group('upstream/repo'), 'upstream/repo')
+
+        self.index.record('upstream/repo', 'org/repo')
+        self.assertEqual(self.index.group('fork/repo'), 'org/repo')
+        self.assertEqual(self.index.group('upstream/repo'), 'org/repo')
+
+    def test_root_equal_to_self_is_not_a_network(self):
+        self.index.record('solo/repo', 'solo/repo', root='Solo/Repo')
+        self.assertEqual(self.index._repos['solo/repo'], ('solo/repo', None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
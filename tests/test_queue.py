@@ -0,0 +1,111 @@
+"""任务队列的租约超时、重试和过期清理测试（memory 与 sqlite 后端）"""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from pipeline.queue import (
+    MemoryWorkQueue, SQLiteWorkQueue,
+    STATUS_DONE, STATUS_FAILED, STATUS_LEASED, STATUS_PENDING,
+)
+
+LEASE = 0.05
+
+
+class WorkQueueTests:
+    """各后端共用的测试，子类实现 make_queue()"""
+
+    def setUp(self):
+        self.queue = self.make_queue()
+
+    def tearDown(self):
+        self.queue.close()
+
+    def status_of(self, job_id):
+        return self.queue.status([job_id])[job_id]['status']
+
+    def test_enqueue_is_idempotent(self):
+        self.assertTrue(self.queue.enqueue('a', {'repo': 'x/y'}))
+        self.assertFalse(self.queue.enqueue('a', {'repo': 'x/y'}))
+
+    def test_expired_lease_is_reclaimed(self):
+        self.queue.enqueue('a', {'repo': 'x/y'}, max_attempts=3)
+        job = self.queue.claim('w1', LEASE)
+        self.assertEqual((job.job_id, job.attempts), ('a', 1))
+        # 租约未过期时其他 worker 领取不到
+        self.assertIsNone(self.queue.claim('w2', LEASE))
+
+        time.sleep(LEASE * 2)
+        job = self.queue.claim('w2', LEASE)
+        self.assertEqual((job.job_id, job.attempts), ('a', 2))
+        # 原持有者的失败报告不影响新租约
+        self.queue.fail('a', 'w1', 'late')
+        self.assertEqual(self.status_of('a'), STATUS_LEASED)
+
+    def test_expired_lease_fails_after_max_attempts(self):
+        self.queue.enqueue('a', {'repo': 'x/y'}, max_attempts=1)
+        self.assertIsNotNone(self.queue.claim('w1', LEASE))
+        time.sleep(LEASE * 2)
+        self.assertIsNone(self.queue.claim('w2', LEASE))
+        self.assertEqual(self.status_of('a'), STATUS_FAILED)
+
+    def test_failed_job_is_retried_until_max_attempts(self):
+        self.queue.enqueue('a', {'repo': 'x/y'}, max_attempts=2)
+        self.queue.claim('w1', 60)
+        self.queue.fail('a', 'w1', 'boom')
+        self.assertEqual(self.status_of('a'), STATUS_PENDING)
+
+        job = self.queue.claim('w1', 60)
+        self.assertEqual(job.attempts, 2)
+        self.queue.fail('a', 'w1', 'boom')
+        self.assertEqual(self.queue.status(['a'])['a'], {'status': STATUS_FAILED, 'result': None, 'error': 'boom'})
+        self.assertIsNone(self.queue.claim('w1', 60))
+
+        # 失败的任务重新入队后重置尝试次数
+        self.assertTrue(self.queue.enqueue('a', {'repo': 'x/y'}, max_attempts=2))
+        self.assertEqual(self.queue.claim('w1', 60).attempts, 1)
+
+    def test_complete_is_accepted_once(self):
+        self.queue.enqueue('a', {'repo': 'x/y'})
+        self.queue.claim('w1', 60)
+        self.assertTrue(self.queue.complete('a', 'w1', {'stars': 1}))
+        self.assertEqual(self.status_of('a'), STATUS_DONE)
+        self.assertFalse(self.queue.complete('a', 'w2', {'stars': 2}))
+        self.assertEqual(self.queue.status(['a'])['a']['result'], {'stars': 1})
+
+    def test_prune_removes_only_old_finished_jobs(self):
+        for job_id in ('done', 'failed', 'leased', 'pending'):
+            self.queue.enqueue(job_id, {'repo': job_id}, max_attempts=1)
+        self.queue.claim('w1', 60)
+        self.queue.complete('done', 'w1', {})
+        self.queue.claim('w1', 60)
+        self.queue.fail('failed', 'w1', 'boom')
+        self.queue.claim('w1', 60)
+
+        # 还没到保留期限的任务不清除
+        self.assertEqual(self.queue.prune(3600), 0)
+        time.sleep(LEASE)
+        self.assertEqual(self.queue.prune(0), 2)
+        self.assertEqual(
+            {job_id: info['status'] for job_id, info in self.queue.status(['done', 'failed', 'pending', 'leased']).items()},
+            {'pending': STATUS_PENDING, 'leased': STATUS_LEASED}
+        )
+        # 清除后同一任务可以重新入队
+        self.assertTrue(self.queue.enqueue('done', {'repo': 'done'}))
+
+
+class MemoryWorkQueueTest(WorkQueueTests, unittest.TestCase):
+    def make_queue(self):
+        return MemoryWorkQueue()
+
+
+class SQLiteWorkQueueTest(WorkQueueTests, unittest.TestCase):
+    def make_queue(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        return SQLiteWorkQueue(str(Path(self._tmp.name) / 'queue.db'))
+
+
+if __name__ == '__main__':
+    unittest.main()
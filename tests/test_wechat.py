@@ -0,0 +1,100 @@
+"""企业微信消息拆分和限流测试"""
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from notifiers import wechat
+from notifiers.wechat import MARKDOWN_MAX_BYTES, RateLimiter, pack_blocks, split_markdown
+
+
+def byte_len(text):
+    return len(text.encode('utf-8'))
+
+
+class PackBlocksTest(unittest.TestCase):
+    def test_merges_blocks_in_order_within_limit(self):
+        blocks = ['# 标题', '### 1. a/b\n简介', '### 2. c/d\n简介']
+        self.assertEqual(pack_blocks(blocks), ['# 标题\n\n### 1. a/b\n简介\n\n### 2. c/d\n简介'])
+        self.assertEqual(pack_blocks(['aaaa', 'bbbb', 'cccc'], max_bytes=10), ['aaaa\n\nbbbb', 'cccc'])
+
+    def test_separator_counts_towards_limit(self):
+        # 4 + 2 + 4 = 10 字节刚好放下，再加一个分隔符就超出
+        self.assertEqual(pack_blocks(['aaaa', 'bbbb'], max_bytes=10), ['aaaa\n\nbbbb'])
+        self.assertEqual(pack_blocks(['aaaa', 'bbbbb'], max_bytes=10), ['aaaa', 'bbbbb'])
+
+    def test_long_block_split_by_line_then_bytes(self):
+        block = '中' * 10 + '\n' + 'x' * 5
+        messages = pack_blocks([block], max_bytes=12)
+        # 每个汉字 3 字节，硬切分不会切断汉字
+        self.assertEqual(messages, ['中中中中', '中中中中', '中中', 'xxxxx'])
+        self.assertTrue(all(byte_len(message) <= 12 for message in messages))
+        self.assertEqual(''.join(messages).replace('\n', ''), block.replace('\n', ''))
+
+    def test_report_chunks_stay_under_platform_limit(self):
+        projects = [f"### {i}. owner/repo{i}\n" + '项目简介' * 60 + '\n' + '- 亮点\n' * 20 for i in range(40)]
+        content = '# Trending 日报\n\n' + '\n'.join(projects)
+        messages = pack_blocks(split_markdown(content))
+        self.assertGreater(len(messages), 1)
+        self.assertTrue(all(byte_len(message) <= MARKDOWN_MAX_BYTES for message in messages))
+        # 项目没有被拆开：每个项目标题和它的最后一条亮点在同一条消息中
+        for i in range(40):
+            holder = [message for message in messages if f"### {i}. owner/repo{i}\n" in message]
+            self.assertEqual(len(holder), 1)
+
+    def test_empty_blocks_are_dropped(self):
+        self.assertEqual(pack_blocks(['', '\n\n', 'a']), ['a'])
+        self.assertEqual(pack_blocks([]), [])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(wechat, 'time', SimpleNamespace(monotonic=self.clock.monotonic,
+                                                                    sleep=self.clock.sleep))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_waits_for_oldest_call_to_leave_window(self):
+        limiter = RateLimiter(3, period=60)
+        for _ in range(3):
+            limiter.acquire()
+            self.clock.now += 10
+        self.assertEqual(self.clock.sleeps, [])
+
+        # 第 4 次在第一次调用 30 秒后，需要再等 30 秒
+        with mock.patch('builtins.print'):
+            limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [30])
+
+    def test_window_slides(self):
+        limiter = RateLimiter(2, period=60)
+        limiter.acquire()
+        self.clock.now += 59
+        limiter.acquire()
+        self.clock.now += 1
+        # 第一次调用刚好离开窗口
+        limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_limiter_shared_per_webhook(self):
+        url = 'https://qyapi.weixin.qq.com/cgi-bin/webhook/send?key=test-shared'
+        self.assertIs(wechat.get_rate_limiter(url, 20), wechat.get_rate_limiter(url, 20))
+        self.assertEqual(wechat.get_rate_limiter(url, 5).max_calls, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Zread 链接解析测试：extract_trending_items() 与改写前的解析逻辑输出一致"""
+
+import importlib.util
+import unittest
+from pathlib import Path
+
+from zread_trending_daily import extract_trending_items, html_to_links
+
+_spec = importlib.util.spec_from_file_location(
+    'parse_benchmark', Path(__file__).resolve().parent.parent / 'scripts' / 'parse_benchmark.py')
+parse_benchmark = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(parse_benchmark)
+
+
+def link(href, text, title=''):
+    return {'href': href, 'text': text, 'title': title}
+
+
+# 容易分歧的写法：stars 的各种形式、标签过滤、仓库名位置、导航链接
+EDGE_LINKS = [
+    link('/', 'Zread'),
+    link('/trending/weekly', 'Weekly'),
+    link('https://github.com/a/b', 'a/b external'),
+    link('/subscription', 'Subscription'),
+    link('/private/repo/settings', 'private/repo'),
+    link('/solo', 'solo'),
+    link('/a/b', ''),
+    link('/a/b', 'a/b 重复的项目在空文本之后出现'),
+    link('/a/b', 'a/b duplicate is skipped'),
+    link('/c/d/tree/main', 'prefix c/d An agent framework 1.2k for LLM apps\nPython Rust the AI\n3,456 12k'),
+    link('/e/f', 'e/f Kelvin K sign and ＫB counts 123 1,2 .999 ,12 ¹²³ ١٢٣\nok/no v1.2 (beta) 中文，标签 By BY'),
+    link('/g/h', 'no repo token here\nTag Tag tag ' + 'x' * 25 + ' ' + 'y' * 24),
+    link('/i/j', 'i/j', title='Fallback title from the link with tiny words a b cd'),
+    link('/k/l', '  \n  k/l   spaced   description  \n\n  tag1  \n'),
+    link('/m/n', 'm/n ' + ' '.join(f"word{i}" for i in range(120)) + '\n' + ' '.join(f"t{i}" for i in range(30))),
+]
+
+PAGE = """
+<html><body>
+  <a href="/">Zread</a>
+  <a href="/o/p"><span>o/p</span> <span>Agent tools for fast prototyping</span>
+     <div>Python</div><div>2.3k</div></a>
+  <a href="/q/r" title="A title only"><div>q/r</div></a>
+</body></html>
+"""
+
+
+class ExtractTrendingItemsTest(unittest.TestCase):
+    def assert_same_as_legacy(self, links):
+        self.assertEqual(extract_trending_items(links), parse_benchmark.legacy_extract(links))
+
+    def test_edge_cases_match_legacy(self):
+        self.assert_same_as_legacy(EDGE_LINKS)
+
+    def test_synthetic_pages_match_legacy(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self.assert_same_as_legacy(parse_benchmark.synthetic_links(500, seed=seed))
+
+    def test_html_fallback_matches_legacy(self):
+        links = html_to_links(PAGE)
+        self.assert_same_as_legacy(links)
+        items = extract_trending_items(links)
+        self.assertEqual([item['repo'] for item in items], ['o/p', 'q/r'])
+        self.assertEqual(items[0]['stars'], '2.3k')
+        self.assertEqual(items[1]['description'], 'title only')
+
+    def test_seen_projects_are_skipped_and_recorded(self):
+        seen = {'c/d'}
+        items = extract_trending_items(EDGE_LINKS, seen)
+        self.assertNotIn('c/d', [item['repo'] for item in items])
+        self.assertTrue({'a/b', 'e/f', 'i/j'} <= seen)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,25 +11,63 @@ import sys
 import os
 from datetime import datetime
 from pathlib import Path
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
-from deep_translator import GoogleTranslator
-import requests
-from tqdm import tqdm
-from jinja2 import Environment, FileSystemLoader
-import schedule
-import time
-import threading
 
-# 导入配置和通知模块
+# 只导入轻量的配置模块；浏览器、解析、模板、通知等重量级依赖在用到它们的函数中导入，
+# 使 --help、打印配置、--worker 等路径不必加载用不到的模块（见 scripts/import_benchmark.py）
 from config import load_config, Config
-from notifiers import EmailNotifier
 
 # 导入原有的 zread 功能（延迟导入避免循环依赖）
 
 
+# 页面内提取脚本：直接在浏览器中按 parse_github_trending 的规则生成项目记录，
+# 避免序列化整页 HTML 再在 Python 中重建 DOM
+GITHUB_EXTRACT_SCRIPT = """
+() => {
+    const hasClass = (el, name) => Array.from(el.classList).some(c => c.includes(name));
+    const text = el => (el ? el.textContent.replace(/\\s+/g, ' ').trim() : '');
+    let articles = Array.from(document.querySelectorAll('article')).filter(a => hasClass(a, 'Box-row'));
+    if (!articles.length) {
+        articles = Array.from(document.querySelectorAll('article'));
+    }
+    const records = [];
+    for (const article of articles) {
+        const heading = Array.from(article.querySelectorAll('h2')).find(h => hasClass(h, 'h3'))
+            || article.querySelector('h2');
+        const link = heading && heading.querySelector('a[href]');
+        if (!link) {
+            continue;
+        }
+        const href = (link.getAttribute('href') || '').trim();
+        if (!href.startsWith('/')) {
+            continue;
+        }
+        const repo = href.replace(/^\\/+|\\/+$/g, '');
+        if (repo.split('/').length !== 2) {
+            continue;
+        }
+        const desc = Array.from(article.querySelectorAll('p')).find(p => hasClass(p, 'col-9'))
+            || article.querySelector('p');
+        const starsLink = article.querySelector('a[href*="/stargazers"]');
+        const todaySpan = Array.from(article.querySelectorAll('span')).find(s => hasClass(s, 'd-inline-block'));
+        const todayText = text(todaySpan);
+        records.push({
+            repo: repo,
+            description: text(desc),
+            language: text(article.querySelector('span[itemprop="programmingLanguage"]')),
+            stars: starsLink ? text(starsLink).replace(/[, ]/g, '') : null,
+            stars_today: todayText.toLowerCase().includes('stars today') ? todayText.split(' ')[0] : null,
+            url: 'https://github.com' + href
+        });
+    }
+    return records;
+}
+"""
+
+
 def parse_github_trending(html_content):
     """解析 GitHub Trending 页面内容"""
+    from bs4 import BeautifulSoup
+    
     soup = BeautifulSoup(html_content, 'lxml')
     trending_data = []
     
@@ -103,86 +141,131 @@ def parse_github_trending(html_content):
         except Exception as e:
             continue
     
+    # 立即释放解析树（提取出的都是普通字符串，不再引用树中的节点）
+    soup.decompose()
     return trending_data
 
 
-async def fetch_github_trending():
-    """获取 GitHub Trending 页面内容"""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        page.set_default_timeout(60000)
-        
+async def fetch_github_trending(config: Config = None):
+    """
+    获取 GitHub Trending 页面内容
+    
+    Returns:
+        tuple: (records, html_content)
+            - records: 页面内提取的项目记录（extraction 为 dom 且提取成功时）
+            - html_content: 整页 HTML（仅在 html 模式或页面内提取失败时获取）
+    """
+    from pipeline.browser import open_light_page
+    
+    browser_config = (config or load_config()).github.browser
+    
+    async with open_light_page("https://github.com/trending", 'GitHub', browser_config) as (page, metrics):
         print("正在访问 https://github.com/trending...")
         try:
-            await page.goto("https://github.com/trending", wait_until="load", timeout=60000)
-            await asyncio.sleep(3)  # 等待页面渲染
+            await goto_with_retry(page, "https://github.com/trending", wait_until="load", timeout=60000)
+            if browser_config.javascript_enabled:
+                await asyncio.sleep(3)  # 等待页面渲染
         except Exception as e:
             print(f"页面加载警告: {e}")
         
-        html_content = await page.content()
-        await page.close()
-        await browser.close()
+        # 优先在页面内提取项目记录，失败时回退到序列化整页 HTML
+        records = None
+        if browser_config.extraction == 'dom':
+            try:
+                records = await page.evaluate(GITHUB_EXTRACT_SCRIPT)
+            except Exception as e:
+                print(f"页面内提取失败，回退到 HTML 解析: {e}")
+        
+        html_content = None
+        if not records:
+            html_content = await page.content()
         
-        return html_content
+        return records, html_content
 
 
 async def generate_github_report(config: Config = None):
-    """生成 GitHub Trending 日报"""
+    """
+    生成 GitHub Trending 日报
+    
+    Returns:
+        bool: 报告是否为最新（已生成，或数据未变化而跳过）；抓取失败、超时或出错时返回 False
+    """
+    from jinja2 import Environment, FileSystemLoader
+    from notifiers import Notification, notify_report, DigestSection, add_digest_section
+    from pipeline import enrich_projects
+    from pipeline.checkpoint import open_run_journal
+    from pipeline.fingerprint import dataset_fingerprint, open_fingerprint_store
+    from archive.fulltext import index_run
+    from pipeline.history import save_run
+    from pipeline.html_output import write_html_report
+    from pipeline.identity import canonicalise_projects
+    from pipeline.deadline import RunDeadline
+    from pipeline.memory import RunMemory
+    from pipeline.resilience import use_request_budget, reset_request_budget
+    
     if config is None:
         config = load_config()
     
+    # 时间和请求预算：超出后用已完成的部分生成报告，不影响另一个数据源
+    deadline = RunDeadline('GitHub', config.github.deadlines)
+    budget_token = use_request_budget(deadline.request_budget)
+    # 本次运行期间的峰值内存（设置了 memory.max_rss_mb 时超过上限会限制详情获取的并发）
+    memory = RunMemory('GitHub', config.memory)
+    memory.start()
     try:
-        # 获取页面内容
-        html_content = await fetch_github_trending()
+        # 检查点：--resume 时复用上次运行已解析的列表和已完成的详情
+        journal = open_run_journal('GitHub', config)
         
-        # 解析内容
-        print("正在解析 GitHub Trending 内容...")
-        trending_data = parse_github_trending(html_content)
-        
-        if not trending_data:
-            print("警告: 未能解析到项目数据")
-            return
-        
-        # 获取项目详情（简介和亮点）
-        projects_to_fetch = trending_data[:20]  # 限制前20个项目
-        total_projects = len(projects_to_fetch)
-        print(f"\n正在获取 {total_projects} 个项目的详细信息...")
-        
-        # 使用信号量限制并发数
-        semaphore = asyncio.Semaphore(3)
-        
-        # 创建进度条
-        pbar = tqdm(total=total_projects, desc="获取项目详情", unit="项目", ncols=100, leave=True)
-        
-        async def fetch_with_progress(project):
-            """获取项目详情并更新进度条"""
+        if journal is not None and journal.trending is not None:
+            trending_data = journal.trending
+        else:
+            # 获取页面内容
+            fetch_timeout = deadline.stage_timeout('fetch')
             try:
-                details = await fetch_project_details(project['repo'], semaphore)
-                project['intro'] = details['description']
-                project['highlights'] = details['highlights']
-                if details.get('language') and not project.get('language'):
-                    project['language'] = details['language']
-                pbar.set_postfix_str(f"✓ {project['repo']}")
-                return True
-            except Exception as e:
-                pbar.set_postfix_str(f"✗ {project['repo']}: {str(e)[:30]}")
+                records, html_content = await asyncio.wait_for(fetch_github_trending(config), fetch_timeout)
+            except TimeoutError:
+                deadline.mark('fetch', f"抓取趋势列表超出时间预算（{fetch_timeout:.0f} 秒），跳过本次日报")
                 return False
-            finally:
-                pbar.update(1)
+            
+            # 解析内容
+            print("正在解析 GitHub Trending 内容...")
+            trending_data = records or parse_github_trending(html_content)
+            # 已知改名的仓库换成当前名称，合并重复的仓库
+            trending_data = canonicalise_projects(trending_data, config)
+            
+            if not trending_data:
+                print("警告: 未能解析到项目数据")
+                return False
+            # 列表已解析，不再持有整页 HTML 和页面内提取的记录
+            records = html_content = None
+            
+            if journal is not None:
+                journal.record_list(trending_data)
         
-        # 创建所有任务
-        tasks = [fetch_with_progress(project) for project in projects_to_fetch]
+        # 获取项目详情（简介和亮点）
+        projects_to_fetch = trending_data[:config.enrich.project_limit]  # 限制获取详情的项目数
+        await enrich_projects(projects_to_fetch, config, prefer_existing_language=True, journal=journal,
+                              deadline=deadline, source='GitHub')
         
-        # 并发执行所有任务
-        await asyncio.gather(*tasks)
+        reports_dir = Path(config.report.output_dir)
+        date_str = datetime.now().strftime('%Y%m%d')
+        md_path = reports_dir / f"github_trending_report_{date_str}.md"
+        html_path = reports_dir / f"github_trending_report_{date_str}.html"
+        outputs = [path for fmt, path in (('markdown', md_path), ('html', html_path))
+                   if fmt in config.report.formats]
         
-        # 关闭进度条
-        pbar.close()
+        # 数据与上次生成报告时相同则跳过渲染、写文件和通知
+        fingerprint = dataset_fingerprint(trending_data)
+        fingerprints = open_fingerprint_store(config)
+        notify = config.notification.enabled
+        if fingerprints is not None and fingerprints.unchanged('GitHub', fingerprint, outputs, require_notified=notify):
+            print(f"\n  ℹ GitHub Trending 数据与上次生成时相同（指纹 {fingerprint[:12]}），跳过生成报告和通知")
+            if journal is not None:
+                journal.mark_complete()
+            return True
         
         # 生成日报（根据配置生成指定格式）
         print("\n正在生成 GitHub Trending 日报...")
-        reports_dir = Path(config.report.output_dir)
         reports_dir.mkdir(exist_ok=True)
         templates_dir = Path("templates")
         templates_dir.mkdir(exist_ok=True)
@@ -202,64 +285,87 @@ async def generate_github_report(config: Config = None):
         }
         
         md_file = None
+        md_content = None
         
         # 根据配置生成报告格式
         if 'markdown' in config.report.formats:
             md_template = env.get_template("report.md.j2")
             md_content = md_template.render(**template_data)
-            md_file = reports_dir / f"github_trending_report_{datetime.now().strftime('%Y%m%d')}.md"
+            md_file = md_path
             with open(md_file, 'w', encoding='utf-8') as f:
                 f.write(md_content)
             print(f"  ✓ Markdown 格式: {md_file}")
         
         if 'html' in config.report.formats:
-            html_template = env.get_template("report.html.j2")
-            html_content = html_template.render(**template_data)
-            html_file = reports_dir / f"github_trending_report_{datetime.now().strftime('%Y%m%d')}.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"  ✓ HTML 格式: {html_file}")
+            html_output = write_html_report(env, template_data, html_path, config.report)
+            print(f"  ✓ HTML 格式: {html_output.path}（{html_output.summary()}）")
         
         print(f"\nGitHub Trending 日报已生成，共包含 {len(trending_data)} 个项目")
         
-        # 发送通知（如果启用）
-        if config.notification.enabled and config.notification.email_recipient and md_file:
-            try:
-                notifier = EmailNotifier(recipient=config.notification.email_recipient)
-                success = notifier.send_report_summary(
-                    report_type="GitHub",
-                    report_path=md_file,
-                    total_projects=len(trending_data),
-                    generate_time=template_data['generate_time']
-                )
-                if success:
-                    print(f"  ✓ 邮件通知已发送到 {config.notification.email_recipient}")
-                else:
-                    print("  ⚠ 邮件通知发送失败")
-            except Exception as e:
-                print(f"  ⚠ 发送邮件通知时出错: {e}")
+        # 通知送达后才在指纹记录中标记已通知：通知失败或进程中途退出时，下次运行不会因数据未变化而跳过
+        delivered = None
+        if fingerprints is not None:
+            routes = ((1 if md_file else 0) + (1 if config.notification.digest else 0)) if notify else 0
+            delivered = fingerprints.record('GitHub', fingerprint, outputs, notifications=routes)
+        
+        # 保存结构化数据并写入全文索引，供归档站点和历史搜索使用
+        save_run(config, 'GitHub', date_str, template_data['generate_time'], trending_data)
+        index_run(config, 'GitHub', date_str, trending_data)
+        
+        # 降级的运行不标记完成，--resume 时只补齐未获取的详情
+        if journal is not None and not deadline.degraded:
+            journal.mark_complete()
+        print(f"  ℹ {deadline.summary()}")
+        
+        # 汇总模式：登记内存中的数据，全部数据源完成后统一发送汇总邮件
+        if config.notification.enabled and config.notification.digest:
+            add_digest_section(DigestSection(
+                source="GitHub",
+                generate_time=template_data['generate_time'],
+                projects=trending_data,
+                markdown=md_content,
+                on_delivered=delivered
+            ))
+        
+        # 发送通知（如果启用）：并发发送到已配置的邮件、企业微信等渠道
+        if config.notification.enabled and md_file:
+            await notify_report(config.notification, Notification(
+                report_type="GitHub",
+                report_path=md_file,
+                total_projects=len(trending_data),
+                generate_time=template_data['generate_time'],
+                markdown=md_content,
+                on_delivered=delivered
+            ))
         elif not config.notification.enabled:
             print("  ℹ 通知功能已禁用（本地测试模式）")
+        return True
         
     except Exception as e:
         print(f"生成 GitHub Trending 日报时出错: {e}")
         import traceback
         traceback.print_exc()
+        return False
+    finally:
+        reset_request_budget(budget_token)
+        memory.stop()
+        print(f"  ℹ {memory.summary()}")
 
 
 async def generate_zread_report_wrapper(config: Config = None):
-    """Zread Trending 日报生成包装函数"""
+    """Zread Trending 日报生成包装函数（返回值同 generate_github_report）"""
     if config is None:
         config = load_config()
     
     try:
         # 延迟导入避免循环依赖
         from zread_trending_daily import generate_zread_report
-        await generate_zread_report(config)
+        return await generate_zread_report(config)
     except Exception as e:
         print(f"生成 Zread Trending 日报时出错: {e}")
         import traceback
         traceback.print_exc()
+        return False
 
 
 def fetch_project_details(repo_name, semaphore):
@@ -269,42 +375,148 @@ def fetch_project_details(repo_name, semaphore):
     return _fetch(repo_name, semaphore)
 
 
+async def goto_with_retry(page, url, **kwargs):
+    """通过弹性层加载页面（复用 zread 的功能）"""
+    # 延迟导入
+    from zread_trending_daily import goto_with_retry as _goto
+    return await _goto(page, url, **kwargs)
+
+
+def run_scheduled_job(job, config: Config, send_digest_after: bool = False):
+    """
+    执行一次定时任务：每次运行使用新的熔断器和请求预算
+    
+    Args:
+        job: 日报生成协程函数
+        config: 配置对象
+        send_digest_after: 汇总模式下是否在本任务完成后发送汇总邮件（当天最后一个任务）
+    """
+    from notifiers import close_dispatcher, send_digest
+    from pipeline.resilience import configure_resilience
+    
+    async def run():
+        await job(config)
+        if send_digest_after:
+            await send_digest(config.notification)
+        if config.archive.enabled:
+            from archive import build_site
+            build_site(config)
+    
+    configure_resilience(config.resilience)
+    try:
+        asyncio.run(run())
+    finally:
+        close_dispatcher()
+
+
 class TrendingScheduler:
     """Trending 日报定时任务调度器"""
     
-    def __init__(self):
+    def __init__(self, config_loader=None):
+        """
+        Args:
+            config_loader: 重新加载配置的函数（配置有误时抛出 ConfigError）；提供时监视配置文件并热加载
+        """
+        import threading
+        
         self.running = False
         self.thread = None
+        self.config = None
+        self.config_loader = config_loader
+        self.watcher = None
+        self._pending_config = None
+        self._pending_lock = threading.Lock()
     
     def run_scheduler(self):
         """运行调度器（在单独线程中）"""
+        import schedule
+        import time
+        
         while self.running:
+            # 任务在本线程中执行，新配置只会在两次任务之间替换，执行中的任务继续使用旧配置
+            self._apply_pending_config()
             schedule.run_pending()
-            time.sleep(60)  # 每分钟检查一次
+            time.sleep(1)
     
-    def start(self, config: Config):
-        """启动定时任务"""
-        if self.running:
-            print("调度器已在运行中")
-            return
+    def _register_jobs(self, config: Config):
+        """按配置（重新）注册定时任务"""
+        import schedule
         
         # 清除所有现有任务
         schedule.clear()
         
+        # 汇总模式：当天最后一个任务完成后发送汇总邮件（时间相同时 GitHub 任务后执行）
+        digest = config.notification.enabled and config.notification.digest
+        enabled_tasks = [(task.time, order, name) for order, (name, task)
+                         in enumerate((('zread', config.zread), ('github', config.github))) if task.enabled]
+        last_time, _, last_task = max(enabled_tasks) if enabled_tasks else (None, None, None)
+        
         # 添加 Zread 任务
         if config.zread.enabled:
             schedule.every().day.at(config.zread.time).do(
-                lambda: asyncio.run(generate_zread_report_wrapper(config))
+                run_scheduled_job, generate_zread_report_wrapper, config,
+                send_digest_after=digest and last_task == 'zread'
             )
             print(f"已设置 Zread Trending 日报定时任务: 每天 {config.zread.time}")
         
         # 添加 GitHub 任务
         if config.github.enabled:
             schedule.every().day.at(config.github.time).do(
-                lambda: asyncio.run(generate_github_report(config))
+                run_scheduled_job, generate_github_report, config,
+                send_digest_after=digest and last_task == 'github'
             )
             print(f"已设置 GitHub Trending 日报定时任务: 每天 {config.github.time}")
         
+        if digest:
+            print(f"汇总模式: 每天 {last_time} 的任务完成后发送汇总邮件")
+    
+    def reload(self, config: Config):
+        """提交校验通过的新配置（由调度线程在两次任务之间替换）"""
+        with self._pending_lock:
+            self._pending_config = config
+    
+    def _apply_pending_config(self):
+        """替换为新配置并重新注册定时任务"""
+        from config.validation import config_changes
+        
+        with self._pending_lock:
+            config, self._pending_config = self._pending_config, None
+        if config is None:
+            return
+        changes = config_changes(self.config, config)
+        if not changes:
+            return
+        print(f"\n↻ 应用新配置（变化的配置节: {', '.join(changes)}）")
+        self.config = config
+        self._register_jobs(config)
+        if 'schedule' in changes and self.watcher is not None:
+            self.watcher.interval = config.schedule.reload_interval
+        # 解析进程池、亮点缓存、请求弹性层等在每次任务开始时按当时的配置重新配置
+    
+    def start(self, config: Config, config_path: str = 'config.json'):
+        """
+        启动定时任务
+        
+        Args:
+            config: 配置对象
+            config_path: 监视的配置文件路径（启用热加载时）
+        """
+        if self.running:
+            print("调度器已在运行中")
+            return
+        
+        import threading
+        from config import ConfigWatcher
+        
+        self.config = config
+        self._register_jobs(config)
+        
+        if self.config_loader is not None and config.schedule.reload:
+            self.watcher = ConfigWatcher(config_path, self.config_loader, self.reload,
+                                         interval=config.schedule.reload_interval)
+            self.watcher.start()
+            print(f"配置热加载: 监视 {config_path}（每 {config.schedule.reload_interval:g} 秒检查一次）")
+        
         self.running = True
         self.thread = threading.Thread(target=self.run_scheduler, daemon=True)
         self.thread.start()
@@ -313,13 +525,59 @@ class TrendingScheduler:
     
     def stop(self):
         """停止定时任务"""
+        import schedule
+        
         self.running = False
+        if self.watcher is not None:
+            self.watcher.stop()
         schedule.clear()
         if self.thread:
             self.thread.join(timeout=1)
         print("定时任务调度器已停止")
 
 
+def apply_cli_overrides(config: Config, args) -> Config:
+    """命令行参数覆盖配置（热加载的新配置同样应用）"""
+    if args.notify:
+        config.notification.enabled = True
+    if args.no_notify:
+        config.notification.enabled = False
+    
+    if args.zread_time:
+        config.zread.time = args.zread_time
+    if args.github_time:
+        config.github.time = args.github_time
+    
+    if args.formats:
+        config.report.formats = [f.strip() for f in args.formats.split(',')]
+    
+    if args.force:
+        config.report.skip_unchanged = False
+    
+    if args.resume:
+        config.checkpoint.resume = True
+    
+    if args.distributed:
+        config.distributed.enabled = True
+    
+    if args.max_rss is not None:
+        config.memory.max_rss_mb = args.max_rss
+    
+    if args.host:
+        config.service.host = args.host
+    if args.port:
+        config.service.port = args.port
+    
+    # 定时任务模式和服务模式只启用一个数据源
+    if (args.schedule or args.serve) and args.zread_only:
+        config.zread.enabled = True
+        config.github.enabled = False
+    if (args.schedule or args.serve) and args.github_only:
+        config.zread.enabled = False
+        config.github.enabled = True
+    return config
+
+
 def main():
     """主函数 - 支持命令行参数和配置文件"""
     parser = argparse.ArgumentParser(
@@ -347,6 +605,32 @@ def main():
   
   # 禁用通知（覆盖配置）
   python trending_daily.py --zread --no-notify
+  
+  # 数据未变化时默认跳过生成，--force 强制重新生成
+  python trending_daily.py --zread --force
+  
+  # 增量构建静态归档站点（--force 重新渲染全部报告页）
+  python trending_daily.py --build-site
+  
+  # 修改模板后从保存的运行数据重新渲染历史报告（只重写输入有变化的文件）
+  python trending_daily.py --rebuild
+  
+  # 搜索历史上榜项目（最近 90 天提到 agent 或 RAG 的 Python 项目）
+  python trending_daily.py --search "agent OR RAG" --days 90 --language Python
+  
+  # 从上次中断的位置继续（只重跑缺失的部分）
+  python trending_daily.py --zread --github --resume
+  
+  # 服务模式：常驻进程，通过本地 HTTP API 按需生成和查询日报
+  python trending_daily.py --serve --port 8765
+  curl 'http://127.0.0.1:8765/reports/github?format=markdown'
+  
+  # 大量项目时限制内存：常驻内存超过 1024 MB 后暂停发起新的详情获取
+  python trending_daily.py --zread --github --max-rss 1024
+  
+  # 分布式模式：协调者分发详情获取任务，worker 领取执行
+  python trending_daily.py --zread --github --distributed
+  python trending_daily.py --worker --config config.json
         """
     )
     
@@ -367,30 +651,107 @@ def main():
     parser.add_argument('--github-time', type=str, default=None,
                        help='GitHub 日报生成时间 (格式: HH:MM)')
     parser.add_argument('--zread-only', action='store_true',
-                       help='定时任务模式：仅启用 Zread')
+                       help='定时任务/服务模式：仅启用 Zread')
     parser.add_argument('--github-only', action='store_true',
-                       help='定时任务模式：仅启用 GitHub')
+                       help='定时任务/服务模式：仅启用 GitHub')
     parser.add_argument('--formats', type=str, default=None,
                        help='报告格式，逗号分隔 (例如: markdown,html)')
+    parser.add_argument('--force', action='store_true',
+                       help='即使数据与上次生成时相同也重新生成报告并发送通知')
+    parser.add_argument('--build-site', action='store_true',
+                       help='从保存的运行数据增量构建静态归档站点（与 --zread/--github 同时使用时在生成后构建）')
+    parser.add_argument('--rebuild', action='store_true',
+                       help='从保存的运行数据重新渲染历史报告（只重写模板、数据或配置有变化的文件；'
+                            '与 --zread/--github 同时使用时在生成后重新渲染）')
+    parser.add_argument('--resume', action='store_true',
+                       help='从上次运行的检查点继续，只重跑缺失的部分')
+    parser.add_argument('--distributed', action='store_true',
+                       help='分布式模式：通过任务队列分发项目详情获取任务')
+    parser.add_argument('--worker', action='store_true',
+                       help='启动 worker，从任务队列领取项目详情获取任务')
+    parser.add_argument('--worker-id', type=str, default=None,
+                       help='worker 标识（默认: 主机名-进程号）')
+    parser.add_argument('--worker-idle-exit', type=float, default=None,
+                       help='worker 连续空闲多少秒后退出（默认一直运行）')
+    parser.add_argument('--max-rss', type=int, default=None, metavar='MB',
+                       help='常驻内存上限（MB），超过时暂停发起新的详情获取直到内存回落')
+    
+    serve_group = parser.add_argument_group('服务模式')
+    serve_group.add_argument('--serve', action='store_true',
+                             help='启动服务模式：常驻进程，通过本地 HTTP API 触发运行、获取报告和查询历史')
+    serve_group.add_argument('--host', type=str, default=None, help='服务监听地址（默认: 127.0.0.1）')
+    serve_group.add_argument('--port', type=int, default=None, help='服务监听端口（默认: 8765）')
+    
+    search_group = parser.add_argument_group('历史搜索')
+    search_group.add_argument('--search', type=str, default=None, metavar='QUERY',
+                              help='搜索历史上榜项目（空格分隔取交集，OR 取并集，词尾 * 前缀匹配）')
+    search_group.add_argument('--source', type=str, default=None, help='只搜索某个数据源（Zread / GitHub）')
+    search_group.add_argument('--since', type=str, default=None, help='起始日期 (YYYY-MM-DD)')
+    search_group.add_argument('--until', type=str, default=None, help='结束日期 (YYYY-MM-DD)')
+    search_group.add_argument('--days', type=int, default=None, help='只搜索最近多少天')
+    search_group.add_argument('--language', type=str, default=None, help='主要语言（如 Python）')
+    search_group.add_argument('--limit', type=int, default=20, help='最多显示的项目数（默认: 20）')
     
     args = parser.parse_args()
     
-    # 加载配置
-    config = load_config(args.config)
+    # 加载并校验配置（命令行覆盖的值一起校验，配置有误时列出全部问题后退出）
+    from config import ConfigError, validate_config
     
-    # 命令行参数覆盖配置
-    if args.notify:
-        config.notification.enabled = True
-    if args.no_notify:
-        config.notification.enabled = False
+    def load_validated_config() -> Config:
+        config = apply_cli_overrides(load_config(args.config, strict=True), args)
+        errors = validate_config(config)
+        if errors:
+            raise ConfigError(errors)
+        return config
     
-    if args.zread_time:
-        config.zread.time = args.zread_time
-    if args.github_time:
-        config.github.time = args.github_time
+    try:
+        config = load_validated_config()
+    except ConfigError as e:
+        print("配置有误:")
+        for problem in e.errors:
+            print(f"  ⚠ {problem}")
+        sys.exit(2)
     
-    if args.formats:
-        config.report.formats = [f.strip() for f in args.formats.split(',')]
+    # worker 模式
+    if args.worker:
+        from pipeline.worker import run_worker
+        run_worker(config, worker_id=args.worker_id, idle_exit=args.worker_idle_exit)
+        return
+    
+    # 搜索历史
+    if args.search:
+        from archive.fulltext import parse_date, search_history
+        try:
+            since = parse_date(args.since) if args.since else None
+            until = parse_date(args.until) if args.until else None
+        except ValueError:
+            parser.error('日期格式应为 YYYY-MM-DD')
+        search_history(config, args.search, source=args.source, since=since, until=until,
+                       days=args.days, language=args.language, limit=args.limit)
+        return
+    
+    # 服务模式
+    if args.serve:
+        from service import serve
+        generators = {name: job for name, job, task in (
+            ('Zread', generate_zread_report_wrapper, config.zread),
+            ('GitHub', generate_github_report, config.github),
+        ) if task.enabled}
+        serve(config, generators)
+        return
+    
+    if args.rebuild and args.schedule:
+        parser.error('--rebuild 不能与 --schedule 同时使用：请单独运行 --rebuild，或与 --zread/--github 一起在生成后重新渲染')
+    
+    # 重新渲染历史报告和/或构建归档站点
+    if (args.rebuild or args.build_site) and not any([args.zread, args.github, args.schedule]):
+        if args.rebuild:
+            from archive import rebuild_reports
+            rebuild_reports(config, force=args.force)
+        if args.build_site:
+            from archive import build_site
+            build_site(config, force=args.force)
+        return
     
     # 如果没有指定任何参数，显示帮助
     if not any([args.zread, args.github, args.schedule]):
@@ -400,20 +761,17 @@ def main():
         print(f"  GitHub: {'启用' if config.github.enabled else '禁用'} ({config.github.time})")
         print(f"  报告格式: {', '.join(config.report.formats)}")
         print(f"  通知: {'启用' if config.notification.enabled else '禁用'}")
+        print(f"  分布式模式: {'启用' if config.distributed.enabled else '禁用'} ({config.distributed.backend})")
+        print(f"  服务模式: http://{config.service.host}:{config.service.port}（--serve 启动）")
         return
     
     # 定时任务模式
     if args.schedule:
-        # 命令行参数覆盖配置
-        if args.zread_only:
-            config.zread.enabled = True
-            config.github.enabled = False
-        if args.github_only:
-            config.zread.enabled = False
-            config.github.enabled = True
+        import time
         
-        scheduler = TrendingScheduler()
-        scheduler.start(config)
+        # 配置文件变化时重新加载、校验，并应用同样的命令行覆盖
+        scheduler = TrendingScheduler(config_loader=load_validated_config)
+        scheduler.start(config, args.config or 'config.json')
         
         try:
             # 保持主线程运行
@@ -423,6 +781,11 @@ def main():
             scheduler.stop()
     else:
         # 手动触发模式
+        from notifiers import batch_notifications, close_dispatcher, send_digest
+        from pipeline.extract import shutdown_parse_pool
+        from pipeline.registry import get_enrichment_registry
+        from pipeline.resilience import configure_resilience
+        
         async def run_tasks():
             tasks = []
             
@@ -445,11 +808,30 @@ def main():
                 tasks.append(generate_github_report(config))
             
             if tasks:
-                await asyncio.gather(*tasks)
+                # 各数据源的企业微信消息合并发送
+                async with batch_notifications(config.notification):
+                    await asyncio.gather(*tasks)
+                if len(tasks) > 1:
+                    print(f"\n跨数据源详情共享: {get_enrichment_registry().summary()}")
+                if config.notification.enabled and config.notification.digest:
+                    await send_digest(config.notification)
+                if args.rebuild:
+                    # 生成当天的报告后再重新渲染历史报告（--force 只作用于生成，这里按输入哈希增量重写）
+                    from archive import rebuild_reports
+                    rebuild_reports(config)
+                if args.build_site or config.archive.enabled:
+                    from archive import build_site
+                    build_site(config)
             else:
                 parser.print_help()
         
-        asyncio.run(run_tasks())
+        # 两个数据源共享同一次运行的请求预算和熔断器
+        configure_resilience(config.resilience)
+        try:
+            asyncio.run(run_tasks())
+        finally:
+            close_dispatcher()
+            shutdown_parse_pool()
 
 
 if __name__ == "__main__":
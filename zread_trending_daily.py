@@ -6,31 +6,50 @@ Zread Trending 日报生成器
 
 import asyncio
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
-from deep_translator import GoogleTranslator
-import requests
-from tqdm import tqdm
-from jinja2 import Environment, FileSystemLoader
 from typing import Optional
+from urllib.parse import urlparse
 
-# 导入配置和通知模块
+# 导入配置模块（通知模块依赖 requests、jinja2，发送通知时才导入）
 try:
     from config import Config, load_config
-    from notifiers import EmailNotifier
 except ImportError:
     # 兼容旧版本
     Config = None
     load_config = None
-    EmailNotifier = None
+
+from pipeline import enrich_projects
+from pipeline.checkpoint import open_run_journal
+from pipeline.highlight_cache import get_highlight_cache
+from pipeline.identity import get_identity_index, repo_key, repo_path, canonicalise_projects
+from pipeline.deadline import RunDeadline
+from pipeline.browser import open_light_page
+from pipeline.fingerprint import dataset_fingerprint, open_fingerprint_store
+from pipeline.memory import RunMemory, memory_slot, read_limited
+from pipeline.history import save_run
+from config.config import BrowserConfig, CrawlConfig, ReportConfig
+from pipeline.resilience import (
+    get_resilience,
+    use_request_budget,
+    reset_request_budget,
+    configure_resilience,
+    retry_after_seconds,
+    CircuitOpenError,
+    RetryableError,
+    RETRYABLE_STATUSES,
+)
 
 
 async def fetch_trending_content(browser=None):
     """使用 Playwright 获取网页内容"""
     if browser is None:
         # 如果没有传入 browser，创建新的
+        from playwright.async_api import async_playwright
         p = async_playwright()
         playwright = await p.start()
         browser = await playwright.chromium.launch(headless=True)
@@ -39,8 +58,66 @@ async def fetch_trending_content(browser=None):
     return browser, None
 
 
+# 翻译服务主机（熔断器按主机划分）
+TRANSLATE_HOST = 'translate.google.com'
+
+# 进程内的翻译结果缓存（最近使用的条目）：两个数据源、服务模式下的多次运行共用，
+# 相同的简介和亮点不再重复请求翻译服务
+TRANSLATION_CACHE_SIZE = 4096
+_translations: 'OrderedDict[str, str]' = OrderedDict()
+_translations_lock = threading.Lock()
+# 每个线程复用一个翻译器对象
+_translator_local = threading.local()
+
+
+def _get_translator():
+    translator = getattr(_translator_local, 'translator', None)
+    if translator is None:
+        from deep_translator import GoogleTranslator
+        translator = GoogleTranslator(source='auto', target='zh-CN')
+        _translator_local.translator = translator
+    return translator
+
+
+def _cached_translation(text):
+    with _translations_lock:
+        translated = _translations.get(text)
+        if translated is not None:
+            _translations.move_to_end(text)
+        return translated
+
+
+def _remember_translation(text, translated):
+    with _translations_lock:
+        _translations[text] = translated
+        _translations.move_to_end(text)
+        while len(_translations) > TRANSLATION_CACHE_SIZE:
+            _translations.popitem(last=False)
+
+
+def _translate_once(translator, text):
+    """单次翻译，将 deep_translator 的限流/请求错误转换为可重试错误"""
+    from deep_translator.exceptions import TooManyRequests, RequestError
+    try:
+        return translator.translate(text)
+    except (TooManyRequests, RequestError) as e:
+        raise RetryableError(f"翻译服务错误: {e}") from e
+
+
 def translate_to_chinese(text):
-    """将英文文本翻译成中文"""
+    """将英文文本翻译成中文（翻译失败时返回原文）"""
+    translated = try_translate(text)
+    return text if translated is None else translated
+
+
+def try_translate(text):
+    """
+    将英文文本翻译成中文
+
+    Returns:
+        Optional[str]: 译文（已是中文或为空的文本原样返回）；翻译服务熔断或翻译失败时返回 None，
+                       调用方据此区分原文和译文（例如不把原文写入亮点缓存）
+    """
     if not text or len(text.strip()) == 0:
         return text
     
@@ -51,30 +128,50 @@ def translate_to_chinese(text):
         if total_chars > 0 and chinese_chars / total_chars > 0.3:  # 如果中文字符超过30%，认为已经是中文
             return text
         
-        # 使用Google翻译
-        translator = GoogleTranslator(source='auto', target='zh-CN')
         # 限制文本长度，避免过长文本导致翻译失败
         text_to_translate = text[:2000] if len(text) > 2000 else text
-        translated = translator.translate(text_to_translate)
+        cached = _cached_translation(text_to_translate)
+        if cached is not None:
+            return cached
+        
+        # 使用Google翻译
+        translator = _get_translator()
+        # 通过弹性层调用：限流时退避重试，翻译服务持续失败时熔断，不再逐条等待超时
+        translated = get_resilience().call(TRANSLATE_HOST, _translate_once, translator, text_to_translate)
+        if not translated:
+            return None
+        _remember_translation(text_to_translate, translated)
         
         # 添加延迟，避免触发速率限制
         import time
         time.sleep(0.1)
         
         return translated
+    except CircuitOpenError:
+        return None  # 翻译服务熔断中
     except Exception as e:
         print(f"    翻译失败: {e}")
-        return text  # 翻译失败时返回原文
+        return None
 
 
-async def fetch_project_details(repo_name, semaphore):
+async def fetch_project_details(repo_name, semaphore, raise_errors=False):
     """从 GitHub 项目首页获取详细信息（简介、亮点和主要语言）
     使用 requests 直接获取，更轻量快速，无需启动浏览器
+    
+    Args:
+        repo_name: 仓库名（owner/repo）
+        semaphore: 限制并发数的信号量
+        raise_errors: 出错时是否抛出异常（分布式 worker 需要异常来触发重试），默认返回空字段
     """
-    async with semaphore:  # 限制并发数
+    # 解析模块依赖 bs4 和 lxml，获取详情时才导入
+    from pipeline.extract import parse_project_page
+    
+    # 限制并发数；设置了内存上限时，超过上限后等待进行中的获取完成、内存回落
+    async with semaphore, memory_slot():
         try:
-            # 构建 GitHub URL
-            github_url = f"https://github.com/{repo_name}"
+            # 构建 GitHub URL（身份索引中记录过改名的仓库直接请求新地址）
+            identity = get_identity_index()
+            github_url = identity.url(repo_name) if identity else f"https://github.com/{repo_name}"
             
             # 使用 requests 直接获取页面内容（更轻量，无需浏览器）
             # 使用 asyncio.to_thread 将同步请求转为异步，避免阻塞事件循环
@@ -83,127 +180,73 @@ async def fetch_project_details(repo_name, semaphore):
             }
             
             def fetch_html():
-                response = requests.get(github_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                return response.text
-            
-            html_content = await asyncio.to_thread(fetch_html)
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # 提取项目描述（在仓库标题下方）
-            description = ""
-            desc_selectors = [
-                'p[data-pjax="#repo-content-pjax-container"]',
-                'div[itemprop="about"]',
-                'p.f4.my-3',
-                'div.Box-body p',
-                'span[itemprop="about"]',
-            ]
-            
-            for selector in desc_selectors:
-                desc_elements = soup.select(selector)
-                if desc_elements:
-                    for elem in desc_elements:
-                        text = elem.get_text(strip=True)
-                        if len(text) > 20:  # 选择有意义的描述
-                            description = text[:500]  # 限制长度
-                            break
-                    if description:
-                        break
-            
-            # 提取主要编程语言
-            language = ""
-            # GitHub 的语言信息通常在语言统计栏中，格式为 <li> 包含语言名和百分比
-            # 查找语言统计区域
-            lang_stats_container = soup.find('ul', class_=lambda x: x and 'list-style-none' in ' '.join(x) if x else False)
-            if not lang_stats_container:
-                # 尝试其他可能的容器
-                lang_stats_container = soup.find('div', class_=lambda x: x and 'language' in ' '.join(x).lower() if x else False)
+                # 弹性 GET：429/5xx 按 Retry-After 或指数退避重试，持续失败时熔断 github.com
+                # 流式读取，超过 memory.max_page_bytes 的部分丢弃
+                response = get_resilience().get(github_url, headers=headers, timeout=10, stream=True)
+                return read_limited(response), response.url
             
-            if lang_stats_container:
-                # 查找第一个语言项（通常是主要语言）
-                lang_items = lang_stats_container.find_all('li', limit=1)
-                if lang_items:
-                    # 提取语言名称（通常在 span 中，且不包含百分比）
-                    lang_spans = lang_items[0].find_all('span')
-                    for span in lang_spans:
-                        text = span.get_text(strip=True)
-                        # 排除百分比（包含 %）和空文本
-                        if text and '%' not in text and len(text) < 30:
-                            language = text
-                            break
+            html_content, final_url = await asyncio.to_thread(fetch_html)
+            # README 亮点缓存：README 未变化时跳过亮点提取和翻译（按规范键关联，改名前后共用）
+            highlight_cache = get_highlight_cache()
+            cache_key = repo_key(repo_name)
+            known_readme_hash = highlight_cache.readme_hash_for(cache_key) if highlight_cache else None
             
-            # 如果还没找到，尝试使用 itemprop 属性
-            if not language:
-                lang_elem = soup.find('span', itemprop='programmingLanguage')
-                if lang_elem:
-                    language = lang_elem.get_text(strip=True)
+            # 解析交给进程池（或线程）执行，避免大页面解析阻塞事件循环
+            parsed = await parse_project_page(html_content, known_readme_hash)
+            description = parsed['description']
+            highlights = parsed['highlights']
+            language = parsed['language']
+            readme_hash = parsed['readme_hash']
             
-            # 如果还没找到，尝试从链接中提取
-            if not language:
-                lang_links = soup.find_all('a', href=lambda x: x and '/search' in x and 'l=' in x if x else False)
-                if lang_links:
-                    # 从第一个语言链接中提取语言名
-                    for link in lang_links[:1]:
-                        text = link.get_text(strip=True)
-                        if text and len(text) < 30:
-                            language = text
-                            break
+            # 改名或转移的仓库：页面中的 owner/repo 或重定向后的地址为当前名称，旧名称记为别名
+            canonical_name = parsed.get('repo') or repo_path(final_url or '') or repo_name
+            if identity is not None:
+                identity.record(repo_name, canonical_name, parsed.get('fork_of'), parsed.get('network_root'))
             
-            # 提取亮点：从 README 中提取关键信息
-            highlights = []
-            readme_selectors = [
-                'div#readme',
-                'article.markdown-body',
-                'div[data-target="readme-toc.content"]',
-            ]
-            
-            for selector in readme_selectors:
-                readme_elem = soup.select_one(selector)
-                if readme_elem:
-                    # 从 README 中提取列表项、粗体文本或标题作为亮点
-                    # 查找列表项（通常是特性列表）
-                    list_items = readme_elem.find_all(['li', 'strong', 'b'])
-                    for item in list_items[:10]:  # 最多检查前10个
-                        text = item.get_text(strip=True)
-                        # 过滤掉太短或太长的文本
-                        if 15 < len(text) < 200:
-                            # 检查是否是列表项的开头（通常包含特性描述）
-                            if item.name == 'li' or (item.name in ['strong', 'b'] and len(text) > 20):
-                                if text not in highlights:
-                                    highlights.append(text)
-                                    if len(highlights) >= 5:  # 最多5个亮点
-                                        break
-                    if highlights:
-                        break
-                    
-                    # 如果没有找到列表项，尝试从标题中提取
-                    if not highlights:
-                        headings = readme_elem.find_all(['h2', 'h3'])
-                        for heading in headings[:5]:
-                            text = heading.get_text(strip=True)
-                            if 10 < len(text) < 100:
-                                highlights.append(text)
-                                if len(highlights) >= 5:
-                                    break
+            cached_highlights = None
+            if highlight_cache and readme_hash:
+                cached_highlights = highlight_cache.get(readme_hash)
+                if cached_highlights is None and highlights is None:
+                    # 缓存条目已失效，重新解析提取亮点
+                    highlights = (await parse_project_page(html_content))['highlights']
+            # 解析完成后不再需要页面内容，翻译期间不再持有
+            html_content = None
             
             # 翻译简介和亮点为中文
+            # 翻译是同步网络请求，放到线程中执行，避免阻塞事件循环
             translated_description = ''
             if description:
-                translated_description = translate_to_chinese(description)
+                translated_description = await asyncio.to_thread(translate_to_chinese, description)
             
-            translated_highlights = []
-            if highlights:
-                for h in highlights[:5]:
-                    translated_h = translate_to_chinese(h)
-                    translated_highlights.append(translated_h)
+            if cached_highlights is not None:
+                translated_highlights = cached_highlights
+                if readme_hash != known_readme_hash:
+                    # 命中其他仓库或其他数据源保存的同一 README
+                    highlight_cache.link(cache_key, readme_hash)
+            else:
+                translated_highlights = []
+                untranslated = 0
+                if highlights:
+                    for h in highlights[:5]:
+                        translated_h = await asyncio.to_thread(try_translate, h)
+                        if translated_h is None:
+                            # 翻译失败时报告中使用原文，但不写入缓存，下次运行重新翻译
+                            untranslated += 1
+                            translated_h = h
+                        translated_highlights.append(translated_h)
+                if highlight_cache and readme_hash and not untranslated:
+                    highlight_cache.put(readme_hash, translated_highlights, cache_key)
             
             return {
                 'description': translated_description,
                 'highlights': translated_highlights,
-                'language': language
+                'language': language,
+                'repo': canonical_name,
+                'fork_of': parsed.get('fork_of', '')
             }
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"  获取 {repo_name} 详情失败: {e}")
             return {
                 'description': '',
@@ -212,149 +255,251 @@ async def fetch_project_details(repo_name, semaphore):
             }
 
 
+async def goto_with_retry(page, url, **kwargs):
+    """
+    通过弹性层加载页面：429/5xx 响应按 Retry-After 或指数退避重试，
+    导航超时和网络错误（Playwright 的 TimeoutError / Error）同样退避重试并计入熔断
+    
+    Args:
+        page: Playwright 页面对象
+        url: 页面地址
+        **kwargs: 传给 page.goto 的参数
+    """
+    async def load():
+        response = await page.goto(url, **kwargs)
+        if response is not None and response.status in RETRYABLE_STATUSES:
+            raise RetryableError(
+                f"HTTP {response.status}: {url}",
+                retry_after=retry_after_seconds(await response.all_headers()),
+                status=response.status
+            )
+        return response
+    
+    return await get_resilience().call_async(urlparse(url).hostname, load)
+
+
+# 页面内提取脚本：在浏览器中收集候选项目链接，只把精简的链接记录传回 Python，
+# 避免序列化整页 HTML 再用 BeautifulSoup 重新解析。
+# text 与 BeautifulSoup 的 get_text(separator='\n', strip=True) 保持一致
+ZREAD_EXTRACT_SCRIPT = """
+() => {
+    const records = [];
+    for (const link of document.querySelectorAll('a[href]')) {
+        // 已提取过的链接打上标记，滚动加载时每次只返回新出现的链接
+        if (link.dataset.trendingSeen) {
+            continue;
+        }
+        link.dataset.trendingSeen = '1';
+        const href = link.getAttribute('href') || '';
+        if (!href || href === '/' || href.includes('/trending') || href.startsWith('http')) {
+            continue;
+        }
+        if (href.replace(/^\\/+|\\/+$/g, '').split('/').length < 2) {
+            continue;
+        }
+        const texts = [];
+        const walker = document.createTreeWalker(link, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const text = walker.currentNode.nodeValue.trim();
+            if (text) {
+                texts.push(text);
+            }
+        }
+        records.push({href: href, text: texts.join('\\n'), title: link.getAttribute('title') || ''});
+    }
+    return records;
+}
+"""
+
+
 def parse_trending_data(html_content):
-    """解析网页内容，提取趋势项目信息"""
+    """解析网页内容，提取趋势项目信息（HTML 解析方式，页面内提取失败时的备用路径）"""
+    return parse_trending_links(html_to_links(html_content))
+
+
+def html_to_links(html_content):
+    """把整页 HTML 转换为与页面内提取脚本相同的链接记录"""
+    from bs4 import BeautifulSoup
+    
     soup = BeautifulSoup(html_content, 'lxml')
+    links = [
+        {
+            'href': link.get('href', ''),
+            'text': link.get_text(separator='\n', strip=True),
+            'title': link.get('title', '')
+        }
+        for link in soup.find_all('a', href=True)
+    ]
+    # 立即释放解析树（提取出的都是普通字符串，不再引用树中的节点）
+    soup.decompose()
+    return links
+
+
+# 导航项（不是项目链接）
+_NAV_REPOS = frozenset({'private/repo', 'subscription', 'library'})
+
+# stars：包含 k（如 "1.2k"），或去掉 . 和 , 后为 3 位以上的数字
+_STARS_K = re.compile(r'[kK\u212a]')  # 与 str.lower() 后包含 'k' 等价（含开尔文符号 U+212A）
+_NUMBER_SEPARATORS = str.maketrans('', '', '.,')
+
+# 标签不含这些字符
+_TAG_FORBIDDEN = re.compile(r'[/\\.:()，。]')
+# 标签中排除的常见描述性词汇
+_TAG_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'with', 'by'
+})
+_MAX_TAGS = 15
+
+# 清理描述时保留的短词
+_DESC_PUNCT = re.compile(r'[.,:;()，。]')
+_DESC_STOP_WORDS = frozenset({
+    'and', 'the', 'a', 'an', 'is', 'are', 'of', 'in', 'on', 'at', 'to', 'for', 'with'
+})
+
+
+def trending_repo_name(href):
+    """从链接地址提取仓库名（owner/repo），导航链接和无效链接返回 None"""
+    # 过滤掉导航链接和无效链接
+    if not href or href == '/' or '/trending' in href or href.startswith('http'):
+        return None
     
-    trending_data = []
-    seen_projects = set()
+    # 检查是否是项目链接（格式通常是 /owner/repo）
+    href_parts = href.strip('/').split('/', 2)
+    if len(href_parts) < 2:
+        return None
+    
+    repo_name = href_parts[0] + '/' + href_parts[1]
+    if repo_name in _NAV_REPOS:
+        return None
+    return repo_name
+
+
+def _is_stars(token):
+    """是否是 stars 数（包含 k 或 3 位以上的数字）"""
+    if _STARS_K.search(token):
+        return True
+    # 数字形式必须以数字或分隔符开头，绝大多数普通词在这里直接排除
+    first = token[0]
+    if not (first.isdigit() or first == '.' or first == ','):
+        return False
+    digits = token.translate(_NUMBER_SEPARATORS)
+    return len(digits) >= 3 and digits.isdigit()
+
+
+def _keep_description_word(word):
+    """清理描述时是否保留该词（短且不含标点的词通常是标签）"""
+    return len(word) > 3 or word in _DESC_STOP_WORDS or _DESC_PUNCT.search(word) is not None
+
+
+def _tokenize_link(link_text):
+    """
+    对链接文本做一次分词，提取描述、标签和 stars
+    
+    第一行格式通常是 "owner/repo 描述文本"：仓库名之后的词作为描述（stars 除外）；
+    后续行的词为标签或 stars
+    
+    Returns:
+        tuple: (description, tags, stars)；没有文本时返回 None
+    """
+    lines = [line.split() for line in link_text.split('\n')]
+    lines = [tokens for tokens in lines if tokens]
+    if not lines:
+        return None
+    
+    description_parts = []
+    tags = []
+    tag_set = set()
+    stars = None
     
-    # 查找所有项目链接，排除导航链接
-    all_links = soup.find_all('a', href=True)
+    # 第一行：找到仓库名（恰好包含一个 /）后的词作为描述
+    first_tokens = lines[0]
+    for i, token in enumerate(first_tokens):
+        if token.count('/') == 1:
+            for part in first_tokens[i + 1:]:
+                if _is_stars(part):
+                    if not stars:
+                        stars = part
+                else:
+                    description_parts.append(part)
+            break
+    
+    # 后续行：stars 和标签
+    for tokens in lines[1:]:
+        for part in tokens:
+            if _is_stars(part):
+                if not stars:
+                    stars = part
+            elif (len(tags) < _MAX_TAGS and len(part) < 25 and part not in tag_set
+                  and part.lower() not in _TAG_STOP_WORDS and not _TAG_FORBIDDEN.search(part)):
+                tags.append(part)
+                tag_set.add(part)
+    
+    return ' '.join(description_parts), tags, stars
+
+
+def extract_trending_items(links, seen_projects=None):
+    """
+    从链接记录（href、text、title）中提取趋势项目（不翻译描述）
+    
+    Args:
+        links: 链接记录列表
+        seen_projects: 已处理过的仓库名集合（可选），其中的仓库会被跳过，新仓库会加入该集合
+    """
+    items = []
+    if seen_projects is None:
+        seen_projects = set()
     
-    for link in all_links:
+    for link in links:
         href = link.get('href', '')
+        repo_name = trending_repo_name(href)
         
-        # 过滤掉导航链接和无效链接
-        if not href or href == '/' or '/trending' in href or href.startswith('http'):
-            continue
-        
-        # 检查是否是项目链接（格式通常是 /owner/repo）
-        href_parts = href.strip('/').split('/')
-        if len(href_parts) < 2:
-            continue
-        
-        repo_name = '/'.join(href_parts[:2])
-        
-        # 跳过已知的项目和导航项
-        if repo_name in seen_projects or repo_name in ['private/repo', 'subscription', 'library']:
+        # 跳过无效链接和已知的项目
+        if repo_name is None or repo_name in seen_projects:
             continue
         
-        # 提取链接内的所有文本，保留换行和空格结构
-        link_text = link.get_text(separator='\n', strip=True)
-        
-        # 按行分割文本
-        lines = [line.strip() for line in link_text.split('\n') if line.strip()]
-        
-        if len(lines) < 1:
+        tokens = _tokenize_link(link.get('text', ''))
+        if tokens is None:
             continue
+        description, tags, stars = tokens
         
-        # 第一行通常是仓库名和描述
-        first_line = lines[0]
-        
-        # 提取描述（如果已有中文描述则保留，否则尝试翻译）
-        description = ''
-        tags = []
-        stars = None
-        
-        # 尝试从第一行提取仓库名和描述
-        # 格式可能是: "owner/repo 描述文本" 或 "owner/repo"
-        first_line_parts = first_line.split()
-        repo_found = False
-        desc_start_idx = 0
-        
-        for i, part in enumerate(first_line_parts):
-            if '/' in part and len(part.split('/')) == 2:
-                repo_found = True
-                desc_start_idx = i + 1
-                break
-        
-        if repo_found and desc_start_idx < len(first_line_parts):
-            description_parts = first_line_parts[desc_start_idx:]
-            # 过滤掉明显的标签和 stars
-            filtered_desc = []
-            for part in description_parts:
-                # 检查是否是 stars（包含 k 或大数字）
-                if 'k' in part.lower() or (part.replace('.', '').replace(',', '').isdigit() and len(part.replace('.', '').replace(',', '')) >= 3):
-                    if not stars:
-                        stars = part
-                    continue
-                # 检查是否是标签（单个词，通常较短）
-                if len(part) < 25 and not any(c in part for c in ['/', '\\', '.', ':', '(', ')']):
-                    # 可能是标签，但先加入描述
-                    filtered_desc.append(part)
-                else:
-                    filtered_desc.append(part)
-            
-            description = ' '.join(filtered_desc).strip()
-        
-        # 从后续行提取标签和 stars
-        for line in lines[1:]:
-            line_parts = line.split()
-            for part in line_parts:
-                # 检查是否是 stars
-                if 'k' in part.lower() or (part.replace('.', '').replace(',', '').isdigit() and len(part.replace('.', '').replace(',', '')) >= 3):
-                    if not stars:
-                        stars = part
-                # 检查是否是标签（短词，不含特殊字符）
-                elif len(part) < 25 and not any(c in part for c in ['/', '\\', '.', ':', '(', ')', '，', '。']):
-                    # 排除常见的描述性词汇
-                    skip_words = ['the', 'a', 'an', 'is', 'are', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'with', 'by']
-                    if part.lower() not in skip_words and part not in tags:
-                        tags.append(part)
-        
-        # 如果描述为空，尝试从 title 或其他属性获取
+        # 如果描述为空，尝试从 title 获取
         if not description:
-            title = link.get('title', '')
-            if title:
-                description = title
+            description = link.get('title') or ''
         
         # 清理描述：移除明显的标签词汇
         if description:
-            desc_words = description.split()
-            cleaned_desc = []
-            for word in desc_words:
-                # 如果单词看起来像标签（短且不含空格），跳过
-                if len(word) < 15 and word not in ['and', 'the', 'a', 'an', 'is', 'are', 'of', 'in', 'on', 'at', 'to', 'for', 'with']:
-                    # 检查是否包含特殊字符（标签通常不含）
-                    if any(c in word for c in ['.', ',', ':', ';', '(', ')', '，', '。']):
-                        cleaned_desc.append(word)
-                    elif len(word) > 3:  # 保留较长的词作为描述
-                        cleaned_desc.append(word)
-                else:
-                    cleaned_desc.append(word)
-            description = ' '.join(cleaned_desc).strip()
-        
-        # 限制标签数量
-        tags = tags[:15]
-        
-        if repo_name:
-            seen_projects.add(repo_name)
-            # 如果描述是英文，翻译成中文
-            final_description = description[:300] if description else ''
-            if final_description:
-                # 检测是否主要是中文
-                chinese_chars = sum(1 for char in final_description if '\u4e00' <= char <= '\u9fff')
-                if chinese_chars < len(final_description) * 0.3:  # 如果中文字符少于30%，尝试翻译
-                    final_description = translate_to_chinese(final_description)
-            
-            trending_data.append({
-                'repo': repo_name,
-                'description': final_description,
-                'tags': tags,
-                'stars': stars,
-                'url': f"https://zread.ai{href}"
-            })
-    
-    # 去重并排序
-    unique_data = []
-    seen_repos = set()
+            description = ' '.join(w for w in description.split() if _keep_description_word(w))
+        
+        seen_projects.add(repo_name)
+        items.append({
+            'repo': repo_name,
+            'description': description[:300],
+            'tags': tags,
+            'stars': stars,
+            'url': f"https://zread.ai{href}"
+        })
+    
+    return items
+
+
+def parse_trending_links(links, seen_projects=None):
+    """从链接记录（href、text、title）中提取趋势项目信息，并把英文描述翻译为中文
+    
+    Args:
+        links: 链接记录列表
+        seen_projects: 已处理过的仓库名集合（可选），其中的仓库会被跳过，新仓库会加入该集合
+    """
+    trending_data = extract_trending_items(links, seen_projects)
+    
     for item in trending_data:
-        if item['repo'] not in seen_repos:
-            seen_repos.add(item['repo'])
-            unique_data.append(item)
+        final_description = item['description']
+        if final_description:
+            # 检测是否主要是中文
+            chinese_chars = sum(1 for char in final_description if '\u4e00' <= char <= '\u9fff')
+            if chinese_chars < len(final_description) * 0.3:  # 如果中文字符少于30%，尝试翻译
+                item['description'] = translate_to_chinese(final_description)
     
-    return unique_data
+    return trending_data
 
 
 def generate_daily_report(trending_data, output_file=None, format='markdown', source='Zread'):
@@ -438,6 +583,7 @@ def generate_daily_report(trending_data, output_file=None, format='markdown', so
             f.write(default_template)
     
     # 设置 Jinja2 环境
+    from jinja2 import Environment, FileSystemLoader
     env = Environment(
         loader=FileSystemLoader(str(templates_dir)),
         trim_blocks=True,
@@ -468,98 +614,218 @@ def generate_daily_report(trending_data, output_file=None, format='markdown', so
     return report_content
 
 
+# 滚动到页面底部，并点击可见的“加载更多”按钮（如果有）
+ZREAD_LOAD_MORE_SCRIPT = """
+() => {
+    window.scrollTo(0, document.body.scrollHeight);
+    const pattern = /加载更多|查看更多|load more|show more/i;
+    for (const button of document.querySelectorAll('button, a[role="button"]')) {
+        if (button.offsetParent !== null && pattern.test(button.textContent || '')) {
+            button.click();
+            return true;
+        }
+    }
+    return false;
+}
+"""
+
+
+async def _load_more(page, timeout: float) -> bool:
+    """触发一次懒加载，并等待页面上出现新的链接（返回是否出现了新链接）"""
+    anchor_count = await page.evaluate("() => document.querySelectorAll('a[href]').length")
+    await page.evaluate(ZREAD_LOAD_MORE_SCRIPT)
+    try:
+        await page.wait_for_function(
+            "count => document.querySelectorAll('a[href]').length > count",
+            arg=anchor_count,
+            timeout=max(timeout, 0.1) * 1000
+        )
+        return True
+    except Exception:
+        return False  # 等待超时：没有新内容
+
+
+async def crawl_zread_links(page, crawl_config: CrawlConfig):
+    """
+    边滚动边提取 Zread Trending 的链接记录
+    
+    每一步只提取新出现的链接（已提取的链接在页面内打了标记），并按仓库名与已收集的项目去重；
+    收集到 max_items 个项目、超出时间预算、达到最大滚动次数或连续多次没有新项目时停止
+    
+    Args:
+        page: Playwright 页面对象
+        crawl_config: CrawlConfig 配置对象
+    
+    Returns:
+        list: 链接记录列表（与 ZREAD_EXTRACT_SCRIPT 的返回格式相同）
+    """
+    deadline = time.monotonic() + crawl_config.time_budget
+    max_steps = crawl_config.max_steps if crawl_config.enabled else 0
+    seen_projects = set()
+    links = []
+    idle = 0
+    
+    for step in range(max_steps + 1):
+        if step > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"  ℹ 滚动加载达到时间预算（{crawl_config.time_budget:.0f} 秒），停止")
+                break
+            await _load_more(page, min(crawl_config.step_timeout, remaining))
+        
+        added = 0
+        for link in await page.evaluate(ZREAD_EXTRACT_SCRIPT):
+            repo_name = trending_repo_name(link.get('href', ''))
+            if repo_name is None or repo_name in seen_projects:
+                continue
+            links.append(link)
+            # 没有文本的链接（如头像链接）不占用仓库名，同一仓库后续带文本的链接仍会保留
+            if link.get('text'):
+                seen_projects.add(repo_name)
+                added += 1
+        
+        if step > 0:
+            print(f"  ↻ 第 {step} 次滚动：新增 {added} 个项目，累计 {len(seen_projects)} 个")
+        
+        if len(seen_projects) >= crawl_config.max_items:
+            break
+        idle = idle + 1 if step > 0 and added == 0 else 0
+        if idle >= crawl_config.idle_steps:
+            break
+    
+    return links
+
+
+async def scroll_to_end(page, crawl_config: CrawlConfig) -> None:
+    """只滚动不提取（HTML 提取方式下，滚动完成后再序列化整页）"""
+    deadline = time.monotonic() + crawl_config.time_budget
+    idle = 0
+    for _ in range(crawl_config.max_steps):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if await _load_more(page, min(crawl_config.step_timeout, remaining)):
+            idle = 0
+        else:
+            idle += 1
+            if idle >= crawl_config.idle_steps:
+                break
+
+
+async def fetch_zread_trending(config: Optional[Config] = None):
+    """使用 Playwright 获取 Zread Trending 页面内容（获取完成后立即关闭浏览器）
+    
+    Returns:
+        tuple: (links, html_content)
+            - links: 页面内提取的链接记录（extraction 为 dom 且提取成功时）
+            - html_content: 整页 HTML（仅在 html 模式或页面内提取失败时获取）
+    """
+    browser_config = config.zread.browser if config else BrowserConfig()
+    crawl_config = config.crawl if config else CrawlConfig()
+    
+    async with open_light_page("https://zread.ai/trending", 'Zread', browser_config) as (page, metrics):
+        print("正在访问 https://zread.ai/trending...")
+        try:
+            # 使用 load 而不是 networkidle，更宽松的等待条件
+            await goto_with_retry(page, "https://zread.ai/trending", wait_until="load", timeout=60000)
+        except Exception as e:
+            print(f"页面加载警告: {e}")
+            # 即使超时也尝试获取内容
+        
+        # 等待页面动态内容加载完成
+        await asyncio.sleep(5)
+        
+        # 尝试等待特定元素出现（如果存在）
+        try:
+            await page.wait_for_selector('a[href^="/"]', timeout=10000)
+        except:
+            pass  # 如果找不到元素，继续执行
+        
+        # 优先在页面内提取链接记录（边滚动边提取），失败时回退到序列化整页 HTML
+        links = None
+        if browser_config.extraction == 'dom':
+            try:
+                links = await crawl_zread_links(page, crawl_config)
+            except Exception as e:
+                print(f"页面内提取失败，回退到 HTML 解析: {e}")
+        elif crawl_config.enabled:
+            await scroll_to_end(page, crawl_config)
+        
+        html_content = None
+        if not links:
+            html_content = await page.content()
+        
+        return links, html_content
+
+
 async def generate_zread_report(config: Optional[Config] = None):
-    """Zread Trending 日报生成函数（可被导入）"""
+    """
+    Zread Trending 日报生成函数（可被导入）
+    
+    Returns:
+        bool: 报告是否为最新（已生成，或数据未变化而跳过）；抓取失败、超时或出错时返回 False
+    """
+    # HTML 输出、全文索引（archive 依赖 jinja2）和通知生成日报时才导入
+    from archive.fulltext import index_run
+    from pipeline.html_output import write_html_report
+    from notifiers import Notification, notify_report, DigestSection, add_digest_section
+    
     if config is None:
         if Config is not None and load_config is not None:
             config = load_config()
         else:
             config = None
     
+    # 时间和请求预算：超出后用已完成的部分生成报告，不影响另一个数据源
+    deadline = RunDeadline('Zread', config.zread.deadlines if config else None)
+    budget_token = use_request_budget(deadline.request_budget)
+    # 本次运行期间的峰值内存（设置了 memory.max_rss_mb 时超过上限会限制详情获取的并发）
+    memory = RunMemory('Zread', config.memory if config else None)
+    memory.start()
     try:
-        # 初始化浏览器
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
-            # 设置超时时间
-            page.set_default_timeout(60000)  # 60秒
-            
-            print("正在访问 https://zread.ai/trending...")
-            try:
-                # 使用 load 而不是 networkidle，更宽松的等待条件
-                await page.goto("https://zread.ai/trending", wait_until="load", timeout=60000)
-            except Exception as e:
-                print(f"页面加载警告: {e}")
-                # 即使超时也尝试获取内容
-            
-            # 等待页面动态内容加载完成
-            await asyncio.sleep(5)
-            
-            # 尝试等待特定元素出现（如果存在）
+        # 检查点：--resume 时复用上次运行已解析的列表和已完成的详情
+        journal = open_run_journal('Zread', config)
+        
+        if journal is not None and journal.trending is not None:
+            trending_data = journal.trending
+        else:
+            fetch_timeout = deadline.stage_timeout('fetch')
             try:
-                await page.wait_for_selector('a[href^="/"]', timeout=10000)
-            except:
-                pass  # 如果找不到元素，继续执行
-            
-            # 获取页面内容
-            html_content = await page.content()
-            await page.close()
+                links, html_content = await asyncio.wait_for(fetch_zread_trending(config), fetch_timeout)
+            except TimeoutError:
+                deadline.mark('fetch', f"抓取趋势列表超出时间预算（{fetch_timeout:.0f} 秒），跳过本次日报")
+                return False
             
             # 解析内容
             print("正在解析网页内容...")
-            trending_data = parse_trending_data(html_content)
+            if links:
+                trending_data = parse_trending_links(links)
+            else:
+                trending_data = parse_trending_data(html_content)
+            # 已知改名的仓库换成当前名称，合并大小写不同的重复仓库
+            trending_data = canonicalise_projects(trending_data, config)
             
             if not trending_data:
                 print("警告: 未能解析到项目数据，尝试使用备用方法...")
-                # 备用方法：直接保存 HTML 供后续分析
-                with open('zread_trending_raw.html', 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                print("原始 HTML 已保存到 zread_trending_raw.html")
-                return
-            
-            # 获取项目详情（简介和亮点）
-            projects_to_fetch = trending_data[:20]  # 限制前20个项目，避免耗时过长
-            total_projects = len(projects_to_fetch)
-            print(f"\n正在获取 {total_projects} 个项目的详细信息...")
-            
-            # 使用信号量限制并发数，避免过载
-            semaphore = asyncio.Semaphore(3)  # 最多3个并发请求
-            
-            # 创建进度条
-            pbar = tqdm(total=total_projects, desc="获取项目详情", unit="项目", ncols=100, leave=True)
-            
-            # 创建包装函数，用于更新进度条
-            async def fetch_with_progress(project):
-                """获取项目详情并更新进度条"""
-                try:
-                    details = await fetch_project_details(project['repo'], semaphore)
-                    project['intro'] = details['description']
-                    project['highlights'] = details['highlights']
-                    if details.get('language'):
-                        project['language'] = details['language']
-                    pbar.set_postfix_str(f"✓ {project['repo']}")
-                    return True
-                except Exception as e:
-                    pbar.set_postfix_str(f"✗ {project['repo']}: {str(e)[:30]}")
-                    return False
-                finally:
-                    pbar.update(1)
-            
-            # 创建所有任务
-            tasks = [
-                fetch_with_progress(project)
-                for project in projects_to_fetch
-            ]
-            
-            # 并发执行所有任务
-            await asyncio.gather(*tasks)
-            
-            # 关闭进度条
-            pbar.close()
+                if html_content:
+                    # 备用方法：直接保存 HTML 供后续分析
+                    with open('zread_trending_raw.html', 'w', encoding='utf-8') as f:
+                        f.write(html_content)
+                    print("原始 HTML 已保存到 zread_trending_raw.html")
+                else:
+                    print("页面内提取的链接中没有项目，可设置 zread.browser.extraction 为 html 保存原始页面")
+                return False
+            # 列表已解析，不再持有整页 HTML 和页面内提取的记录
+            links = html_content = None
             
-            # 关闭浏览器
-            await browser.close()
+            if journal is not None:
+                journal.record_list(trending_data)
+        
+        # 获取项目详情（简介和亮点）
+        # 限制获取详情的项目数（默认前20个），避免耗时过长
+        project_limit = config.enrich.project_limit if config else 20
+        projects_to_fetch = trending_data[:project_limit]
+        await enrich_projects(projects_to_fetch, config, journal=journal, deadline=deadline, source='Zread')
         
         # 生成日报（根据配置生成指定格式）
         print("\n正在生成日报...")
@@ -577,11 +843,28 @@ async def generate_zread_report(config: Optional[Config] = None):
             reports_dir = Path("reports")
             report_formats = ['markdown', 'html']
         
+        date_str = datetime.now().strftime('%Y%m%d')
+        md_path = reports_dir / f"zread_trending_report_{date_str}.md"
+        html_path = reports_dir / f"zread_trending_report_{date_str}.html"
+        outputs = [path for fmt, path in (('markdown', md_path), ('html', html_path))
+                   if fmt in report_formats]
+        
+        # 数据与上次生成报告时相同则跳过渲染、写文件和通知
+        fingerprint = dataset_fingerprint(trending_data)
+        fingerprints = open_fingerprint_store(config)
+        notify = bool(config and config.notification.enabled)
+        if fingerprints is not None and fingerprints.unchanged('Zread', fingerprint, outputs, require_notified=notify):
+            print(f"\n  ℹ Zread Trending 数据与上次生成时相同（指纹 {fingerprint[:12]}），跳过生成报告和通知")
+            if journal is not None:
+                journal.mark_complete()
+            return True
+        
         reports_dir.mkdir(exist_ok=True)
         templates_dir = Path("templates")
         templates_dir.mkdir(exist_ok=True)
         
         # 设置 Jinja2 环境
+        from jinja2 import Environment, FileSystemLoader
         env = Environment(
             loader=FileSystemLoader(str(templates_dir)),
             trim_blocks=True,
@@ -596,25 +879,23 @@ async def generate_zread_report(config: Optional[Config] = None):
         }
         
         md_file = None
+        md_content = None
         report_content = None
         
         # 根据配置生成报告格式
         if 'markdown' in report_formats:
             md_template = env.get_template("report.md.j2")
             md_content = md_template.render(**template_data)
-            md_file = reports_dir / f"zread_trending_report_{datetime.now().strftime('%Y%m%d')}.md"
+            md_file = md_path
             with open(md_file, 'w', encoding='utf-8') as f:
                 f.write(md_content)
             print(f"  ✓ Markdown 格式: {md_file}")
             report_content = md_content
         
         if 'html' in report_formats:
-            html_template = env.get_template("report.html.j2")
-            html_content = html_template.render(**template_data)
-            html_file = reports_dir / f"zread_trending_report_{datetime.now().strftime('%Y%m%d')}.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"  ✓ HTML 格式: {html_file}")
+            html_output = write_html_report(env, template_data, html_path,
+                                            config.report if config else ReportConfig())
+            print(f"  ✓ HTML 格式: {html_output.path}（{html_output.summary()}）")
         
         # 打印摘要
         if report_content:
@@ -623,22 +904,41 @@ async def generate_zread_report(config: Optional[Config] = None):
             print("="*50)
             print(report_content[:500] + "..." if len(report_content) > 500 else report_content)
         
-        # 发送通知（如果启用）
-        if config and config.notification.enabled and config.notification.email_recipient and md_file:
-            try:
-                notifier = EmailNotifier(recipient=config.notification.email_recipient)
-                success = notifier.send_report_summary(
-                    report_type="Zread",
-                    report_path=md_file,
-                    total_projects=len(trending_data),
-                    generate_time=template_data['generate_time']
-                )
-                if success:
-                    print(f"\n  ✓ 邮件通知已发送到 {config.notification.email_recipient}")
-                else:
-                    print("\n  ⚠ 邮件通知发送失败")
-            except Exception as e:
-                print(f"\n  ⚠ 发送邮件通知时出错: {e}")
+        # 通知送达后才在指纹记录中标记已通知：通知失败或进程中途退出时，下次运行不会因数据未变化而跳过
+        delivered = None
+        if fingerprints is not None:
+            routes = ((1 if md_file else 0) + (1 if config.notification.digest else 0)) if notify else 0
+            delivered = fingerprints.record('Zread', fingerprint, outputs, notifications=routes)
+        
+        # 保存结构化数据并写入全文索引，供归档站点和历史搜索使用
+        save_run(config, 'Zread', date_str, template_data['generate_time'], trending_data)
+        index_run(config, 'Zread', date_str, trending_data)
+        
+        # 降级的运行不标记完成，--resume 时只补齐未获取的详情
+        if journal is not None and not deadline.degraded:
+            journal.mark_complete()
+        print(f"  ℹ {deadline.summary()}")
+        
+        # 汇总模式：登记内存中的数据，全部数据源完成后统一发送汇总邮件
+        if config and config.notification.enabled and config.notification.digest:
+            add_digest_section(DigestSection(
+                source="Zread",
+                generate_time=template_data['generate_time'],
+                projects=trending_data,
+                markdown=md_content,
+                on_delivered=delivered
+            ))
+        
+        # 发送通知（如果启用）：并发发送到已配置的邮件、企业微信等渠道
+        if config and config.notification.enabled and md_file:
+            await notify_report(config.notification, Notification(
+                report_type="Zread",
+                report_path=md_file,
+                total_projects=len(trending_data),
+                generate_time=template_data['generate_time'],
+                markdown=md_content,
+                on_delivered=delivered
+            ))
         elif config and not config.notification.enabled:
             print("\n  ℹ 通知功能已禁用（本地测试模式）")
         elif not config:
@@ -662,16 +962,33 @@ async def generate_zread_report(config: Optional[Config] = None):
                     print(f"\n  ⚠ 发送邮件通知时出错: {e}")
             else:
                 print("\n  ℹ 未配置企业微信 Webhook URL，跳过推送")
+        return True
         
     except Exception as e:
         print(f"错误: {e}")
         import traceback
         traceback.print_exc()
+        return False
+    finally:
+        reset_request_budget(budget_token)
+        memory.stop()
+        print(f"  ℹ {memory.summary()}")
 
 
 async def main():
     """Zread Trending 日报生成主函数（兼容旧版本）"""
-    await generate_zread_report()
+    from notifiers import close_dispatcher, send_digest
+    
+    config = load_config() if load_config is not None else None
+    if config is not None:
+        configure_resilience(config.resilience)
+    try:
+        await generate_zread_report(config)
+        if config is not None and config.notification.enabled and config.notification.digest:
+            await send_digest(config.notification)
+    finally:
+        if config is not None:
+            close_dispatcher()
 
 
 if __name__ == "__main__":